@@ -1,7 +1,4 @@
 import streamlit as st
-from langchain_community.chat_message_histories import (
-    StreamlitChatMessageHistory,
-)
 
 # 페이지 설정을 가장 먼저 해야 함
 st.set_page_config(
@@ -24,29 +21,22 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-import openai
 from datetime import datetime, timedelta
 from database import (
     add_goal,
     get_categories,
     add_category,
     add_recurring_goals,
-    add_post,
-    get_category_name,
-    get_user_profile,
-    get_todays_goals,
-    get_incomplete_goals,
 )
-from config import OPENAI_API_KEY
 from utils.llm_utils import LLMFactory, StreamHandler, ChatMemory
+from utils.prompt_utils import generate_system_message
 import uuid
 from utils.date_utils import parse_weekdays, generate_recurring_dates
-from utils.pplx_utils import search_with_pplx
+from utils.search import search
 from utils.menu_utils import show_menu  # 메뉴 컴포넌트 import
-import re
 from utils.session_utils import clear_goal_session
 from utils.auth_utils import login_required, init_auth
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
 
 # 인증 초기화
@@ -131,57 +121,20 @@ with st.expander("📖 사용법 보기"):
     )
 
 
-# Tool 관련 코드 제거
-def generate_system_message():
-    profile = get_user_profile()
-    todays_goals = get_todays_goals()
-    incomplete_goals = get_incomplete_goals()
-
-    # 오늘의 할일 문자열 생성 - 간단하게 수정
-    todays_goals_str = "없음"
-    if todays_goals:
-        goals_details = []
-        for goal in todays_goals:
-            start_time = goal.start_date.strftime("%H:%M")
-            end_time = goal.end_date.strftime("%H:%M")
-            importance = goal.importance if goal.importance else "미설정"
-            memo = goal.memo if goal.memo else "미정"
-            status = goal.status if goal.status else "미정"
-           
-            goal_detail = (
-                f"일정 : {goal.title} / 시간 : {start_time}-{end_time} / 중요도: {importance} / 메모: {memo} / 상태: {status} "
-            )
-            goals_details.append(goal_detail)
-        todays_goals_str = "\n".join(goals_details)
-
-    # 미완료 목표 문자열 생성 - 간단하게 수정
-    incomplete_goals_str = "없음"
-    if incomplete_goals:
-        goals_details = []
-        for goal in incomplete_goals:
-            deadline = goal.end_date.strftime("%Y-%m-%d")
-            importance = goal.importance if goal.importance else "미정"
-            memo = goal.memo if goal.memo else "미정"
-            status = goal.status if goal.status else "미정"
-
-            goal_detail = (
-                f"- {goal.title} / 마감: {deadline} / 중요도: {importance} / 메모: {memo} / 상태: {status} "
-            )
-            goals_details.append(goal_detail)
-        incomplete_goals_str = "\n".join(goals_details)
-
-    return f"""
-    {profile.get("content", "")}
-    
-    오늘의 할일:
-    {todays_goals_str}
-    
-    미완료된 목표:
-    {incomplete_goals_str}
-
-    
-    {profile.get('consultant_style', '')}
-    """
+def find_related_notes(prompt):
+    """사용자 메시지와 관련된 기존 게시글/목표/링크를 찾아 참고 정보로 만드는 함수"""
+    try:
+        results = search(prompt, limit=3, match_any=True)
+    except Exception:
+        return None
+    if not results:
+        return None
+
+    labels = {"board": "게시글", "goal": "목표", "link": "링크", "chat": "대화"}
+    notes = [
+        f"- [{labels[r['entity']]}] {r['title']}: {r['snippet']}" for r in results
+    ]
+    return "사용자의 기존 기록 중 관련 내용:\n" + "\n".join(notes)
 
 
 # 세션 ID 생성 (앱 시작시)
@@ -212,26 +165,16 @@ with messages_container:
 # 대화 저장 버튼 추가 (컨테이너 아래에)
 if st.button("💾 대화 내용 저장"):
     try:
-        # 현재 시간을 제목에 포함
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        title = f"AI 상담 기록 ({current_time})"
-
-        # 전체 대화 컨텍스트 포함하여 저장
-        context = ""
-        messages = memory.get_messages()
-        for msg in messages[1:]:  # 시스템 메시지 제외
-            if isinstance(msg, HumanMessage):
-                context += f"\n사용자: {msg.content}\n"
-            elif isinstance(msg, AIMessage):
-                context += f"\nAI: {msg.content}\n"
-
-        # board 테이블에 'chat' 타입으로 저장
-        add_post(
-            board_type="chat",
-            title=title,
-            content=context.strip(),  # user_id 제거 (함수 내부에서 처리됨)
-        )
-        st.success("전체 대화 내용이 저장되었습니다.")
+        if memory.transcript_id:
+            st.info("이미 저장 중인 대화입니다. 새 메시지는 자동으로 기록됩니다.")
+        else:
+            # 현재 시간을 제목에 포함
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+            title = f"AI 상담 기록 ({current_time})"
+
+            # 지금까지의 전체 대화를 메시지 단위로 저장 (이후 대화는 턴마다 이어서 기록)
+            memory.start_transcript(title)
+            st.success("전체 대화 내용이 저장되었습니다. 이후 대화도 자동으로 기록됩니다.")
     except Exception as e:
         st.error(f"저장 중 오류가 발생했습니다: {str(e)}")
 
@@ -252,6 +195,7 @@ if prompt := st.chat_input("AI 컨설턴트에게 메시지를 보내세요"):
         prompt,
         st.session_state.session_id,
         stream_handler=stream_handler,
+        context=find_related_notes(prompt),
     )
 
 # 모델 선택 드롭다운 추가
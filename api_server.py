@@ -0,0 +1,529 @@
+"""목표/카테고리/게시글/링크 JSON API (ASGI)
+
+Streamlit 스크립트를 다시 실행하지 않고 database.py 함수를 바로 호출한다.
+Streamlit 앱과 같은 데이터베이스를 쓰는 별도 프로세스로 실행한다.
+
+    python api_server.py --port 8600
+    uvicorn api_server:app --port 8600 --workers 2
+
+인증은 로그인 세션 토큰(sessions 테이블)을 `Authorization: Bearer <토큰>`으로 보낸다.
+목록은 id 순서 키셋 페이지(?limit=50&after=<마지막 id>)로 조회하고, 응답의 ETag를
+If-None-Match로 보내면 바뀌지 않았을 때 304를 받는다.
+
+    GET    /api/health
+    GET    /api/goals?status=&category_id=     POST /api/goals
+    POST   /api/goals/bulk                     PATCH /api/goals/bulk
+    GET    /api/goals/{id}    PATCH /api/goals/{id}    DELETE /api/goals/{id}
+    GET    /api/categories    POST  /api/categories
+    GET    /api/categories/{id}    PATCH /api/categories/{id}    DELETE /api/categories/{id}
+    GET    /api/posts?board_type=              POST /api/posts
+    GET    /api/posts/{id}    PATCH /api/posts/{id}    DELETE /api/posts/{id}
+    GET    /api/links         POST  /api/links
+    GET    /api/links/{id}    PATCH /api/links/{id}    DELETE /api/links/{id}
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import time
+from datetime import date, datetime
+from urllib.parse import parse_qsl
+from database import (
+    GOAL_FIELDS,
+    add_category,
+    add_goals,
+    add_link,
+    add_post,
+    delete_category,
+    delete_goal,
+    delete_link,
+    delete_post,
+    get_collection_page,
+    get_collection_row,
+    get_collection_version,
+    get_session,
+    goal_record,
+    update_category,
+    update_goals,
+    update_link,
+    update_post,
+)
+import utils.invalidation  # noqa: F401  (API에서의 변경도 Streamlit 프로세스 캐시에 알림)
+from utils.query_stats import begin_unit
+
+# 한 페이지 / 한 번의 일괄 요청에서 다룰 수 있는 최대 행 수
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BULK_SIZE = 500
+
+# 확인한 세션 토큰을 다시 조회하지 않는 시간 (로그아웃이 늦게 반영될 수 있는 최대 시간)
+SESSION_CACHE_SECONDS = 30
+
+# 게시판 종류 (정보/아이디어/회고/대화 요약)
+BOARD_TYPES = ["info", "idea", "reflection", "chat"]
+
+# 목록에서 쓸 수 있는 필터와 목록에서 읽을 컬럼 (None이면 전체)
+LIST_FILTERS = {
+    "goals": {"status": str, "category_id": int},
+    "categories": {},
+    "posts": {"board_type": str},
+    "links": {},
+}
+LIST_COLUMNS = {
+    # 게시글 본문은 상세 조회에서만 반환
+    "posts": ["id", "title", "board_type", "image_path", "reflection_date", "created_at", "updated_at"],
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, scope, body: bytes):
+        self.method = scope["method"]
+        self.path = scope["path"].rstrip("/") or "/"
+        self.query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+        self.body = body
+        self.user_id = None
+
+    def json(self):
+        if not self.body:
+            raise ApiError(400, "요청 본문(JSON)이 필요합니다.")
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise ApiError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+        if not isinstance(data, dict):
+            raise ApiError(400, "요청 본문은 JSON 객체여야 합니다.")
+        return data
+
+
+class Response:
+    def __init__(self, status: int = 200, data=None, etag: str = None):
+        self.status = status
+        self.headers = [(b"content-type", b"application/json; charset=utf-8")]
+        if etag:
+            self.headers.append((b"etag", etag.encode("latin-1")))
+        self.body = b"" if data is None else json.dumps(
+            data, ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 바꿀 수 없는 값: {type(value).__name__}")
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    candidates = request.headers.get("if-none-match", "")
+    return etag in [candidate.strip() for candidate in candidates.split(",")]
+
+
+async def _db(func, *args, **kwargs):
+    """동기 database 함수를 스레드에서 실행하는 함수 (이벤트 루프를 막지 않음)"""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# 인증
+_sessions = {}
+
+
+async def _authenticate(request: Request) -> int:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise ApiError(401, "Authorization: Bearer <세션 토큰> 헤더가 필요합니다.")
+    cached = _sessions.get(token)
+    if cached and time.monotonic() - cached[1] < SESSION_CACHE_SECONDS:
+        return cached[0]
+    session = await _db(get_session, token)
+    if session is None:
+        _sessions.pop(token, None)
+        raise ApiError(401, "세션이 없거나 만료되었습니다.")
+    _sessions[token] = (session.user_id, time.monotonic())
+    return session.user_id
+
+
+# 입력 값 변환
+def _int_param(query: dict, name: str, default: int, minimum: int, maximum: int = None) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"{name}은(는) 정수여야 합니다.")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name}은(는) {minimum}~{maximum or ''} 범위여야 합니다.")
+    return value
+
+
+def _parse_datetime(value, field: str):
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{field}은(는) ISO 8601 일시여야 합니다.")
+
+
+def _parse_date(value, field: str):
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{field}은(는) YYYY-MM-DD 날짜여야 합니다.")
+
+
+def _goal_fields(data: dict) -> dict:
+    """요청 본문에서 목표 필드만 골라 저장 형태로 바꾸는 함수"""
+    fields = {key: data[key] for key in GOAL_FIELDS if key in data}
+    for key in ["start_date", "end_date"]:
+        if key in fields:
+            fields[key] = _parse_datetime(fields[key], key)
+    return fields
+
+
+def _bulk_items(data: dict) -> list:
+    items = data.get("items")
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ApiError(400, "items는 객체 목록이어야 합니다.")
+    if len(items) > MAX_BULK_SIZE:
+        raise ApiError(413, f"한 번에 {MAX_BULK_SIZE}개까지 처리할 수 있습니다.")
+    return items
+
+
+# 출력 형태
+def _output(name: str, row: dict) -> dict:
+    """행을 응답 형태로 바꾸는 함수 (목표 일시는 KST, user_id 제외)"""
+    if name == "goals":
+        return {**goal_record(row), "updated_at": row.get("updated_at")}
+    return {key: value for key, value in row.items() if key != "user_id"}
+
+
+# 핸들러
+async def health(request):
+    return Response(data={"status": "ok"})
+
+
+async def list_collection(request, name):
+    filters = {}
+    for key, convert in LIST_FILTERS[name].items():
+        if key in request.query:
+            try:
+                filters[key] = convert(request.query[key])
+            except ValueError:
+                raise ApiError(400, f"{key} 값이 올바르지 않습니다.")
+    limit = _int_param(request.query, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    after = _int_param(request.query, "after", 0, 0)
+
+    # 목록이 바뀌지 않았으면 행을 읽지 않고 304
+    total, last_changed = await _db(
+        get_collection_version, name, filters, user_id=request.user_id
+    )
+    etag = _etag(name, request.user_id, total, last_changed, sorted(filters.items()), limit, after)
+    if _not_modified(request, etag):
+        return Response(304, etag=etag)
+
+    rows = await _db(
+        get_collection_page,
+        name,
+        limit,
+        after,
+        filters,
+        LIST_COLUMNS.get(name),
+        user_id=request.user_id,
+    )
+    return Response(
+        data={
+            "items": [_output(name, row) for row in rows],
+            "total": total,
+            "next_after": rows[-1]["id"] if len(rows) == limit else None,
+        },
+        etag=etag,
+    )
+
+
+async def _get_row(request, name, record_id) -> dict:
+    row = await _db(get_collection_row, name, record_id, user_id=request.user_id)
+    if row is None:
+        raise ApiError(404, f"{name}/{record_id}을(를) 찾을 수 없습니다.")
+    return row
+
+
+def _row_etag(name, row) -> str:
+    return _etag(name, row["id"], row.get("updated_at") or row.get("created_at"))
+
+
+async def get_item(request, name, record_id):
+    row = await _get_row(request, name, record_id)
+    etag = _row_etag(name, row)
+    if _not_modified(request, etag):
+        return Response(304, etag=etag)
+    return Response(data=_output(name, row), etag=etag)
+
+
+async def create_item(request, name):
+    data = request.json()
+    user_id = request.user_id
+    if name == "goals":
+        rows = await _db(add_goals, [_goal_fields(data)], user_id=user_id)
+        return Response(201, rows[0])
+    if name == "categories":
+        if not data.get("name"):
+            raise ApiError(400, "name은 필수입니다.")
+        created = await _db(add_category, data["name"], user_id=user_id)
+    elif name == "posts":
+        if not data.get("title") or data.get("board_type") not in BOARD_TYPES:
+            raise ApiError(400, f"title과 board_type({', '.join(BOARD_TYPES)})은 필수입니다.")
+        created = await _db(
+            add_post,
+            data["title"],
+            data.get("content", ""),
+            data["board_type"],
+            reflection_date=_parse_date(data.get("reflection_date"), "reflection_date"),
+            user_id=user_id,
+        )
+    else:
+        if not data.get("site_name") or not data.get("url"):
+            raise ApiError(400, "site_name과 url은 필수입니다.")
+        created = await _db(add_link, data["site_name"], data["url"], user_id=user_id)
+    row = await _get_row(request, name, created.id)
+    return Response(201, _output(name, row))
+
+
+async def update_item(request, name, record_id):
+    data = request.json()
+    user_id = request.user_id
+    if name == "goals":
+        rows = await _db(update_goals, [{**_goal_fields(data), "id": record_id}], user_id=user_id)
+        if not rows:
+            # 없는 목표이거나 바꿀 필드가 없음
+            row = await _get_row(request, name, record_id)
+            return Response(data=_output(name, row))
+        return Response(data=rows[0])
+
+    # 게시글·링크 수정 함수는 전체 값을 받으므로 기존 값과 합침
+    current = await _get_row(request, name, record_id)
+    if name == "categories":
+        await _db(update_category, record_id, data.get("name") or current["name"], user_id=user_id)
+    elif name == "posts":
+        await _db(
+            update_post,
+            record_id,
+            data.get("title", current["title"]),
+            data.get("content", current["content"]),
+            reflection_date=_parse_date(data.get("reflection_date"), "reflection_date"),
+            user_id=user_id,
+        )
+    else:
+        await _db(
+            update_link,
+            record_id,
+            data.get("site_name", current["site_name"]),
+            data.get("url", current["url"]),
+            user_id=user_id,
+        )
+    row = await _get_row(request, name, record_id)
+    return Response(data=_output(name, row))
+
+
+DELETE_FUNCTIONS = {
+    "goals": delete_goal,
+    "categories": delete_category,
+    "posts": delete_post,
+    "links": delete_link,
+}
+
+
+async def delete_item(request, name, record_id):
+    if not await _db(DELETE_FUNCTIONS[name], record_id, user_id=request.user_id):
+        raise ApiError(404, f"{name}/{record_id}을(를) 찾을 수 없습니다.")
+    return Response(204)
+
+
+async def bulk_create_goals(request):
+    items = _bulk_items(request.json())
+    rows = await _db(add_goals, [_goal_fields(item) for item in items], user_id=request.user_id)
+    return Response(201, {"items": rows})
+
+
+async def bulk_update_goals(request):
+    items = _bulk_items(request.json())
+    if not all(isinstance(item.get("id"), int) for item in items):
+        raise ApiError(400, "각 항목에 정수 id가 필요합니다.")
+    changes = [{**_goal_fields(item), "id": item["id"]} for item in items]
+    rows = await _db(update_goals, changes, user_id=request.user_id)
+    return Response(data={"items": rows})
+
+
+# 라우팅: (메서드, 경로 정규식, 핸들러, 인증 필요 여부)
+_COLLECTION = "(?P<name>goals|categories|posts|links)"
+ROUTES = [
+    ("GET", r"/api/health", health, False),
+    ("POST", r"/api/goals/bulk", bulk_create_goals, True),
+    ("PATCH", r"/api/goals/bulk", bulk_update_goals, True),
+    ("GET", rf"/api/{_COLLECTION}", list_collection, True),
+    ("POST", rf"/api/{_COLLECTION}", create_item, True),
+    ("GET", rf"/api/{_COLLECTION}/(?P<record_id>\d+)", get_item, True),
+    ("PATCH", rf"/api/{_COLLECTION}/(?P<record_id>\d+)", update_item, True),
+    ("DELETE", rf"/api/{_COLLECTION}/(?P<record_id>\d+)", delete_item, True),
+]
+ROUTES = [(method, re.compile(pattern + "$"), handler, auth) for method, pattern, handler, auth in ROUTES]
+
+
+async def handle(request: Request) -> Response:
+    path_matched = False
+    for method, pattern, handler, auth in ROUTES:
+        match = pattern.match(request.path)
+        if not match:
+            continue
+        path_matched = True
+        if method != request.method:
+            continue
+        begin_unit(f"{method} {pattern.pattern}")
+        params = match.groupdict()
+        if "record_id" in params:
+            params["record_id"] = int(params["record_id"])
+        try:
+            if auth:
+                request.user_id = await _authenticate(request)
+            return await handler(request, **params)
+        except ApiError as e:
+            return Response(e.status, {"error": e.message})
+        except ValueError as e:
+            return Response(400, {"error": str(e)})
+        except Exception as e:
+            print(f"API 처리 중 오류 발생 ({request.method} {request.path}): {e}")
+            return Response(500, {"error": "서버 오류가 발생했습니다."})
+    if path_matched:
+        return Response(405, {"error": "지원하지 않는 메서드입니다."})
+    return Response(404, {"error": "없는 경로입니다."})
+
+
+async def app(scope, receive, send):
+    """ASGI 진입점"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    response = await handle(Request(scope, body))
+    await send(
+        {"type": "http.response.start", "status": response.status, "headers": response.headers}
+    )
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class ApiResponse:
+    def __init__(self, status: int, headers: dict, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class LocalClient:
+    """ASGI 서버 없이 같은 프로세스에서 app을 호출하는 클라이언트 (테스트·벤치마크용)
+
+        client = LocalClient(token)
+        page = client.get("/api/goals?limit=20").json()
+        client.patch("/api/goals/bulk", {"items": [{"id": 1, "status": "완료"}]})
+    """
+
+    def __init__(self, token: str = None, application=app):
+        self.token = token
+        self.application = application
+        self._loop = asyncio.new_event_loop()
+
+    async def arequest(self, method: str, path: str, body=None, headers: dict = None) -> ApiResponse:
+        path, _, query = path.partition("?")
+        headers = dict(headers or {})
+        if self.token:
+            headers.setdefault("authorization", f"Bearer {self.token}")
+        payload = b"" if body is None else json.dumps(body, default=_json_default).encode("utf-8")
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": query.encode("latin-1"),
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        }
+        messages = [{"type": "http.request", "body": payload, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.application(scope, receive, send)
+        start = sent[0]
+        return ApiResponse(
+            start["status"],
+            {k.decode("latin-1"): v.decode("latin-1") for k, v in start["headers"]},
+            b"".join(message.get("body", b"") for message in sent[1:]),
+        )
+
+    def request(self, method: str, path: str, body=None, headers: dict = None) -> ApiResponse:
+        return self._loop.run_until_complete(self.arequest(method, path, body, headers))
+
+    def get(self, path: str, headers: dict = None) -> ApiResponse:
+        return self.request("GET", path, headers=headers)
+
+    def post(self, path: str, body=None) -> ApiResponse:
+        return self.request("POST", path, body)
+
+    def patch(self, path: str, body=None) -> ApiResponse:
+        return self.request("PATCH", path, body)
+
+    def delete(self, path: str) -> ApiResponse:
+        return self.request("DELETE", path)
+
+    def close(self):
+        self._loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목표 달성 GPT JSON API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("API 서버 실행에는 uvicorn이 필요합니다: pip install uvicorn")
+    uvicorn.run("api_server:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""벤치마크용 가상 다중 사용자 데이터 생성기
+
+database.py의 스키마(사용자, 프로필, 세션, 카테고리, 반복 일정을 포함한 목표,
+모든 board_type의 게시글, 링크)를 정해진 규모로 채운다. 같은 seed면 항상 같은
+데이터가 만들어진다.
+
+    DATABASE_URL=sqlite:///bench.db python benchmarks/datagen.py --scale 10
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 규모별 데이터 양 (1×는 실제 사용자 몇 명이 몇 달 사용한 정도)
+SCALES = {
+    1: {"users": 3, "goals": 200, "recurring_series": 4, "posts": 20, "links": 30},
+    10: {"users": 10, "goals": 600, "recurring_series": 12, "posts": 60, "links": 90},
+    100: {"users": 30, "goals": 2000, "recurring_series": 40, "posts": 200, "links": 300},
+}
+
+BOARD_TYPES = ["info", "idea", "reflection", "chat"]
+CATEGORY_NAMES = ["업무", "건강", "공부", "가족", "취미", "재테크"]
+GOAL_STATUS = ["진행 전", "진행 중", "완료"]
+WORDS = (
+    "목표 달성 계획 운동 독서 회의 보고서 마감 프로젝트 정리 공부 영어 코딩 산책 "
+    "가계부 저축 청소 요리 여행 준비 발표 자료 리뷰 배포 테스트 아이디어 회고 메모"
+).split()
+
+# 생성되는 모든 사용자의 로그인 비밀번호 (부하 테스트에서 로그인 화면을 거칠 때 사용)
+BENCH_PASSWORD = "bench-password"
+
+# 기준 시각 (UTC). 기간 필터가 실제처럼 동작하도록 실행 시점 주변에 목표를 배치하고,
+# 날짜 외의 내용과 분포는 seed로 재현된다.
+NOW = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+
+
+def _sentence(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _status(rng, end):
+    """상태와 완료 시각 (완료한 목표의 일부는 마감 뒤에 완료)"""
+    status = rng.choices(GOAL_STATUS, weights=[3, 2, 5])[0]
+    if status != "완료":
+        return {"status": status, "completed_at": None}
+    late_hours = rng.randint(1, 48) if rng.random() < 0.3 else -rng.randint(0, 12)
+    return {"status": status, "completed_at": end + timedelta(hours=late_hours)}
+
+
+def _goal_row(rng, user_id, category_ids, start, hours):
+    row = {
+        "user_id": user_id,
+        "title": _sentence(rng, rng.randint(2, 5)),
+        "start_date": start,
+        "end_date": start + timedelta(hours=hours),
+        "trigger_action": _sentence(rng, 3) if rng.random() < 0.3 else None,
+        "importance": rng.randint(1, 10),
+        "memo": _sentence(rng, rng.randint(5, 30)) if rng.random() < 0.6 else None,
+        **_status(rng, start + timedelta(hours=hours)),
+        "category_id": rng.choice(category_ids) if rng.random() < 0.8 else None,
+        "created_at": start - timedelta(days=rng.randint(0, 14)),
+    }
+    row["updated_at"] = min(row["created_at"], NOW)  # 마지막 수정 시각 (미래일 수 없음)
+    return row
+
+
+def generate_user(db, rng, index, volume, password_hash="!"):
+    """사용자 한 명과 그 사용자의 모든 데이터를 생성하는 함수"""
+    from sqlalchemy import insert
+    from database import (
+        User,
+        UserProfile,
+        Session,
+        Category,
+        Goal,
+        Board,
+        Link,
+    )
+
+    user = User(
+        username=f"bench_user_{index}",
+        email=f"bench_user_{index}@example.com",
+        password_hash=password_hash,
+        is_active=True,
+    )
+    db.add(user)
+    db.flush()
+    user_id = user.id
+
+    db.add(
+        UserProfile(
+            user_id=user_id,
+            content=f"저는 {_sentence(rng, 20)}",
+            consultant_style="친절하고 구체적으로 조언해 주세요.",
+        )
+    )
+    db.add(
+        Session(
+            user_id=user_id,
+            session_token=f"bench-token-{index}",
+            expires_at=NOW + timedelta(days=7),
+        )
+    )
+
+    categories = [Category(user_id=user_id, name=name) for name in CATEGORY_NAMES]
+    db.add_all(categories)
+    db.flush()
+    category_ids = [c.id for c in categories]
+
+    # 단발성 목표: 지난 6개월 ~ 앞으로 2개월 사이에 분포
+    goals = []
+    for _ in range(volume["goals"]):
+        start = NOW + timedelta(hours=rng.randint(-24 * 180, 24 * 60))
+        goals.append(_goal_row(rng, user_id, category_ids, start, rng.choice([1, 2, 3, 24, 72])))
+
+    # 반복 일정: 특정 요일마다 30일간 (add_recurring_goals와 같은 모양)
+    for _ in range(volume["recurring_series"]):
+        weekdays = rng.sample(range(7), rng.randint(1, 3))
+        base = NOW.replace(hour=rng.randint(0, 14)) - timedelta(days=rng.randint(0, 60))
+        series = _goal_row(rng, user_id, category_ids, base, 1)
+        for day in range(30):
+            date = base + timedelta(days=day)
+            if date.weekday() in weekdays:
+                end = date + timedelta(hours=1)
+                goals.append(
+                    {**series, "start_date": date, "end_date": end, **_status(rng, end)}
+                )
+    db.execute(insert(Goal), goals)
+
+    posts = []
+    for board_type in BOARD_TYPES:
+        for _ in range(volume["posts"]):
+            created = NOW - timedelta(hours=rng.randint(0, 24 * 180))
+            posts.append(
+                {
+                    "user_id": user_id,
+                    "title": _sentence(rng, rng.randint(2, 6)),
+                    "content": "\n\n".join(
+                        _sentence(rng, rng.randint(10, 60)) for _ in range(rng.randint(1, 8))
+                    ),
+                    "image_path": None,
+                    "board_type": board_type,
+                    "reflection_date": created.date() if board_type == "reflection" else None,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+    db.execute(insert(Board), posts)
+
+    links = []
+    for i in range(volume["links"]):
+        created = NOW - timedelta(hours=rng.randint(0, 24 * 180))
+        links.append(
+            {
+                "user_id": user_id,
+                "site_name": _sentence(rng, 2),
+                "url": f"https://example.com/{user_id}/{i}",
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+    db.execute(insert(Link), links)
+    return user_id
+
+
+def generate(scale: int = 1, seed: int = 42) -> dict:
+    """규모에 맞는 데이터를 생성하고 생성된 사용자 ID와 규모 정보를 반환하는 함수"""
+    from database import SessionLocal, ensure_schema, rebuild_goal_rollups
+
+    import bcrypt
+
+    volume = SCALES[scale]
+    ensure_schema()
+    rng = random.Random(seed)
+    # utils.auth_utils.hash_password와 같은 방식 (Streamlit 페이지 모듈을 import하지 않도록 직접 해싱)
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    db = SessionLocal()
+    try:
+        user_ids = [
+            generate_user(db, rng, i, volume, password_hash)
+            for i in range(volume["users"])
+        ]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    # 목표를 한꺼번에 넣었으므로 일별 집계는 따로 계산
+    for user_id in user_ids:
+        rebuild_goal_rollups(user_id)
+    return {"scale": scale, "seed": seed, "user_ids": user_ids, "volume": volume}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, choices=sorted(SCALES), default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    result = generate(args.scale, args.seed)
+    print(f"사용자 {len(result['user_ids'])}명 생성 (규모 {args.scale}×)")
+
+
+if __name__ == "__main__":
+    main()
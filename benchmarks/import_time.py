@@ -0,0 +1,189 @@
+"""페이지별 import 비용 측정 스크립트
+
+각 페이지(Home.py, pages/*.py)의 최상위 import 문만 뽑아 새 프로세스에서
+`python -X importtime`으로 실행하고, 페이지별 누적 import 시간과 가장 비싼
+모듈을 보고한다. 예산 파일(import_budget.json)보다 느려졌거나 예산이 없는
+페이지가 있으면 종료 코드 1을 반환한다.
+
+import 시간은 기계와 부하에 따라 다르므로 예산은 ms가 아니라 기준 import(페이지들이
+공통으로 쓰는 외부 패키지) 대비 배율로 저장한다. 페이지를 측정할 때마다 바로 앞에
+기준도 측정해 두 값의 비율을 구하고, 그 중앙값을 페이지의 배율로 쓴다.
+
+    python benchmarks/import_time.py                    # 측정 후 예산과 비교
+    python benchmarks/import_time.py --update-budget    # 현재 배율 + 여유(--headroom)로 예산 갱신
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT, "benchmarks", "import_budget.json")
+
+# 예산 배율의 기준이 되는 import 문
+REFERENCE_IMPORT = "import streamlit, pandas, sqlalchemy"
+
+
+def page_paths() -> list:
+    return [os.path.join(ROOT, "Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def page_imports(path: str) -> str:
+    """페이지의 모듈 최상위 import 문만 모아 하나의 스크립트로 만드는 함수"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=path)
+    statements = [
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    return "\n".join(statements)
+
+
+def parse_importtime(stderr: str) -> list:
+    """-X importtime 출력을 (모듈, 자체 us, 누적 us, 깊이) 목록으로 변환하는 함수
+
+    깊이 0이 페이지에서 직접 import한 모듈이다.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        # 구분자 뒤 공백 1칸 + 중첩 깊이마다 2칸
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def run_importtime(code: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+def startup_modules() -> set:
+    """인터프리터 시작 시 불러오는 모듈 (site 등은 페이지 비용에서 제외)"""
+    return {row[0] for row in parse_importtime(run_importtime("pass").stderr)}
+
+
+def measure(code: str, baseline: set) -> dict:
+    """import 문들의 import 시간을 새 프로세스에서 측정하는 함수"""
+    proc = run_importtime(code)
+    rows = parse_importtime(proc.stderr)
+    # 최상위(깊이 0) 항목의 누적 시간 합이 전체 import 시간
+    top_level = [row for row in rows if row[3] == 0 and row[0] not in baseline]
+    result = {
+        "total_ms": sum(row[2] for row in top_level) / 1000,
+        "top": [
+            {"module": name, "cumulative_ms": cumulative / 1000}
+            for name, _, cumulative, _ in sorted(top_level, key=lambda r: r[2], reverse=True)[:5]
+        ],
+    }
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1]
+    return result
+
+
+def measure_relative(code: str, baseline: set, runs: int) -> dict:
+    """기준 import와 번갈아 runs번 측정해 배율 중앙값에 해당하는 결과를 반환하는 함수"""
+    results = []
+    for _ in range(runs):
+        reference = measure(REFERENCE_IMPORT, baseline)
+        result = measure(code, baseline)
+        if "error" in reference:
+            result["error"] = f"기준 import 실패: {reference['error']}"
+        result["reference_ms"] = reference["total_ms"]
+        result["ratio"] = result["total_ms"] / reference["total_ms"] if reference["total_ms"] else 0.0
+        results.append(result)
+    median = statistics.median(r["ratio"] for r in results)
+    return min(results, key=lambda r: abs(r["ratio"] - median))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="페이지별 반복 측정 횟수 (중앙값 사용)")
+    parser.add_argument(
+        "--headroom", type=float, default=0.3, help="예산 갱신 시 측정 배율에 더하는 여유 비율"
+    )
+    parser.add_argument("--update-budget", action="store_true")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    budget = {}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+        # 기준 import가 바뀌면 저장된 배율을 비교할 수 없음
+        if saved.get("reference") == REFERENCE_IMPORT:
+            budget = saved["pages"]
+        elif not args.update_budget:
+            print(f"예산의 기준 import가 다릅니다: {BUDGET_PATH} (--update-budget으로 다시 만드세요)", file=sys.stderr)
+            return 1
+    elif not args.update_budget:
+        print(f"예산 파일이 없습니다: {BUDGET_PATH} (--update-budget으로 만드세요)", file=sys.stderr)
+        return 1
+
+    baseline = startup_modules()
+    # 첫 실행은 디스크 캐시가 비어 있어 느리므로 버림
+    measure(REFERENCE_IMPORT, baseline)
+    results = {}
+    for path in page_paths():
+        page = os.path.relpath(path, ROOT)
+        results[page] = measure_relative(page_imports(path), baseline, args.runs)
+
+    failed = []
+    for page, result in results.items():
+        limit = budget.get(page)
+        status = ""
+        if "error" in result:
+            status = f"  ERROR: {result['error']}"
+            failed.append(page)
+        elif limit is None:
+            if not args.update_budget:
+                status = "  NO BUDGET (--update-budget으로 추가)"
+                failed.append(page)
+        elif result["ratio"] > limit:
+            status = f"  OVER BUDGET (x{limit:.2f})"
+            failed.append(page)
+        if not args.json:
+            top = ", ".join(f"{t['module']} {t['cumulative_ms']:.0f}" for t in result["top"][:3])
+            print(
+                f"{page:45s} {result['total_ms']:8.1f} ms  x{result['ratio']:.2f} "
+                f"(기준 {result['reference_ms']:.0f} ms)  [{top}]{status}"
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.update_budget:
+        new_budget = {
+            "reference": REFERENCE_IMPORT,
+            "pages": {
+                page: round(r["ratio"] * (1 + args.headroom), 2)
+                for page, r in results.items()
+                if "error" not in r
+            },
+        }
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(new_budget, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"예산 갱신: {BUDGET_PATH}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Perplexity API 스텁 서버와 검색 클라이언트 측정 스크립트
+
+실제 API 대신 로컬 HTTP 서버를 띄워 지연 시간, 재시도, 캐시 동작을 측정한다.
+
+    python benchmarks/pplx_stub.py                  # 측정 실행
+    python benchmarks/pplx_stub.py --serve 8765     # 스텁 서버만 실행
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pplx_utils import PplxClient
+
+
+class StubState:
+    """스텁 서버 동작 설정과 요청 기록"""
+
+    def __init__(self, latency: float = 0.05, fail_every: int = 0, retry_after: float = 0.0):
+        self.latency = latency
+        self.fail_every = fail_every  # n번째 요청마다 429 응답 (0이면 실패 없음)
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.connections = set()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 연결 유지
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("content-length", 0)))
+            with state.lock:
+                state.requests += 1
+                count = state.requests
+                state.connections.add(self.client_address)
+            time.sleep(state.latency)
+
+            if state.fail_every and count % state.fail_every == 0:
+                with state.lock:
+                    state.failures += 1
+                payload = json.dumps({"error": "rate limited"}).encode()
+                self.send_response(429)
+                self.send_header("retry-after", str(state.retry_after))
+            else:
+                query = json.loads(body)["messages"][-1]["content"]
+                payload = json.dumps(
+                    {"choices": [{"message": {"content": f"stub: {query}"}}]},
+                    ensure_ascii=False,
+                ).encode()
+                self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    # 동시 연결이 몰려도 SYN 재전송 지연이 생기지 않도록 대기열을 넉넉히 둠
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def start_stub(state: StubState, port: int = 0) -> ThreadingHTTPServer:
+    server = StubServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_benchmark(queries: int, latency: float, fail_every: int) -> dict:
+    state = StubState(latency=latency, fail_every=fail_every)
+    server = start_stub(state)
+    url = f"http://127.0.0.1:{server.server_address[1]}/chat/completions"
+    client = PplxClient(api_key="stub", base_url=url, backoff_base=0.01, backoff_max=0.1)
+    words = [f"검색어 {i}" for i in range(queries)]
+    results = {}
+
+    try:
+        started = time.perf_counter()
+        for word in words:
+            client.search(word)
+        results["sequential_s"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for word in words:
+            client.search(f"  {word.upper()} ")  # 정규화 후 같은 키
+        results["cached_s"] = time.perf_counter() - started
+
+        client._cache.clear()
+        started = time.perf_counter()
+        outcomes = client.search_many(words)
+        results["concurrent_s"] = time.perf_counter() - started
+        results["concurrent_errors"] = sum(isinstance(o, Exception) for o in outcomes)
+    finally:
+        client.close()
+        server.shutdown()
+
+    results.update(
+        {
+            "queries": queries,
+            "stub_latency_s": latency,
+            "server_requests": state.requests,
+            "server_429": state.failures,
+            "client_connections": len(state.connections),
+            **client.stats,
+        }
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--serve", type=int, metavar="PORT", help="스텁 서버만 실행")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fail-every", type=int, default=5, help="n번째 요청마다 429 응답")
+    args = parser.parse_args()
+
+    if args.serve:
+        server = start_stub(StubState(args.latency, args.fail_every), args.serve)
+        print(f"stub listening on http://127.0.0.1:{args.serve}/chat/completions")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    print(json.dumps(run_benchmark(args.queries, args.latency, args.fail_every), indent=2))
+
+
+if __name__ == "__main__":
+    main()
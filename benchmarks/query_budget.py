@@ -0,0 +1,241 @@
+"""페이지별 DB 왕복 예산 검사
+
+datagen으로 채운 SQLite 데이터베이스에서 로그인된 AppTest 세션으로 각 페이지를
+처음 실행(first)하고 한 번 더 실행(rerun)하면서 SQL 실행 수와 연결 체크아웃 수를 센다.
+query_budget.json의 페이지별 예산을 넘으면 넘은 항목과 그때 실행된 SQL 모양을
+출력하고 종료 코드 1을 반환한다 (CI에서 쿼리 수 회귀 검사용).
+
+    python benchmarks/query_budget.py
+    python benchmarks/query_budget.py --pages 1_goal_list.py 10_reflection_board.py
+    python benchmarks/query_budget.py --update   # 현재 값으로 예산 파일 갱신
+
+예산은 프로세스 캐시(카테고리·프로필)를 비운 상태에서 페이지마다 새 세션으로 잰 값이다.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+BUDGET_PATH = os.path.join(BENCH_DIR, "query_budget.json")
+sys.path[:0] = [ROOT, BENCH_DIR]
+
+import datagen  # noqa: E402
+import suite  # noqa: E402
+
+RUNS = ["first", "rerun"]
+METRICS = ["statements", "checkouts"]
+
+# 로그인하지 않은 상태로 여는 페이지
+ANONYMOUS_PAGES = {"login.py"}
+
+
+class RoundTripCounter:
+    """SQL 실행 수와 풀 연결 체크아웃 수"""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        from sqlalchemy.pool import Pool
+
+        self.lock = threading.Lock()
+        self.statements = 0
+        self.checkouts = 0
+        event.listen(Engine, "before_cursor_execute", self._on_statement)
+        event.listen(Pool, "checkout", self._on_checkout)
+
+    def _on_statement(self, *args):
+        with self.lock:
+            self.statements += 1
+
+    def _on_checkout(self, *args):
+        with self.lock:
+            self.checkouts += 1
+
+    def take(self) -> dict:
+        """지난 take() 이후의 값을 반환하고 0으로 되돌리는 함수"""
+        with self.lock:
+            counts = {"statements": self.statements, "checkouts": self.checkouts}
+            self.statements = self.checkouts = 0
+        return counts
+
+
+def page_files(names=None) -> dict:
+    """페이지 이름 -> 파일 경로 (Home.py와 pages/*.py)"""
+    paths = [os.path.join(ROOT, "Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    pages = {os.path.basename(path): path for path in paths}
+    if names:
+        unknown = set(names) - set(pages)
+        if unknown:
+            raise SystemExit(f"없는 페이지: {', '.join(sorted(unknown))}")
+        pages = {name: pages[name] for name in names}
+    return pages
+
+
+def prepare_database(args) -> int:
+    """seed 데이터베이스를 준비하고 로그인할 사용자 ID를 반환하는 함수"""
+    from config import get_settings
+    from database import dispose_engine, get_engine
+    from sqlalchemy import text
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"query_budget_{args.scale}x_seed{args.seed}.db")
+    if os.path.exists(path) and not args.reuse_data:
+        os.remove(path)
+    reuse = os.path.exists(path)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    if not reuse:
+        get_settings.cache_clear()
+        dispose_engine()
+        user_id = datagen.generate(args.scale, args.seed)["user_ids"][0]
+    else:
+        with get_engine().connect() as conn:
+            user_id = conn.execute(text("SELECT MIN(id) FROM users")).scalar()
+
+    # 관리자 전용 페이지도 열 수 있도록 측정 사용자를 관리자로 설정
+    os.environ["ADMIN_USER_IDS"] = str(user_id)
+    get_settings.cache_clear()
+    dispose_engine()
+    return user_id
+
+
+def reset_process_caches():
+    """페이지마다 같은 조건에서 재도록 프로세스 전체 캐시를 비우는 함수"""
+    from utils.category_cache import invalidate_categories
+    from utils.profile_cache import invalidate_profile
+
+    invalidate_categories(None)
+    invalidate_profile(None)
+
+
+def page_state(name: str, user_id: int) -> dict:
+    """페이지를 열기 전에 넣어 둘 세션 상태 (목록에서 항목을 골라 들어온 경우)"""
+    if name == "3_goal_detail.py":
+        from database import get_goals
+
+        return {"selected_goal_id": int(get_goals(user_id=user_id)["id"].min())}
+    return {}
+
+
+def measure_page(name: str, path: str, user_id: int, counter: RoundTripCounter, timeout: float) -> dict:
+    """페이지를 처음 실행하고 한 번 더 실행하며 실행별 왕복 수와 SQL 모양을 반환하는 함수"""
+    from streamlit.testing.v1 import AppTest
+    from utils import query_stats
+
+    reset_process_caches()
+    at = AppTest.from_file(path, default_timeout=timeout)
+    if name not in ANONYMOUS_PAGES:
+        at.session_state["authenticated"] = True
+        at.session_state["user_id"] = user_id
+        at.session_state["username"] = "bench"
+        for key, value in page_state(name, user_id).items():
+            at.session_state[key] = value
+
+    result = {}
+    counter.take()
+    for run in RUNS:
+        query_stats.reset()
+        at.run()
+        counts = counter.take()
+        if at.exception:
+            counts["error"] = at.exception[0].message
+        counts["queries"] = [
+            {"count": q["count"], "caller": ", ".join(q["callers"]), "shape": q["shape"]}
+            for q in query_stats.snapshot(sort="count")
+        ]
+        result[run] = counts
+    return result
+
+
+def check(measured: dict, budgets: dict) -> list:
+    """예산을 넘은 (페이지, 실행, 항목, 측정값, 예산) 목록"""
+    failures = []
+    for name, runs in measured.items():
+        page_budget = budgets.get(name)
+        for run, counts in runs.items():
+            if counts.get("error"):
+                failures.append((name, run, "error", counts["error"], None))
+                continue
+            if page_budget is None:
+                failures.append((name, run, "budget", None, None))
+                continue
+            for metric in METRICS:
+                limit = page_budget[run][metric]
+                if counts[metric] > limit:
+                    failures.append((name, run, metric, counts[metric], limit))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="*", help="이 페이지만 검사 (예: 1_goal_list.py)")
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--update", action="store_true", help="측정값을 예산 파일에 기록")
+    parser.add_argument("--scale", type=int, default=1, choices=sorted(datagen.SCALES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse-data", action="store_true", help="이미 만든 데이터베이스 재사용")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--verbose", action="store_true", help="페이지마다 실행된 SQL 모양 출력")
+    args = parser.parse_args()
+
+    user_id = prepare_database(args)
+    suite.use_stub_llm()
+    counter = RoundTripCounter()
+
+    measured = {}
+    for name, path in page_files(args.pages).items():
+        measured[name] = runs = measure_page(name, path, user_id, counter, args.timeout)
+        print(
+            f"{name:35s} "
+            + "  ".join(f"{run} SQL {runs[run]['statements']:3d} / 연결 {runs[run]['checkouts']:3d}" for run in RUNS)
+        )
+        if args.verbose:
+            for run in RUNS:
+                for query in runs[run]["queries"]:
+                    print(f"    {run:5s} {query['count']:3d}× {query['caller']:30s} {query['shape'][:100]}")
+
+    budgets = {}
+    if os.path.exists(args.budget):
+        with open(args.budget, encoding="utf-8") as f:
+            budgets = json.load(f)["pages"]
+
+    if args.update:
+        budgets.update(
+            {
+                name: {run: {metric: runs[run][metric] for metric in METRICS} for run in RUNS}
+                for name, runs in measured.items()
+            }
+        )
+        with open(args.budget, "w", encoding="utf-8") as f:
+            json.dump(
+                {"scale": args.scale, "seed": args.seed, "pages": dict(sorted(budgets.items()))},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+            f.write("\n")
+        print(f"예산 갱신: {args.budget}")
+        return
+
+    failures = check(measured, budgets)
+    for name, run, metric, value, limit in failures:
+        if metric == "error":
+            print(f"실패 {name} ({run}): 실행 중 오류 - {value}")
+        elif metric == "budget":
+            print(f"실패 {name} ({run}): 예산이 없습니다. --update로 추가하세요.")
+        else:
+            print(f"실패 {name} ({run}): {metric} {value} > 예산 {limit}")
+            for query in measured[name][run]["queries"]:
+                print(f"    {query['count']:3d}× {query['caller']:30s} {query['shape'][:120]}")
+    if failures:
+        sys.exit(1)
+    print("모든 페이지가 쿼리 예산 안에 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
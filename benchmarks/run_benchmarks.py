@@ -0,0 +1,156 @@
+"""벤치마크 실행기
+
+규모별로 SQLite 데이터베이스를 만들어 datagen으로 채운 뒤, suite.py의 항목을
+Streamlit AppTest 스크립트 안에서 측정하고 결과를 JSON으로 저장한다.
+기준 결과(--baseline)를 주면 중앙값을 비교해 threshold배 이상 느려진 항목이
+있을 때 종료 코드 1을 반환한다.
+
+    python benchmarks/run_benchmarks.py --scales 1 10 --output benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+sys.path.insert(0, ROOT)
+
+# pyarrow가 최상위 benchmarks 패키지를 설치하므로 이 폴더의 모듈은 이름으로 바로 import
+import datagen  # noqa: E402
+import suite  # noqa: E402
+
+SCRIPT = f"""
+import sys
+sys.path[:0] = [{ROOT!r}, {BENCH_DIR!r}]
+import suite
+suite.run_in_script()
+"""
+
+
+def use_database(url: str):
+    """이후의 database 호출이 url을 쓰도록 설정과 엔진을 초기화하는 함수"""
+    from config import get_settings
+    from database import dispose_engine
+
+    os.environ["DATABASE_URL"] = url
+    get_settings.cache_clear()
+    dispose_engine()
+
+
+def table_counts() -> dict:
+    from sqlalchemy import text
+    from database import get_engine
+
+    with get_engine().connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in ["users", "goals", "categories", "boards", "links", "sessions"]
+        }
+
+
+def run_scale(scale: int, args) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"bench_{scale}x_seed{args.seed}.db")
+    if os.path.exists(path) and not args.reuse_data:
+        os.remove(path)
+    reuse = os.path.exists(path)
+    use_database(f"sqlite:///{path}")
+
+    if reuse:
+        from database import get_engine
+        from sqlalchemy import text
+
+        with get_engine().connect() as conn:
+            user_id = conn.execute(text("SELECT MIN(id) FROM users")).scalar()
+    else:
+        user_id = datagen.generate(scale, args.seed)["user_ids"][0]
+
+    suite.CONFIG.update(
+        {"user_id": user_id, "repeat": args.repeat, "warmup": args.warmup, "only": args.only}
+    )
+    from utils import query_stats
+
+    query_stats.reset()
+    at = AppTest.from_string(SCRIPT, default_timeout=args.timeout)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {
+        "rows": table_counts(),
+        "results": dict(suite.LAST_RESULTS),
+        # 측정 중 실행된 SQL 모양별 통계 (총 시간 상위)
+        "queries": query_stats.snapshot(limit=args.top_queries),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """기준보다 threshold배 이상 느려진 (규모, 항목, 비율) 목록"""
+    regressions = []
+    for scale, data in current["scales"].items():
+        base_results = baseline.get("scales", {}).get(scale, {}).get("results", {})
+        for name, result in data["results"].items():
+            base = base_results.get(name)
+            if not base or not base["median_ms"]:
+                continue
+            ratio = result["median_ms"] / base["median_ms"]
+            result["baseline_ratio"] = round(ratio, 3)
+            if ratio > threshold:
+                regressions.append((scale, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], choices=sorted(datagen.SCALES))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--reuse-data", action="store_true", help="이미 만든 데이터베이스 재사용")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results", "latest.json"))
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--top-queries", type=int, default=20, help="결과에 남길 SQL 모양 수 (총 시간 순)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "scales": {},
+    }
+    for scale in args.scales:
+        print(f"== {scale}× ==")
+        report["scales"][str(scale)] = data = run_scale(scale, args)
+        for name, result in data["results"].items():
+            print(f"  {name:45s} median {result['median_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {args.output}")
+
+    for scale, name, ratio in regressions:
+        print(f"느려짐: [{scale}×] {name} {ratio:.2f}배")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""벤치마크 항목 정의
+
+run_benchmarks.py가 AppTest 스크립트 안에서 run_in_script()를 호출한다.
+(대화 메모리와 사용자별 캐시가 st.session_state를 쓰므로 실제 스크립트 실행 환경이 필요)
+"""
+import statistics
+import time
+import uuid
+
+# run_benchmarks.py가 실행 전에 채우고, 실행 후 결과를 읽어 감
+CONFIG = {"user_id": None, "repeat": 20, "warmup": 2, "only": None}
+LAST_RESULTS = {}
+
+# 요약 검증(10~400자)을 통과하는 고정 응답
+STUB_SUMMARY = "사용자는 운동 계획과 업무 마감 일정을 정리했고, AI는 우선순위를 제안했다."
+
+
+def measure(func, repeat: int, warmup: int) -> dict:
+    """func를 warmup회 실행한 뒤 repeat회 측정한 통계를 반환하는 함수"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def use_stub_llm():
+    """LLMFactory가 외부 API 대신 고정 응답 모델을 쓰도록 바꾸는 함수"""
+    from langchain_core.language_models import FakeListChatModel
+    from utils.llm_utils import LLMFactory
+
+    LLMFactory.create_llm = staticmethod(
+        lambda model_name: FakeListChatModel(responses=[STUB_SUMMARY])
+    )
+
+
+def chat_memory_round(pairs: int = 10):
+    """대화 pairs쌍을 쌓고(3쌍마다 요약) LLM에 보낼 메시지 목록을 만드는 함수"""
+    from utils.llm_utils import ChatMemory
+
+    memory = ChatMemory(f"bench-{uuid.uuid4().hex}")
+    memory.add_message("system", "당신은 목표 달성을 돕는 코치입니다.")
+    for i in range(pairs):
+        memory.add_message("user", f"{i}번째 질문: 오늘 운동 목표를 어떻게 나눌까요?")
+        memory.add_message("assistant", f"{i}번째 답변: 오전 30분, 저녁 30분으로 나누세요. " * 3)
+        memory.get_messages()
+    return memory.get_messages()
+
+
+def benchmarks() -> dict:
+    """이름 -> 측정할 함수"""
+    import pandas as pd
+    import pytz
+    from database import get_goals, get_posts, get_post_summaries
+    from utils.goal_analytics import compute_goal_analytics
+    from utils.goal_filters import filter_goals_by_period, filter_goals_for_period, time_range_labels
+    from utils.prompt_utils import generate_system_message
+
+    goals_df = get_goals()
+    now = pd.Timestamp.now(tz=pytz.timezone("Asia/Seoul"))
+
+    items = {
+        "get_goals": get_goals,
+        "goal_list.filter_goals_by_period": lambda: filter_goals_by_period(goals_df, now),
+        "goal_list.filter_goals_for_period[1년]": lambda: filter_goals_for_period(goals_df, "1년", now),
+        "goal_list.time_range_labels": lambda: time_range_labels(goals_df),
+        "goal_analytics.compute": lambda: compute_goal_analytics(goals_df, now),
+        "generate_system_message": generate_system_message,
+        "chat_memory.assemble": chat_memory_round,
+    }
+    for board_type in ["info", "idea", "reflection", "chat"]:
+        items[f"get_posts[{board_type}]"] = lambda b=board_type: get_posts(b)
+        items[f"get_post_summaries[{board_type}]"] = lambda b=board_type: get_post_summaries(b)
+    return items
+
+
+def run_in_script():
+    import streamlit as st
+
+    st.session_state.user_id = CONFIG["user_id"]
+    use_stub_llm()
+
+    results = {}
+    for name, func in benchmarks().items():
+        if CONFIG["only"] and not any(pattern in name for pattern in CONFIG["only"]):
+            continue
+        results[name] = measure(func, CONFIG["repeat"], CONFIG["warmup"])
+    LAST_RESULTS.clear()
+    LAST_RESULTS.update(results)
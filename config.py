@@ -1,37 +1,146 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 import streamlit as st
 
+# secrets.toml 에서 각 변수가 들어 있는 섹션
+SECRET_SECTIONS = {
+    "OPENAI_API_KEY": "api_keys",
+    "ANTHROPIC_API_KEY": "api_keys",
+    "GOOGLE_API_KEY": "api_keys",
+    "PPLX_API_KEY": "api_keys",
+    "DATABASE_URL": "postgres",
+    "DB_HOST": "postgres",
+    "DB_PORT": "postgres",
+    "DB_USERNAME": "postgres",
+    "DB_PASSWORD": "postgres",
+    "DB_NAME": "postgres",
+    "ADMIN_USER_IDS": "app",
+    "TRACE_SAMPLE_RATE": "app",
+    "TRACE_EXPORT_PATH": "app",
+}
+
+# 데이터베이스 연결에 필요한 환경 변수 (DATABASE_URL이 없을 때)
+DB_ENV_VARS = ["DB_HOST", "DB_PORT", "DB_USERNAME", "DB_PASSWORD", "DB_NAME"]
+
+
+@lru_cache(maxsize=None)
+def _load_dotenv_once():
+    # .env 파일은 프로세스당 한 번만 읽음
+    load_dotenv()
+
+
+def _get_secret(var_name: str) -> Optional[str]:
+    section = SECRET_SECTIONS.get(var_name)
+    if section is None:
+        return None
+    try:
+        # secrets.toml이 없을 때 st.secrets에 바로 접근하면 화면에 오류가 표시됨
+        if not st.secrets.load_if_toml_exists():
+            return None
+        return st.secrets[section][var_name]
+    except Exception:
+        # 해당 섹션이나 항목이 없는 경우
+        return None
+
+
 # 환경 변수 가져오기
-def get_env_var(var_name: str) -> str:
-    if hasattr(st, "secrets"):  # Streamlit Cloud 환경
-        # API 키는 api_keys 섹션에서 가져옴
-        if var_name in ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY", "PPLX_API_KEY"]:
-            return st.secrets["api_keys"][var_name]
-        # 데이터베이스 관련 변수는 postgres 섹션에서 가져옴
-        elif var_name in ["DB_HOST", "DB_PORT", "DB_USERNAME", "DB_PASSWORD", "DB_NAME"]:
-            return st.secrets["postgres"][var_name]
-    else:  # 로컬 환경
-        load_dotenv()
-        return os.getenv(var_name)
-
-# 필수 환경 변수 검증
-required_env_vars = [
-    "OPENAI_API_KEY",
-    "DB_HOST",
-    "DB_PORT",
-    "DB_USERNAME",
-    "DB_PASSWORD",
-    "DB_NAME",
-    "PPLX_API_KEY",
-]
-
-for var in required_env_vars:
-    if not get_env_var(var):
-        raise ValueError(f"필수 환경 변수가 설정되지 않았습니다: {var}")
-
-# OpenAI API 설정
-OPENAI_API_KEY = get_env_var("OPENAI_API_KEY").strip()
+def get_env_var(var_name: str) -> Optional[str]:
+    """Streamlit secrets를 먼저 보고, 없으면 환경 변수(.env 포함)에서 가져오는 함수"""
+    value = _get_secret(var_name)
+    if value is None:
+        _load_dotenv_once()
+        value = os.getenv(var_name)
+    if isinstance(value, str):
+        value = value.strip()
+    return value if value not in ("", None) else None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """secrets/환경 변수에서 한 번만 읽어 두는 설정 값"""
+
+    database_url: Optional[str]
+    openai_api_key: Optional[str]
+    anthropic_api_key: Optional[str]
+    google_api_key: Optional[str]
+    pplx_api_key: Optional[str]
+    admin_user_ids: Tuple[int, ...] = ()
+    trace_sample_rate: float = 0.0  # 0이면 추적 안 함, 1이면 모든 rerun 추적
+    trace_export_path: Optional[str] = None  # 지정하면 span을 JSONL로 기록
+    slow_query_ms: float = 500.0  # 이보다 오래 걸린 SQL은 로그 출력, 0이면 출력 안 함
+
+    def require_database_url(self) -> str:
+        if not self.database_url:
+            missing = [var for var in DB_ENV_VARS if not get_env_var(var)]
+            raise ValueError(
+                f"필수 환경 변수가 설정되지 않았습니다: {', '.join(missing) or 'DATABASE_URL'}"
+            )
+        return self.database_url
+
+
+def _build_database_url() -> Optional[str]:
+    # DATABASE_URL이 있으면 우선 사용 (다른 DB로 테스트·벤치마크할 때)
+    url = get_env_var("DATABASE_URL")
+    if url:
+        return url
+    values = {var: get_env_var(var) for var in DB_ENV_VARS}
+    if not all(values.values()):
+        return None
+    return (
+        "postgresql://"
+        f"{values['DB_USERNAME']}:"
+        f"{values['DB_PASSWORD']}@"
+        f"{values['DB_HOST']}:"
+        f"{values['DB_PORT']}/"
+        f"{values['DB_NAME']}"
+    )
+
+
+def _parse_id_list(value) -> Tuple[int, ...]:
+    # "1, 2" 문자열 또는 secrets.toml의 [1, 2] 배열
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(int(str(item).strip()) for item in value if str(item).strip())
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """설정 객체를 반환하는 함수 (처음 호출할 때 한 번만 읽음)"""
+    return Settings(
+        database_url=_build_database_url(),
+        openai_api_key=get_env_var("OPENAI_API_KEY"),
+        anthropic_api_key=get_env_var("ANTHROPIC_API_KEY"),
+        google_api_key=get_env_var("GOOGLE_API_KEY"),
+        pplx_api_key=get_env_var("PPLX_API_KEY"),
+        admin_user_ids=_parse_id_list(get_env_var("ADMIN_USER_IDS")),
+        trace_sample_rate=float(get_env_var("TRACE_SAMPLE_RATE") or 0),
+        trace_export_path=get_env_var("TRACE_EXPORT_PATH"),
+        slow_query_ms=float(get_env_var("SLOW_QUERY_MS") or 500),
+    )
+
+
+def validate_settings(required=("DATABASE", "OPENAI_API_KEY", "PPLX_API_KEY")):
+    """필수 설정이 모두 있는지 확인하는 함수 (배포 점검·migrate 명령에서 사용)"""
+    settings = get_settings()
+    if "DATABASE" in required:
+        settings.require_database_url()
+    for var in required:
+        if var != "DATABASE" and not getattr(settings, var.lower()):
+            raise ValueError(f"필수 환경 변수가 설정되지 않았습니다: {var}")
+    return settings
+
+
+def __getattr__(name):
+    # 기존 `from config import OPENAI_API_KEY` 호환
+    if name == "OPENAI_API_KEY":
+        return get_settings().openai_api_key
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # 데이터베이스 설정
 DATABASE_NAME = "goals.db"
@@ -1,60 +1,98 @@
-import os
+import contextvars
+import csv
+import io
+import re
+import threading
+import zlib
+from contextlib import contextmanager
 from sqlalchemy import (
     create_engine,
+    inspect,
     Column,
     Integer,
+    BigInteger,
     String,
     Date,
     DateTime,
     Text,
+    Boolean,
+    LargeBinary,
+    Index,
     func,
+    insert,
+    update,
+    delete,
+    select,
+    case,
     text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime, date
+from sqlalchemy.sql.elements import TextClause
+from datetime import datetime, date, timedelta
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pytz
+from config import get_settings
+from utils.tracing import instrument_module
 
 
 # 데이터베이스 연결 정보
 def get_database_url():
-    if hasattr(st, "secrets"):  # Streamlit Cloud 환경
-        return (
-            "postgresql://"
-            f"{st.secrets.postgres.DB_USERNAME}:"
-            f"{st.secrets.postgres.DB_PASSWORD}@"
-            f"{st.secrets.postgres.DB_HOST}:"
-            f"{st.secrets.postgres.DB_PORT}/"
-            f"{st.secrets.postgres.DB_NAME}"
-        )
-    else:  # 로컬 환경
-        from dotenv import load_dotenv
+    return get_settings().require_database_url()
 
-        load_dotenv()
 
-        return (
-            "postgresql://"
-            f"{os.getenv('DB_USERNAME')}:"
-            f"{os.getenv('DB_PASSWORD')}@"
-            f"{os.getenv('DB_HOST')}:"
-            f"{os.getenv('DB_PORT')}/"
-            f"{os.getenv('DB_NAME')}"
-        )
+# SQLAlchemy 엔진 및 세션 설정
+# 엔진은 처음 필요할 때 만든다 (import만으로는 DB에 접속하지 않음)
+_engine = None
+_engine_lock = threading.Lock()
+_SessionFactory = sessionmaker(autocommit=False, autoflush=False)
 
 
-DATABASE_URL = get_database_url()
+def get_engine():
+    """지연 생성되는 SQLAlchemy 엔진을 반환하는 함수"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(get_database_url(), pool_pre_ping=True)
+                _SessionFactory.configure(bind=_engine)
+    return _engine
+
+
+def dispose_engine():
+    """엔진 연결을 닫는 함수 (다음 get_engine 호출 때 설정을 다시 읽어 새로 만듦)"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def SessionLocal():
+    """엔진에 연결된 새 세션을 반환하는 함수"""
+    get_engine()
+    return _SessionFactory()
+
+
+def __getattr__(name):
+    # 기존 `from database import engine` 호환
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-# SQLAlchemy 엔진 및 세션 설정
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
 # 모델 정의
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        # 마지막 동기화 이후 바뀐 목표 조회용
+        Index("ix_goals_user_sync", "user_id", "sync_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)  # user_id 필드 추가
@@ -66,7 +104,30 @@ class Goal(Base):
     memo = Column(Text)
     status = Column(String)
     category_id = Column(Integer)
+    completed_at = Column(DateTime)  # 완료 처리한 시각 (UTC)
     created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    sync_version = Column(BigInteger)  # 마지막으로 바꾼 트랜잭션의 사용자별 변경 번호
+
+
+# 삭제된 목표 기록 (다른 세션의 스냅샷이 삭제를 알 수 있도록)
+class GoalTombstone(Base):
+    __tablename__ = "goal_tombstones"
+    __table_args__ = (Index("ix_goal_tombstones_user_sync", "user_id", "sync_version"),)
+
+    id = Column(Integer, primary_key=True)
+    goal_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.now)
+    sync_version = Column(BigInteger)
+
+
+# 사용자별 목표 변경 번호 (목표를 바꾸는 트랜잭션마다 1씩 증가, 바뀐 행에 기록)
+class GoalSyncVersion(Base):
+    __tablename__ = "goal_sync_versions"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
 
 
 class Category(Base):
@@ -76,6 +137,7 @@ class Category(Base):
     user_id = Column(Integer, nullable=False)
     name = Column(String, nullable=False)  # unique=True 제거
     created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
 class GoalAnalysis(Base):
@@ -88,6 +150,21 @@ class GoalAnalysis(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+# 목표 일별 집계 (사용자·날짜·카테고리별, 목표를 추가·수정·삭제할 때 함께 갱신)
+class GoalDailyRollup(Base):
+    __tablename__ = "goal_daily_rollups"
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)  # 종료일(없으면 시작일)의 KST 날짜
+    category_id = Column(Integer, primary_key=True)  # 카테고리가 없으면 0
+    planned = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    incomplete = Column(Integer, nullable=False, default=0)
+    planned_score = Column(Integer, nullable=False, default=0)  # 중요도 합계
+    completed_score = Column(Integer, nullable=False, default=0)
+    incomplete_score = Column(Integer, nullable=False, default=0)
+
+
 class Board(Base):
     __tablename__ = "boards"
 
@@ -131,6 +208,7 @@ class User(Base):
     username = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
+    is_active = Column(Boolean, default=True, server_default=text("true"))
     last_login = Column(DateTime)
     created_at = Column(DateTime, default=datetime.now)
 
@@ -147,8 +225,115 @@ class Session(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 대화 기록 모델 (메시지 단위 저장)
+class ChatTranscript(Base):
+    __tablename__ = "chat_transcripts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    session_id = Column(String, nullable=False)  # 대화가 진행된 세션 ID
+    title = Column(String, nullable=False)
+    message_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_transcript_seq", "transcript_id", "seq", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    transcript_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    seq = Column(Integer, nullable=False)  # 대화 내 순서 (0부터)
+    role = Column(String, nullable=False)  # 'user' 또는 'assistant'
+    model = Column(String)
+    content = Column(Text)  # 짧은 메시지는 그대로 저장
+    content_compressed = Column(LargeBinary)  # 긴 메시지는 zlib 압축 저장
+    # 압축 저장한 메시지의 검색용 텍스트 (중복을 뺀 소문자 단어 목록, 짧은 메시지는 NULL)
+    search_text = Column(Text)
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
+    latency_ms = Column(Integer)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+# 이 크기(바이트)를 넘는 대화 메시지는 압축해서 저장
+CHAT_COMPRESS_THRESHOLD = 2048
+
+# 압축 메시지의 검색용 텍스트를 만들 때 쓰는 단어 기준 (utils.search.tokenize와 같음)
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def _missing_columns(conn):
+    """모델에는 있지만 DB 테이블에는 없는 컬럼 목록"""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(column for column in table.columns if column.name not in existing)
+    return missing
+
+
+# 컬럼을 추가할 때 기존 행을 채울 값 ("테이블.컬럼" -> 같은 행의 SQL 식)
+COLUMN_BACKFILLS = {
+    # 기존 행은 생성 시각을 마지막 수정 시각으로 사용
+    "goals.updated_at": "created_at",
+    "categories.updated_at": "created_at",
+}
+
+
+def _is_constant_default(column) -> bool:
+    """server_default가 상수(text("true") 등)인지 여부 (now() 같은 함수는 False)"""
+    return isinstance(column.server_default.arg, (str, TextClause))
+
+
+def ensure_schema():
+    """테이블을 만들고 모델에 새로 추가된 컬럼을 기존 테이블에 반영하는 함수
+
+    앱 import 경로에서는 호출하지 않으며 `python manage.py migrate`로 실행한다.
+    추가되는 컬럼은 NULL 허용으로 만든다. 상수 server_default는 ADD COLUMN의
+    DEFAULT로 넣어 기존 행도 그 값으로 채운다. COLUMN_BACKFILLS에 있는 컬럼과
+    함수 server_default는 기본값 없이 추가하고 기존 행을 채운 뒤 기본값을 설정한다
+    (SQLite는 상수가 아닌 DEFAULT로 컬럼을 추가하거나 기본값을 바꿀 수 없으므로
+    ORM 기본값만 쓴다). 반환값은 추가된 "테이블.컬럼" 목록이다.
+    """
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    ddl_compiler = engine.dialect.ddl_compiler(engine.dialect, None)
+    added = []
+    with engine.begin() as conn:
+        for column in _missing_columns(conn):
+            table, name = column.table.name, f"{column.table.name}.{column.name}"
+            column_spec = f"{column.name} {column.type.compile(dialect=engine.dialect)}"
+            default = ddl_compiler.get_column_default_string(column)
+            inline_default = (
+                default is not None and name not in COLUMN_BACKFILLS and _is_constant_default(column)
+            )
+            if inline_default:
+                column_spec += f" DEFAULT {default}"
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column_spec}"))
+            if name in COLUMN_BACKFILLS:
+                conn.execute(
+                    text(
+                        f"UPDATE {table} SET {column.name} = {COLUMN_BACKFILLS[name]} "
+                        f"WHERE {column.name} IS NULL"
+                    )
+                )
+            if default is not None and not inline_default and engine.dialect.name != "sqlite":
+                conn.execute(
+                    text(f"ALTER TABLE {table} ALTER COLUMN {column.name} SET DEFAULT {default}")
+                )
+            added.append(name)
+        # 기존 테이블에 새로 정의된 인덱스 (create_all은 새 테이블에만 인덱스를 만듦)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    return added
 
 
 # CRUD 함수들
@@ -160,6 +345,181 @@ def get_db():
         db.close()
 
 
+# 명시적 사용자 컨텍스트
+# 사용자별 함수는 user_id 인자 → user_context() → Streamlit 세션 순으로 사용자를 정한다.
+# ScriptRunContext가 없는 작업 스레드·CLI·API에서는 앞의 두 방법으로 넘긴다.
+_current_user = contextvars.ContextVar("current_user_id", default=None)
+
+
+@contextmanager
+def user_context(user_id: int):
+    """with 블록 안의 database 함수 호출을 user_id 사용자로 실행하는 함수
+
+    contextvars를 쓰므로 스레드·asyncio 작업마다 따로 적용된다. 스레드 풀에
+    넘길 때는 작업 안에서 user_context()를 열거나 user_id 인자를 넘긴다.
+    """
+    token = _current_user.set(int(user_id))
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+
+def current_user_id(user_id: int = None) -> int:
+    """작업 대상 사용자 ID를 반환하는 함수 (정할 수 없으면 RuntimeError)"""
+    if user_id is not None:
+        return int(user_id)
+    user_id = _current_user.get()
+    if user_id is not None:
+        return user_id
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        user_id = st.session_state.get("user_id")
+        if user_id is not None:
+            return user_id
+    raise RuntimeError(
+        "사용자를 알 수 없습니다. user_id 인자나 user_context()로 사용자를 지정하세요."
+    )
+
+
+# 변경 알림 (검색 색인 등 파생 데이터 갱신용)
+_change_listeners = []
+_commit_listeners = []
+
+
+def add_change_listener(listener, per_commit: bool = False):
+    """목표/게시글/링크가 추가·수정·삭제될 때 호출될 함수를 등록하는 함수
+
+    listener(entity, action, row) 형태로 호출되며
+    entity는 "goal"/"board"/"link"/"chat"/"category"/"profile", action은 "insert"/"update"/"delete"이다.
+    대량 가져오기는 행 대신 {"user_id", "count"}를 담아 action "import"로 한 번만 호출된다.
+    per_commit=True이면 여러 행을 바꾼 커밋에서도 사용자마다 한 번, 행 대신
+    {"user_id", "count"}로 호출된다 (프로세스 간 무효화 알림처럼 행 내용이 필요 없는 경우).
+    """
+    listeners = _commit_listeners if per_commit else _change_listeners
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def _row_to_dict(obj):
+    """ORM 객체의 컬럼 값을 dict로 변환하는 함수"""
+    return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
+
+
+def _call_listener(listener, entity, action, row):
+    try:
+        listener(entity, action, row)
+    except Exception as e:
+        # 파생 데이터 갱신 실패가 원래 작업을 실패시키지 않도록 함
+        print(f"변경 알림 처리 중 오류 발생 ({entity}/{action}): {e}")
+
+
+def _notify_changes(entity, action, rows):
+    """한 커밋에서 바뀐 행들을 등록된 리스너에 전달하는 함수
+
+    행 단위 리스너는 행마다, 커밋 단위 리스너는 사용자마다 한 번 호출한다.
+    """
+    if not rows:
+        return
+    for listener in _change_listeners:
+        for row in rows:
+            _call_listener(listener, entity, action, row)
+    counts = {}
+    for row in rows:
+        user_id = row.get("user_id")
+        counts[user_id] = counts.get(user_id, 0) + row.get("count", 1)
+    for listener in _commit_listeners:
+        for user_id, count in counts.items():
+            _call_listener(listener, entity, action, {"user_id": user_id, "count": count})
+
+
+def _notify_change(entity, action, row):
+    """커밋된 변경 한 건을 등록된 리스너에 전달하는 함수"""
+    _notify_changes(entity, action, [row])
+
+
+# 단일 문장 수정/삭제 (SELECT 없이 UPDATE/DELETE ... RETURNING)
+def _kst_to_utc(value):
+    """입력 일시를 UTC로 변환하는 함수 (tz 정보가 없으면 KST로 간주)"""
+    kst = pytz.timezone("Asia/Seoul")
+    value = value.astimezone(kst) if value.tzinfo else kst.localize(value)
+    return value.astimezone(pytz.UTC)
+
+
+def _owned(table, record_ids, user_id: int = None):
+    """사용자의 행을 고르는 WHERE 조건 (id 하나 또는 id 목록)"""
+    if isinstance(record_ids, (list, tuple, set)):
+        matched = table.c.id.in_([int(record_id) for record_id in record_ids])
+    else:
+        matched = table.c.id == record_ids
+    return matched & (table.c.user_id == current_user_id(user_id))
+
+
+def _update_rows(db, model, where, values: dict, with_old: bool = False) -> list:
+    """조건에 맞는 행을 한 문장으로 수정하고 [(수정 후 행, 수정 전 행), ...]을 반환하는 함수
+
+    values에는 컬럼 식(예: 날짜 이동)을 넣을 수 있다. 수정 전 행은 with_old=True일
+    때만 채운다. PostgreSQL은 같은 UPDATE 문에서 잠근 이전 행을 함께 RETURNING하고,
+    RETURNING에서 FROM 절을 참조할 수 없는 SQLite는 같은 트랜잭션에서 이전 행을
+    먼저 읽는다.
+    """
+    table = model.__table__
+    if with_old and db.get_bind().dialect.name == "postgresql":
+        old = select(table).where(where).with_for_update().subquery("old")
+        stmt = (
+            update(table)
+            .where(table.c.id == old.c.id)
+            .values(values)
+            .returning(*table.c, *(c.label(f"old_{c.name}") for c in old.c))
+        )
+        return [
+            (
+                {c.name: result[c.name] for c in table.c},
+                {c.name: result[f"old_{c.name}"] for c in table.c},
+            )
+            for result in db.execute(stmt).mappings()
+        ]
+
+    old_rows = {}
+    if with_old:
+        old_rows = {
+            result["id"]: dict(result)
+            for result in db.execute(select(table).where(where)).mappings()
+        }
+        if not old_rows:
+            return []
+    stmt = update(table).where(where).values(values).returning(*table.c)
+    return [
+        (dict(result), old_rows.get(result["id"]))
+        for result in db.execute(stmt).mappings()
+    ]
+
+
+def _update_returning(
+    db, model, record_id, user_id, values: dict, with_old: bool = False
+):
+    """사용자의 행 하나를 수정하고 (수정 후 행, 수정 전 행)을 반환하는 함수
+
+    행이 없거나 다른 사용자의 행이면 (None, None)을 반환한다.
+    """
+    rows = _update_rows(
+        db, model, _owned(model.__table__, record_id, user_id), values, with_old
+    )
+    return rows[0] if rows else (None, None)
+
+
+def _delete_rows(db, model, where) -> list:
+    """조건에 맞는 행을 한 문장으로 삭제하고 삭제된 행 목록을 반환하는 함수"""
+    table = model.__table__
+    stmt = delete(table).where(where).returning(*table.c)
+    return [dict(result) for result in db.execute(stmt).mappings()]
+
+
+def _delete_returning(db, model, record_id, user_id=None):
+    """사용자의 행 하나를 삭제하고 삭제된 행을 반환하는 함수 (없으면 None)"""
+    rows = _delete_rows(db, model, _owned(model.__table__, record_id, user_id))
+    return rows[0] if rows else None
+
+
 def add_goal(
     title,
     start_date=None,
@@ -169,35 +529,23 @@ def add_goal(
     memo="",
     status="진행 전",
     category_id=None,
+    user_id: int = None,
 ):
+    user_id = current_user_id(user_id)
     db = get_db()
     try:
-        # timezone 처리
-        kst = pytz.timezone("Asia/Seoul")
-
-        # 입력받은 datetime이 이미 timezone 정보를 가지고 있다면 KST로 변환
+        # KST 기준 입력을 UTC로 변환하여 저장
         if start_date:
-            if start_date.tzinfo:
-                start_date = start_date.astimezone(kst)
-            else:
-                start_date = kst.localize(start_date)
-            # UTC로 변환하여 저장
-            start_date = start_date.astimezone(pytz.UTC)
-
+            start_date = _kst_to_utc(start_date)
         if end_date:
-            if end_date.tzinfo:
-                end_date = end_date.astimezone(kst)
-            else:
-                end_date = kst.localize(end_date)
-            # UTC로 변환하여 저장
-            end_date = end_date.astimezone(pytz.UTC)
+            end_date = _kst_to_utc(end_date)
 
         # category_id를 int로 변환
         if category_id is not None:
             category_id = int(category_id)
 
         goal = Goal(
-            user_id=st.session_state.user_id,
+            user_id=user_id,
             title=title,
             start_date=start_date,
             end_date=end_date,
@@ -206,10 +554,15 @@ def add_goal(
             memo=memo,
             status=status,
             category_id=category_id,
+            completed_at=datetime.now(pytz.UTC) if status == "완료" else None,
+            sync_version=_next_goal_version(db, user_id),
         )
         db.add(goal)
+        db.flush()
+        _apply_rollup_delta(db, new_rows=[_row_to_dict(goal)])
         db.commit()
         db.refresh(goal)
+        _notify_change("goal", "insert", _row_to_dict(goal))
         return goal
     except Exception as e:
         db.rollback()
@@ -218,76 +571,218 @@ def add_goal(
         db.close()
 
 
-def get_goals():
+def goal_record(row: dict) -> dict:
+    """goals 행(dict)을 get_goals() DataFrame의 한 행 형태로 변환하는 함수 (날짜는 KST)"""
+    kst = pytz.timezone("Asia/Seoul")
+
+    def to_kst(value):
+        # UTC에서 KST로 변환
+        return value.replace(tzinfo=pytz.UTC).astimezone(kst) if value else None
+
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "start_date": to_kst(row["start_date"]),
+        "end_date": to_kst(row["end_date"]),
+        "trigger_action": row["trigger_action"],
+        "importance": row["importance"],
+        "memo": row["memo"],
+        "status": row["status"],
+        "category_id": row["category_id"],
+        "completed_at": to_kst(row["completed_at"]),
+        "created_at": row["created_at"],
+    }
+
+
+def get_goals(user_id: int = None):
     """현재 로그인한 사용자의 목표만 조회"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
-        kst = pytz.timezone("Asia/Seoul")
         goals = (
             db.query(Goal)
-            .filter(Goal.user_id == st.session_state.user_id)
+            .filter(Goal.user_id == user_id)
             .all()
         )
 
         # 결과를 DataFrame으로 변환하기 전에 timezone 처리
-        goals_data = []
-        for goal in goals:
-            # UTC에서 KST로 변환
-            start_date = (
-                goal.start_date.replace(tzinfo=pytz.UTC).astimezone(kst)
-                if goal.start_date
-                else None
-            )
-            end_date = (
-                goal.end_date.replace(tzinfo=pytz.UTC).astimezone(kst)
-                if goal.end_date
-                else None
-            )
-
-            goal_dict = {
-                "id": goal.id,
-                "title": goal.title,
-                "start_date": start_date,
-                "end_date": end_date,
-                "trigger_action": goal.trigger_action,
-                "importance": goal.importance,
-                "memo": goal.memo,
-                "status": goal.status,
-                "category_id": goal.category_id,
-                "created_at": goal.created_at,
-            }
-            goals_data.append(goal_dict)
-
+        goals_data = [goal_record(_row_to_dict(goal)) for goal in goals]
         return pd.DataFrame(goals_data)
     finally:
         db.close()
 
 
-def update_goal(goal_id, **kwargs):
+def _next_goal_version(db, user_id: int) -> int:
+    """사용자의 목표 변경 번호를 1 올리고 새 번호를 반환하는 함수
+
+    목표를 바꾸는 트랜잭션에서 커밋 전에 한 번 호출하고, 바뀐 목표와 삭제 기록의
+    sync_version에 넣는다. 올린 행은 커밋할 때까지 잠겨 같은 사용자의 다른 쓰기
+    트랜잭션이 기다리므로 번호 순서가 커밋 순서와 같다.
+    """
+    return db.execute(
+        text(
+            """
+        INSERT INTO goal_sync_versions (user_id, version) VALUES (:user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = goal_sync_versions.version + 1
+        RETURNING version
+        """
+        ),
+        {"user_id": user_id},
+    ).scalar()
+
+
+def _select_goals_for_sync(conn, user_id: int, condition=None):
+    """사용자의 목표 행과 커밋된 변경 번호를 한 문장으로 조회하는 함수
+
+    변경 번호 한 행에 목표를 LEFT JOIN하므로 목표가 없어도 번호는 받고, 같은 스냅샷에서
+    읽으므로 그 번호까지의 변경은 모두 결과에 들어 있다.
+    """
+    goals = Goal.__table__
+    version = select(
+        func.coalesce(
+            select(GoalSyncVersion.version)
+            .where(GoalSyncVersion.user_id == user_id)
+            .scalar_subquery(),
+            0,
+        ).label("sync_version_mark")
+    ).subquery("mark")
+    on = goals.c.user_id == user_id
+    if condition is not None:
+        on = on & condition
+    rows = conn.execute(
+        select(version.c.sync_version_mark, goals).select_from(version.outerjoin(goals, on))
+    ).mappings().all()
+    return [goal_record(row) for row in rows if row["id"] is not None], rows[0]["sync_version_mark"]
+
+
+def get_goals_for_sync(user_id: int = None):
+    """현재 사용자의 목표 전체와 변경 번호를 함께 조회하는 함수
+
+    반환값은 (get_goals() 형태의 DataFrame, 다음 get_goal_changes()에 since로 넘길 번호)이다.
+    """
+    user_id = current_user_id(user_id)
+    with get_engine().connect() as conn:
+        records, version = _select_goals_for_sync(conn, user_id)
+    return pd.DataFrame(records), version
+
+
+def get_goal(goal_id: int, user_id: int = None):
+    """현재 사용자의 목표 하나를 기본 키로 조회하는 함수 (get_goals() 한 행 형태의 dict, 없으면 None)"""
+    table = Goal.__table__
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            select(table).where(_owned(table, int(goal_id), user_id))
+        ).mappings().first()
+    return goal_record(row) if row else None
+
+
+# 이보다 오래된 삭제 기록은 정리 (그보다 오래 동기화하지 않은 스냅샷은 전체를 다시 읽음)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+def get_goal_changes(since: int, user_id: int = None):
+    """변경 번호 since 이후 바뀐 목표와 삭제된 목표를 조회하는 함수
+
+    반환값은 (바뀐 목표 DataFrame(get_goals() 형태), 삭제된 목표 ID 목록,
+    다음 조회에 since로 넘길 번호)이다. 삭제 기록은 따로 읽으므로 그 사이 커밋된
+    삭제가 다음 조회에 한 번 더 올 수 있어, 받는 쪽은 같은 변경을 여러 번 반영해도
+    결과가 같아야 한다.
+    """
+    user_id = current_user_id(user_id)
+    with get_engine().connect() as conn:
+        records, version = _select_goals_for_sync(
+            conn, user_id, Goal.__table__.c.sync_version > since
+        )
+        deleted = conn.execute(
+            select(GoalTombstone.goal_id).where(
+                GoalTombstone.user_id == user_id, GoalTombstone.sync_version > since
+            )
+        ).scalars().all()
+    return pd.DataFrame(records), list(deleted), version
+
+
+def purge_goal_tombstones(retention: timedelta = TOMBSTONE_RETENTION) -> int:
+    """보관 기간이 지난 삭제 기록을 지우고 지운 개수를 반환하는 함수"""
     db = SessionLocal()
     try:
-        goal = db.query(Goal).filter(Goal.id == goal_id).first()
+        count = (
+            db.query(GoalTombstone)
+            .filter(GoalTombstone.deleted_at < datetime.now() - retention)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
 
-        # timezone 처리
-        kst = pytz.timezone("Asia/Seoul")
 
-        for key, value in kwargs.items():
-            # start_date와 end_date에 대해 timezone 처리
-            if key in ["start_date", "end_date"] and value:
-                if value.tzinfo:
-                    value = value.astimezone(kst)
-                else:
-                    value = kst.localize(value)
-                # UTC로 변환하여 저장
-                value = value.astimezone(pytz.UTC)
+def _completed_at_for(status):
+    """완료로 바뀔 때 완료 시각을 기록하는 식 (이미 완료였으면 유지, 다른 상태로 바뀌면 지움)"""
+    if status != "완료":
+        return None
+    return case(
+        (Goal.status == "완료", Goal.completed_at),
+        else_=datetime.now(pytz.UTC),
+    )
+
+
+def _shift_days(column, days: int):
+    """일시 컬럼을 days일만큼 옮기는 SQL 식"""
+    if get_engine().dialect.name == "sqlite":
+        # SQLite는 일시를 문자열로 저장하므로 날짜 함수로 계산하고 소수 초 부분은 그대로 붙임
+        return func.strftime("%Y-%m-%d %H:%M:%S", column, f"{days:+d} days").concat(
+            func.substr(column, 20)
+        )
+    return column + timedelta(days=days)
 
-            # category_id를 int로 변환
-            if key == "category_id" and value is not None:
-                value = int(value)
 
-            setattr(goal, key, value)
+def _goal_values(fields: dict) -> dict:
+    """수정할 목표 필드를 저장 형태(UTC 일시, int 카테고리, 완료 시각)로 바꾸는 함수"""
+    values = {}
+    for key, value in fields.items():
+        # start_date와 end_date는 UTC로 변환하여 저장
+        if key in ["start_date", "end_date"] and value:
+            value = _kst_to_utc(value)
 
+        # category_id를 int로 변환
+        if key == "category_id" and value is not None:
+            value = int(value)
+
+        if key == "status":
+            values["completed_at"] = _completed_at_for(value)
+
+        values[key] = value
+    return values
+
+
+def update_goal(goal_id, user_id: int = None, **kwargs):
+    """목표를 한 문장(UPDATE ... RETURNING)으로 수정하는 함수
+
+    현재 사용자의 목표가 아니거나 없으면 False를 반환한다.
+    """
+    user_id = current_user_id(user_id)
+    values = _goal_values(kwargs)
+    db = SessionLocal()
+    try:
+        # 일별 집계에 쓰이는 컬럼이 바뀔 때만 수정 전 행이 필요
+        row, old_row = _update_returning(
+            db,
+            Goal,
+            goal_id,
+            user_id,
+            {**values, "sync_version": _next_goal_version(db, user_id)},
+            with_old=bool(_ROLLUP_SOURCES & set(values)),
+        )
+        if row is None:
+            return False
+        if old_row is not None:
+            _apply_rollup_delta(db, old_rows=[old_row], new_rows=[row])
         db.commit()
+        _notify_change("goal", "update", row)
+        return True
+    except Exception as e:
+        db.rollback()
+        raise e
     finally:
         db.close()
 
@@ -328,94 +823,450 @@ def get_goal_analysis(period, goals_analyzed):
         db.close()
 
 
+def get_goal_analyses(requests: dict) -> dict:
+    """{기간: 분석할 목표 ID 목록}의 기간별 최신 분석 결과를 한 번에 조회하는 함수
+
+    결과가 없는 기간은 반환값에 포함되지 않는다.
+    """
+    keys = {period: ",".join(map(str, sorted(goal_ids))) for period, goal_ids in requests.items()}
+    if not keys:
+        return {}
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(GoalAnalysis)
+            .filter(GoalAnalysis.period.in_(list(keys)))
+            .filter(GoalAnalysis.goals_analyzed.in_(set(keys.values())))
+            .order_by(GoalAnalysis.created_at.desc())
+            .all()
+        )
+        analyses = {}
+        for analysis in rows:
+            if keys[analysis.period] == analysis.goals_analyzed:
+                analyses.setdefault(analysis.period, analysis)
+        return analyses
+    finally:
+        db.close()
+
+
 # 카테고리 관련 함수들
-def add_category(name: str):
+def add_category(name: str, user_id: int = None):
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         category = Category(
-            user_id=st.session_state.user_id, name=name  # 사용자 ID 추가
+            user_id=user_id, name=name  # 사용자 ID 추가
         )
         db.add(category)
         db.commit()
         db.refresh(category)
+        _notify_change("category", "insert", _row_to_dict(category))
         return category
     finally:
         db.close()
 
 
-def get_categories():
+def get_categories(user_id: int = None):
+    user_id = current_user_id(user_id)
+    query = text(
+        """
+    SELECT * FROM categories
+    WHERE user_id = :user_id
+    ORDER BY name
+    """
+    )
+    return pd.read_sql_query(
+        query, get_engine(), params={"user_id": user_id}
+    )
+
+
+def update_category(category_id: int, name: str, user_id: int = None):
     db = SessionLocal()
     try:
-        query = """
-        SELECT * FROM categories 
-        WHERE user_id = %(user_id)s 
-        ORDER BY name
-        """
-        return pd.read_sql_query(
-            query, engine, params={"user_id": st.session_state.user_id}
+        row, _ = _update_returning(db, Category, category_id, user_id, {"name": name})
+        if row is None:
+            return False
+        db.commit()
+        _notify_change("category", "update", row)
+        return True
+    finally:
+        db.close()
+
+
+def delete_category(category_id: int, user_id: int = None):
+    db = SessionLocal()
+    try:
+        row = _delete_returning(db, Category, category_id, user_id)
+        if row is None:
+            return False
+        db.commit()
+        _notify_change("category", "delete", row)
+        return True
+    finally:
+        db.close()
+
+
+def _add_tombstones(db, rows, version: int):
+    """삭제한 목표를 같은 트랜잭션에서 goal_tombstones에 기록하는 함수"""
+    if rows:
+        db.execute(
+            insert(GoalTombstone),
+            [
+                {"goal_id": row["id"], "user_id": row["user_id"], "sync_version": version}
+                for row in rows
+            ],
         )
+
+
+def delete_goal(goal_id: int, user_id: int = None):
+    """목표를 삭제하는 함수 (현재 사용자의 목표만)"""
+    user_id = current_user_id(user_id)
+    db = SessionLocal()
+    try:
+        row = _delete_returning(db, Goal, goal_id, user_id)
+        if row is None:
+            return False
+        _apply_rollup_delta(db, old_rows=[row])
+        _add_tombstones(db, [row], _next_goal_version(db, user_id))
+        db.commit()
+        _notify_change("goal", "delete", row)
+        return True
+    except Exception as e:
+        db.rollback()
+        raise e
     finally:
         db.close()
 
 
-def update_category(category_id: int, name: str):
+def _update_goals(goal_ids, values: dict, user_id: int = None) -> int:
+    """현재 사용자의 여러 목표를 한 문장으로 수정하고 수정된 개수를 반환하는 함수"""
+    if not goal_ids:
+        return 0
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
-        category = (
-            db.query(Category)
-            .filter(Category.id == category_id)
-            .filter(
-                Category.user_id == st.session_state.user_id
-            )  # 사용자 확인
-            .first()
+        rows = _update_rows(
+            db,
+            Goal,
+            _owned(Goal.__table__, list(goal_ids), user_id),
+            {**values, "sync_version": _next_goal_version(db, user_id)},
+            with_old=bool(_ROLLUP_SOURCES & set(values)),
         )
-        if category:
-            category.name = name
-            db.commit()
-            return True
-        return False
+        _apply_rollup_delta(
+            db,
+            old_rows=[old_row for _, old_row in rows if old_row is not None],
+            new_rows=[row for row, old_row in rows if old_row is not None],
+        )
+        db.commit()
+        _notify_changes("goal", "update", [row for row, _ in rows])
+        return len(rows)
+    except Exception as e:
+        db.rollback()
+        raise e
     finally:
         db.close()
 
 
-def delete_category(category_id: int):
+def update_goals_status(goal_ids, status: str = "완료", user_id: int = None) -> int:
+    """여러 목표의 상태를 한 번에 바꾸는 함수 (바뀐 목표 수 반환)"""
+    return _update_goals(
+        goal_ids,
+        {"status": status, "completed_at": _completed_at_for(status)},
+        user_id,
+    )
+
+
+def reschedule_goals(goal_ids, days: int, user_id: int = None) -> int:
+    """여러 목표의 시작/종료 일시를 days일만큼 한 번에 옮기는 함수 (옮긴 목표 수 반환)"""
+    return _update_goals(
+        goal_ids,
+        {
+            "start_date": _shift_days(Goal.start_date, days),
+            "end_date": _shift_days(Goal.end_date, days),
+        },
+        user_id,
+    )
+
+
+def delete_goals(goal_ids, user_id: int = None) -> int:
+    """여러 목표를 한 번에 삭제하는 함수 (삭제된 목표 수 반환)"""
+    if not goal_ids:
+        return 0
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
-        category = (
-            db.query(Category)
-            .filter(Category.id == category_id)
-            .filter(
-                Category.user_id == st.session_state.user_id
-            )  # 사용자 확인
-            .first()
+        rows = _delete_rows(db, Goal, _owned(Goal.__table__, list(goal_ids), user_id))
+        _apply_rollup_delta(db, old_rows=rows)
+        _add_tombstones(db, rows, _next_goal_version(db, user_id))
+        db.commit()
+        _notify_changes("goal", "delete", rows)
+        return len(rows)
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+# API 등에서 한 번에 추가·수정할 수 있는 목표 필드
+GOAL_FIELDS = (
+    "title",
+    "start_date",
+    "end_date",
+    "trigger_action",
+    "importance",
+    "memo",
+    "status",
+    "category_id",
+)
+
+
+def add_goals(goals: list, user_id: int = None) -> list:
+    """여러 목표를 한 트랜잭션으로 추가하고 추가된 목표(goal_record 형태) 목록을 반환하는 함수
+
+    goals는 GOAL_FIELDS를 키로 갖는 dict 목록이며 title은 필수이다.
+    """
+    user_id = current_user_id(user_id)
+    if not goals:
+        return []
+    db = SessionLocal()
+    try:
+        version = _next_goal_version(db, user_id)
+        added = []
+        for fields in goals:
+            if not fields.get("title"):
+                raise ValueError("목표 제목(title)은 필수입니다.")
+            values = {key: fields[key] for key in GOAL_FIELDS if key in fields}
+            values.setdefault("status", "진행 전")
+            values.setdefault("importance", 5)
+            for key in ["start_date", "end_date"]:
+                if values.get(key):
+                    values[key] = _kst_to_utc(values[key])
+            if values.get("category_id") is not None:
+                values["category_id"] = int(values["category_id"])
+            goal = Goal(
+                user_id=user_id,
+                completed_at=datetime.now(pytz.UTC) if values["status"] == "완료" else None,
+                sync_version=version,
+                **values,
+            )
+            db.add(goal)
+            added.append(goal)
+        db.flush()
+        rows = [_row_to_dict(goal) for goal in added]
+        _apply_rollup_delta(db, new_rows=rows)
+        db.commit()
+        _notify_changes("goal", "insert", rows)
+        return [goal_record(row) for row in rows]
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+def update_goals(changes: list, user_id: int = None) -> list:
+    """목표마다 다른 값을 한 트랜잭션으로 수정하고 수정된 목표(goal_record 형태) 목록을 반환하는 함수
+
+    changes는 id와 바꿀 GOAL_FIELDS를 담은 dict 목록이다. 사용자의 목표가 아니거나
+    없는 id는 건너뛴다. 모든 목표에 같은 값을 넣을 때는 update_goals_status /
+    reschedule_goals를 쓴다.
+    """
+    user_id = current_user_id(user_id)
+    if not changes:
+        return []
+    db = SessionLocal()
+    try:
+        version = _next_goal_version(db, user_id)
+        updated = []
+        for change in changes:
+            values = _goal_values(
+                {key: change[key] for key in GOAL_FIELDS if key in change}
+            )
+            if not values:
+                continue
+            row, old_row = _update_returning(
+                db,
+                Goal,
+                int(change["id"]),
+                user_id,
+                {**values, "sync_version": version},
+                with_old=bool(_ROLLUP_SOURCES & set(values)),
+            )
+            if row is not None:
+                updated.append((row, old_row))
+        _apply_rollup_delta(
+            db,
+            old_rows=[old_row for _, old_row in updated if old_row is not None],
+            new_rows=[row for row, old_row in updated if old_row is not None],
         )
-        if category:
-            db.delete(category)
-            db.commit()
-            return True
-        return False
+        db.commit()
+        _notify_changes("goal", "update", [row for row, _ in updated])
+        return [goal_record(row) for row, _ in updated]
+    except Exception as e:
+        db.rollback()
+        raise e
     finally:
         db.close()
 
 
-def delete_goal(goal_id: int):
-    """목표를 삭제하는 함수"""
+# 목표 일별 집계
+ROLLUP_COUNTS = [
+    "planned",
+    "completed",
+    "incomplete",
+    "planned_score",
+    "completed_score",
+    "incomplete_score",
+]
+
+# 일별 집계 값을 바꾸는 목표 컬럼
+_ROLLUP_SOURCES = {"start_date", "end_date", "status", "importance", "category_id"}
+
+
+def _rollup_key(row):
+    """목표 행이 집계되는 (user_id, day, category_id) 키 (날짜가 없으면 None)"""
+    when = row.get("end_date") or row.get("start_date")
+    if when is None:
+        return None
+    # 저장된 값은 UTC (커밋 전 행은 tz 정보가 있을 수 있음)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=pytz.UTC)
+    day = when.astimezone(pytz.timezone("Asia/Seoul")).date()
+    return (row["user_id"], day, row.get("category_id") or 0)
+
+
+def _rollup_deltas(old_rows=(), new_rows=()) -> dict:
+    """변경 전 행은 빼고 변경 후 행은 더한 집계 증감값을 키별로 모으는 함수"""
+    deltas = {}
+    for rows, sign in ((old_rows, -1), (new_rows, 1)):
+        for row in rows:
+            key = _rollup_key(row)
+            if key is None:
+                continue
+            values = deltas.setdefault(key, dict.fromkeys(ROLLUP_COUNTS, 0))
+            score = sign * (row.get("importance") or 0)
+            state = "completed" if row.get("status") == "완료" else "incomplete"
+            values["planned"] += sign
+            values["planned_score"] += score
+            values[state] += sign
+            values[f"{state}_score"] += score
+    # 완료 처리처럼 같은 키 안에서만 바뀐 경우에도 0이 아닌 항목은 남음
+    return {key: values for key, values in deltas.items() if any(values.values())}
+
+
+def _apply_rollup_delta(db, old_rows=(), new_rows=()):
+    """목표 변경을 같은 트랜잭션 안에서 일별 집계에 반영하는 함수
+
+    집계 행이 없으면 만들고 있으면 증감값을 더한다. 여러 날짜가 바뀌어도
+    INSERT ... ON CONFLICT 한 문장을 여러 파라미터로 실행한다.
+    """
+    deltas = _rollup_deltas(old_rows, new_rows)
+    if not deltas:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for key, values in deltas.items():
+            rollup = db.get(GoalDailyRollup, key)
+            if rollup is None:
+                user_id, day, category_id = key
+                rollup = GoalDailyRollup(
+                    user_id=user_id,
+                    day=day,
+                    category_id=category_id,
+                    **dict.fromkeys(ROLLUP_COUNTS, 0),
+                )
+                db.add(rollup)
+            for name, value in values.items():
+                setattr(rollup, name, getattr(rollup, name) + value)
+        return
+
+    table = GoalDailyRollup.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day", "category_id"],
+        set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_COUNTS},
+    )
+    db.execute(
+        stmt,
+        [
+            {"user_id": key[0], "day": key[1], "category_id": key[2], **values}
+            for key, values in deltas.items()
+        ],
+    )
+
+
+def rebuild_goal_rollups(user_id: int = None) -> int:
+    """goals 테이블 전체에서 일별 집계를 다시 만드는 함수
+
+    user_id를 주면 해당 사용자만 다시 만든다. 만들어진 집계 행 수를 반환한다.
+    """
     db = SessionLocal()
     try:
-        goal = db.query(Goal).filter(Goal.id == goal_id).first()
-        if goal:
-            db.delete(goal)
-            db.commit()
-            return True
-        return False
+        goals = db.query(
+            Goal.user_id,
+            Goal.start_date,
+            Goal.end_date,
+            Goal.status,
+            Goal.importance,
+            Goal.category_id,
+        )
+        rollups = db.query(GoalDailyRollup)
+        if user_id is not None:
+            goals = goals.filter(Goal.user_id == user_id)
+            rollups = rollups.filter(GoalDailyRollup.user_id == user_id)
+
+        deltas = _rollup_deltas(new_rows=[row._asdict() for row in goals])
+        rollups.delete(synchronize_session=False)
+        if deltas:
+            db.execute(
+                insert(GoalDailyRollup),
+                [
+                    {"user_id": key[0], "day": key[1], "category_id": key[2], **values}
+                    for key, values in deltas.items()
+                ],
+            )
+        db.commit()
+        return len(deltas)
     except Exception as e:
         db.rollback()
-        print(f"목표 삭제 중 오류 발생: {e}")
-        return False
+        raise e
     finally:
         db.close()
 
 
+def get_goal_rollups(
+    start_day: date, end_day: date, category_id: int = None, user_id: int = None
+):
+    """기간 내 날짜별 목표 집계를 조회하는 함수 (카테고리 행은 합산)
+
+    category_id를 주면 해당 카테고리만 집계한다 (0은 카테고리 없음).
+    """
+    user_id = current_user_id(user_id)
+    sums = ", ".join(f"SUM({name}) AS {name}" for name in ROLLUP_COUNTS)
+    query = (
+        f"SELECT day, {sums} FROM goal_daily_rollups "
+        "WHERE user_id = :user_id AND day BETWEEN :start_day AND :end_day"
+    )
+    params = {
+        "user_id": user_id,
+        "start_day": start_day,
+        "end_day": end_day,
+    }
+    if category_id is not None:
+        query += " AND category_id = :category_id"
+        params["category_id"] = int(category_id)
+    query += " GROUP BY day ORDER BY day"
+    return pd.read_sql_query(
+        text(query), get_engine(), params=params, parse_dates=["day"]
+    )
+
+
 # 게시판 관련 CRUD 함수들
 def add_post(
     title: str,
@@ -423,12 +1274,14 @@ def add_post(
     board_type: str,
     image_path: str = None,
     reflection_date: date = None,
+    user_id: int = None,
 ):
     """게시글을 추가하는 함수"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         post = Board(
-            user_id=st.session_state.user_id,
+            user_id=user_id,
             title=title,
             content=content,
             board_type=board_type,
@@ -438,39 +1291,73 @@ def add_post(
         db.add(post)
         db.commit()
         db.refresh(post)
+        _notify_change("board", "insert", _row_to_dict(post))
         return post
     finally:
         db.close()
 
 
-def get_posts(board_type: str):
-    db = SessionLocal()
-    try:
-        query = """
-        SELECT * FROM boards 
-        WHERE board_type = %(board_type)s 
-        AND user_id = %(user_id)s 
-        ORDER BY reflection_date DESC, created_at DESC
+def _with_reflection_dates(posts: pd.DataFrame) -> pd.DataFrame:
+    """회고 날짜를 DB 종류와 관계없이 date 객체로 맞추는 함수 (SQLite는 문자열로 돌려줌)"""
+    posts["reflection_date"] = [
+        None if pd.isna(value) else value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+        for value in posts["reflection_date"]
+    ]
+    return posts
+
+
+def get_posts(board_type: str, user_id: int = None):
+    user_id = current_user_id(user_id)
+    query = text(
         """
-        return pd.read_sql_query(
+    SELECT * FROM boards
+    WHERE board_type = :board_type
+    AND user_id = :user_id
+    ORDER BY reflection_date DESC, created_at DESC
+    """
+    )
+    return _with_reflection_dates(
+        pd.read_sql_query(
             query,
-            engine,
-            params={
-                "board_type": board_type,
-                "user_id": st.session_state.user_id,
-            },
+            get_engine(),
+            params={"board_type": board_type, "user_id": user_id},
+            # 드라이버가 문자열로 돌려주는 경우(SQLite 등)에도 datetime으로 변환
+            parse_dates=["created_at", "updated_at"],
         )
-    finally:
-        db.close()
+    )
+
+
+def get_post_summaries(board_type: str, user_id: int = None):
+    """본문을 제외한 게시글 목록을 조회하는 함수 (본문은 펼칠 때 get_post로 조회)"""
+    user_id = current_user_id(user_id)
+    query = text(
+        """
+    SELECT id, title, board_type, image_path, reflection_date, created_at, updated_at
+    FROM boards
+    WHERE board_type = :board_type
+    AND user_id = :user_id
+    ORDER BY reflection_date DESC, created_at DESC
+    """
+    )
+    return _with_reflection_dates(
+        pd.read_sql_query(
+            query,
+            get_engine(),
+            params={"board_type": board_type, "user_id": user_id},
+            # 드라이버가 문자열로 돌려주는 경우(SQLite 등)에도 datetime으로 변환
+            parse_dates=["created_at", "updated_at"],
+        )
+    )
 
 
-def get_post(post_id: int):
+def get_post(post_id: int, user_id: int = None):
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         return (
             db.query(Board)
             .filter(Board.id == post_id)
-            .filter(Board.user_id == st.session_state.user_id)  # 사용자 확인
+            .filter(Board.user_id == user_id)  # 사용자 확인
             .first()
         )
     finally:
@@ -483,45 +1370,67 @@ def update_post(
     content: str,
     image_path: str = None,
     reflection_date: date = None,
+    user_id: int = None,
 ):
-    """게시글을 수정하는 함수"""
+    """게시글을 수정하고 수정된 행(dict)을 반환하는 함수 (없으면 None)"""
+    values = {"title": title, "content": content, "updated_at": datetime.now()}
+    if image_path:
+        values["image_path"] = image_path
+    if reflection_date:
+        values["reflection_date"] = reflection_date
     db = SessionLocal()
     try:
-        post = (
-            db.query(Board)
-            .filter(Board.id == post_id)
-            .filter(Board.user_id == st.session_state.user_id)
-            .first()
+        row, _ = _update_returning(db, Board, post_id, user_id, values)
+        if row is None:
+            return None
+        db.commit()
+        _notify_change("board", "update", row)
+        return row
+    finally:
+        db.close()
+
+
+def delete_post(post_id: int, user_id: int = None):
+    db = SessionLocal()
+    try:
+        row = _delete_returning(db, Board, post_id, user_id)
+        if row is None:
+            return False
+        db.commit()
+        _notify_change("board", "delete", row)
+        return True
+    finally:
+        db.close()
+
+
+def is_image_referenced(image_path: str) -> bool:
+    """이미지 파일을 참조하는 게시글이 있는지 확인하는 함수 (전체 사용자 대상)"""
+    db = SessionLocal()
+    try:
+        query = text(
+            """
+        SELECT EXISTS (
+            SELECT 1 FROM boards
+            WHERE image_path = :image_path
         )
-        if post:
-            post.title = title
-            post.content = content
-            if image_path:
-                post.image_path = image_path
-            if reflection_date:
-                post.reflection_date = reflection_date
-            post.updated_at = datetime.now()
-            db.commit()
-            return post
-        return None
+        """
+        )
+        return bool(db.execute(query, {"image_path": image_path}).scalar())
     finally:
         db.close()
 
 
-def delete_post(post_id: int):
+def get_image_paths():
+    """게시글이 참조하는 모든 이미지 경로를 조회하는 함수 (이미지 정리용)"""
     db = SessionLocal()
     try:
-        post = (
-            db.query(Board)
-            .filter(Board.id == post_id)
-            .filter(Board.user_id == st.session_state.user_id)  # 사용자 확인
-            .first()
+        query = text(
+            """
+        SELECT DISTINCT image_path FROM boards
+        WHERE image_path IS NOT NULL
+        """
         )
-        if post:
-            db.delete(post)
-            db.commit()
-            return True
-        return False
+        return [row[0] for row in db.execute(query)]
     finally:
         db.close()
 
@@ -534,12 +1443,17 @@ def add_recurring_goals(
     memo="",
     status="진행 전",
     category_id=None,
+    user_id: int = None,
 ):
     """여러 날짜에 대해 동일한 목표를 추가하는 함수"""
+    user_id = current_user_id(user_id)
     db = get_db()
     try:
+        version = _next_goal_version(db, user_id)
+        goals = []
         for date in dates:
             goal = Goal(
+                user_id=user_id,
                 title=title,
                 start_date=date,
                 end_date=date,
@@ -548,9 +1462,19 @@ def add_recurring_goals(
                 memo=memo,
                 status=status,
                 category_id=category_id,
+                completed_at=datetime.now(pytz.UTC) if status == "완료" else None,
+                sync_version=version,
             )
             db.add(goal)
+            goals.append(goal)
+        db.flush()
+        _apply_rollup_delta(db, new_rows=[_row_to_dict(goal) for goal in goals])
         db.commit()
+        rows = []
+        for goal in goals:
+            db.refresh(goal)
+            rows.append(_row_to_dict(goal))
+        _notify_changes("goal", "insert", rows)
         return True
     except Exception as e:
         db.rollback()
@@ -560,96 +1484,94 @@ def add_recurring_goals(
 
 
 # CRUD 함수 추가
-def add_link(site_name: str, url: str):
+def add_link(site_name: str, url: str, user_id: int = None):
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         link = Link(
-            user_id=st.session_state.user_id,  # 사용자 ID 추가
+            user_id=user_id,  # 사용자 ID 추가
             site_name=site_name,
             url=url,
         )
         db.add(link)
         db.commit()
         db.refresh(link)
+        _notify_change("link", "insert", _row_to_dict(link))
         return link
     finally:
         db.close()
 
 
-def get_links():
-    db = SessionLocal()
-    try:
-        query = """
-        SELECT * FROM links 
-        WHERE user_id = %(user_id)s 
-        ORDER BY created_at DESC
+def get_links(user_id: int = None):
+    user_id = current_user_id(user_id)
+    query = text(
         """
-        return pd.read_sql_query(
-            query, engine, params={"user_id": st.session_state.user_id}
-        )
-    finally:
-        db.close()
+    SELECT * FROM links
+    WHERE user_id = :user_id
+    ORDER BY created_at DESC
+    """
+    )
+    return pd.read_sql_query(
+        query,
+        get_engine(),
+        params={"user_id": user_id},
+        parse_dates=["created_at", "updated_at"],
+    )
 
 
-def get_link(link_id: int):
+def get_link(link_id: int, user_id: int = None):
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         return (
             db.query(Link)
             .filter(Link.id == link_id)
-            .filter(Link.user_id == st.session_state.user_id)  # 사용자 확인
+            .filter(Link.user_id == user_id)  # 사용자 확인
             .first()
         )
     finally:
         db.close()
 
 
-def update_link(link_id: int, site_name: str, url: str):
+def update_link(link_id: int, site_name: str, url: str, user_id: int = None):
+    """링크를 수정하고 수정된 행(dict)을 반환하는 함수 (없으면 None)"""
     db = SessionLocal()
     try:
-        link = (
-            db.query(Link)
-            .filter(Link.id == link_id)
-            .filter(Link.user_id == st.session_state.user_id)  # 사용자 확인
-            .first()
+        row, _ = _update_returning(
+            db, Link, link_id, user_id, {"site_name": site_name, "url": url}
         )
-        if link:
-            link.site_name = site_name
-            link.url = url
-            db.commit()
-            return link
-        return None
+        if row is None:
+            return None
+        db.commit()
+        _notify_change("link", "update", row)
+        return row
     finally:
         db.close()
 
 
-def delete_link(link_id: int):
+def delete_link(link_id: int, user_id: int = None):
     db = SessionLocal()
     try:
-        link = (
-            db.query(Link)
-            .filter(Link.id == link_id)
-            .filter(Link.user_id == st.session_state.user_id)  # 사용자 확인
-            .first()
-        )
-        if link:
-            db.delete(link)
-            db.commit()
-            return True
-        return False
+        row = _delete_returning(db, Link, link_id, user_id)
+        if row is None:
+            return False
+        db.commit()
+        _notify_change("link", "delete", row)
+        return True
     finally:
         db.close()
 
 
 # 사용자 프로필 관련 함수들
-def get_user_profile():
+def get_user_profile(user_id: int = None):
     """사용자 프로필 정보를 가져오는 함수"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         profile = (
             db.query(UserProfile)
             .filter(
-                UserProfile.user_id == st.session_state.user_id
+                UserProfile.user_id == user_id
             )  # 사용자 확인
             .first()
         )
@@ -663,20 +1585,21 @@ def get_user_profile():
         db.close()
 
 
-def update_user_profile(profile_data):
+def update_user_profile(profile_data, user_id: int = None):
     """용자 프로필을 업데이트하는 함수"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         profile = (
             db.query(UserProfile)
             .filter(
-                UserProfile.user_id == st.session_state.user_id
+                UserProfile.user_id == user_id
             )  # 사용자 확인
             .first()
         )
         if not profile:
             profile = UserProfile(
-                user_id=st.session_state.user_id
+                user_id=user_id
             )  # 새 프로필 생성 시 사용자 ID 추가
             db.add(profile)
 
@@ -684,6 +1607,7 @@ def update_user_profile(profile_data):
             setattr(profile, key, value)
 
         db.commit()
+        _notify_change("profile", "update", {"user_id": user_id})
         return True
     except Exception as e:
         db.rollback()
@@ -692,14 +1616,15 @@ def update_user_profile(profile_data):
         db.close()
 
 
-def get_todays_goals():
+def get_todays_goals(user_id: int = None):
     """오늘의 목표를 져오 함수"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         today = datetime.now().date()
         return (
             db.query(Goal)
-            .filter(Goal.user_id == st.session_state.user_id)  # 사용자 확인
+            .filter(Goal.user_id == user_id)  # 사용자 확인
             .filter(func.date(Goal.start_date) <= today)
             .filter(func.date(Goal.end_date) >= today)
             .all()
@@ -708,14 +1633,15 @@ def get_todays_goals():
         db.close()
 
 
-def get_incomplete_goals():
+def get_incomplete_goals(user_id: int = None):
     """미완료된 목표를 가져오는 함수"""
+    user_id = current_user_id(user_id)
     db = SessionLocal()
     try:
         today = datetime.now().date()
         return (
             db.query(Goal)
-            .filter(Goal.user_id == st.session_state.user_id)  # 사용자 확인
+            .filter(Goal.user_id == user_id)  # 사용자 확인
             .filter(func.date(Goal.end_date) < today)
             .filter(Goal.status != "완료")
             .all()
@@ -724,18 +1650,6 @@ def get_incomplete_goals():
         db.close()
 
 
-def get_category_name(category_id: int) -> str:
-    """카테고 ID로 카테고리 이름을 져오는 함수"""
-    db = SessionLocal()
-    try:
-        category = (
-            db.query(Category).filter(Category.id == category_id).first()
-        )
-        return category.name if category else "미분류"
-    finally:
-        db.close()
-
-
 def create_user(username: str, email: str, password_hash: str) -> int:
     """새로운 사용자를 생하는 함수"""
     db = SessionLocal()
@@ -942,60 +1856,439 @@ def get_user_by_id(user_id: int) -> dict:
         db.close()
 
 
-# 대화 게시판 테이블 생성 쿼리 추가
-def create_tables():
-    # ... 기존 테이블 생성 코드 ...
+# 목록 API용 조회 (id 순서 키셋 페이지, 조건부 GET용 버전)
+API_COLLECTIONS = {"goals": Goal, "categories": Category, "posts": Board, "links": Link}
 
-    # 대화 게시판 테이블 생성
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS chat_history (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(id),
-            title VARCHAR(200),
-            content TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
+
+def _collection_query(name: str, user_id: int, filters: dict = None):
+    table = API_COLLECTIONS[name].__table__
+    where = [table.c.user_id == user_id]
+    for key, value in (filters or {}).items():
+        where.append(table.c[key] == value)
+    return table, where
+
+
+def get_collection_version(name: str, filters: dict = None, user_id: int = None) -> tuple:
+    """목록의 (행 수, 마지막 수정 시각)을 반환하는 함수 (행은 읽지 않음, ETag 계산용)
+
+    삭제는 행 수로, 추가·수정은 updated_at으로 드러난다.
+    """
+    user_id = current_user_id(user_id)
+    table, where = _collection_query(name, user_id, filters)
+    changed = func.coalesce(table.c.updated_at, table.c.created_at)
+    with get_engine().connect() as conn:
+        count, last_changed = conn.execute(
+            select(func.count(), func.max(changed)).where(*where)
+        ).one()
+    return count, last_changed
+
+
+def get_collection_page(
+    name: str,
+    limit: int = 50,
+    after_id: int = 0,
+    filters: dict = None,
+    columns: list = None,
+    user_id: int = None,
+) -> list:
+    """after_id 다음부터 id순으로 limit개의 행(dict)을 조회하는 함수
+
+    columns를 주면 그 컬럼만 읽는다 (예: 게시글 목록에서 본문 제외).
+    """
+    user_id = current_user_id(user_id)
+    table, where = _collection_query(name, user_id, filters)
+    selected = [table.c[column] for column in columns] if columns else [table]
+    stmt = (
+        select(*selected)
+        .where(*where, table.c.id > after_id)
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+    with get_engine().connect() as conn:
+        return [dict(row) for row in conn.execute(stmt).mappings()]
+
+
+def get_collection_row(name: str, record_id: int, user_id: int = None):
+    """사용자의 행 하나를 dict로 조회하는 함수 (없으면 None)"""
+    table = API_COLLECTIONS[name].__table__
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            select(table).where(_owned(table, int(record_id), user_id))
+        ).mappings().first()
+    return dict(row) if row else None
+
+
+# 대화 기록 관련 함수들
+def _pack_content(content: str):
+    """긴 메시지는 zlib으로 압축해 (content, content_compressed, search_text)로 반환"""
+    encoded = (content or "").encode("utf-8")
+    if len(encoded) > CHAT_COMPRESS_THRESHOLD:
+        return None, zlib.compress(encoded), _search_text(content)
+    return content, None, None
+
+
+def _search_text(content: str) -> str:
+    """압축한 메시지도 검색되도록 본문의 단어를 중복 없이 이어 붙인 문자열"""
+    return " ".join(dict.fromkeys(_WORD_PATTERN.findall(content.lower())))
+
+
+def unpack_chat_content(content, content_compressed) -> str:
+    """저장된 대화 메시지 본문 (압축된 메시지는 풀어서 반환)"""
+    if content_compressed is not None:
+        return zlib.decompress(content_compressed).decode("utf-8")
+    return content or ""
+
+
+def backfill_chat_search_text(batch_size: int = 500) -> int:
+    """search_text 컬럼이 생기기 전에 압축 저장된 메시지의 검색용 텍스트를 채우는 함수"""
+    count = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = (
+                db.query(ChatMessage.id, ChatMessage.content_compressed)
+                .filter(ChatMessage.content_compressed.isnot(None))
+                .filter(ChatMessage.search_text.is_(None))
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return count
+            db.execute(
+                update(ChatMessage),
+                [
+                    {"id": row.id, "search_text": _search_text(unpack_chat_content(None, row.content_compressed))}
+                    for row in rows
+                ],
+            )
+            db.commit()
+            count += len(rows)
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+def create_chat_transcript(session_id: str, title: str, user_id: int = None) -> int:
+    """대화 기록을 생성하고 ID를 반환하는 함수"""
+    user_id = current_user_id(user_id)
+    db = SessionLocal()
+    try:
+        transcript = ChatTranscript(
+            user_id=user_id,
+            session_id=session_id,
+            title=title,
+            message_count=0,
+        )
+        db.add(transcript)
+        db.commit()
+        db.refresh(transcript)
+        return transcript.id
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+def append_chat_messages(transcript_id: int, messages: list, user_id: int = None) -> int:
+    """대화 기록 끝에 메시지들을 한 번에 추가하는 함수
+
+    messages는 role, content와 선택적으로 model, prompt_tokens,
+    completion_tokens, latency_ms 키를 가진 dict 목록이며 추가된 개수를 반환한다.
+    """
+    user_id = current_user_id(user_id)
+    if not messages:
+        return 0
+    db = SessionLocal()
+    try:
+        transcript = (
+            db.query(ChatTranscript)
+            .filter(ChatTranscript.id == transcript_id)
+            .filter(ChatTranscript.user_id == user_id)
+            .with_for_update()
+            .first()
         )
+        if not transcript:
+            return 0
+
+        rows = []
+        seq = transcript.message_count or 0
+        for message in messages:
+            content, content_compressed, search_text = _pack_content(message["content"])
+            row = ChatMessage(
+                transcript_id=transcript_id,
+                user_id=transcript.user_id,
+                seq=seq,
+                role=message["role"],
+                model=message.get("model"),
+                content=content,
+                content_compressed=content_compressed,
+                search_text=search_text,
+                prompt_tokens=message.get("prompt_tokens"),
+                completion_tokens=message.get("completion_tokens"),
+                latency_ms=message.get("latency_ms"),
+            )
+            db.add(row)
+            rows.append((row, message["content"]))
+            seq += 1
+
+        transcript.message_count = seq
+        transcript.updated_at = datetime.now()
+        title = transcript.title
+        db.commit()
+
+        event_rows = []
+        for row, full_content in rows:
+            event_row = _row_to_dict(row)
+            event_row.update(content=full_content, title=title)
+            event_rows.append(event_row)
+        _notify_changes("chat", "insert", event_rows)
+        return len(rows)
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+def get_chat_transcripts(limit: int = 20, offset: int = 0, user_id: int = None):
+    """대화 기록 목록을 최신순으로 조회하는 함수 (메시지 본문 제외)"""
+    user_id = current_user_id(user_id)
+    query = text(
+        """
+    SELECT id, session_id, title, message_count, created_at, updated_at
+    FROM chat_transcripts
+    WHERE user_id = :user_id
+    ORDER BY updated_at DESC
+    LIMIT :limit OFFSET :offset
     """
     )
+    return pd.read_sql_query(
+        query,
+        get_engine(),
+        params={
+            "user_id": user_id,
+            "limit": limit,
+            "offset": offset,
+        },
+    )
 
 
-# 대화 저장 함수
-def add_chat_history(user_id: int, title: str, content: str) -> int:
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO chat_history (user_id, title, content)
-                VALUES (%s, %s, %s)
-                RETURNING id
-                """,
-                (user_id, title, content),
+def count_chat_transcripts(user_id: int = None) -> int:
+    """대화 기록 개수를 조회하는 함수"""
+    user_id = current_user_id(user_id)
+    db = SessionLocal()
+    try:
+        return (
+            db.query(func.count(ChatTranscript.id))
+            .filter(ChatTranscript.user_id == user_id)
+            .scalar()
+        )
+    finally:
+        db.close()
+
+
+def get_chat_messages(
+    transcript_id: int, after_seq: int = -1, limit: int = 50, user_id: int = None
+) -> list:
+    """대화 기록의 메시지를 seq 순서로 limit개씩 조회하는 함수
+
+    다음 페이지는 마지막으로 받은 메시지의 seq를 after_seq로 넘겨 조회한다.
+    """
+    user_id = current_user_id(user_id)
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ChatMessage)
+            .filter(ChatMessage.transcript_id == transcript_id)
+            .filter(ChatMessage.user_id == user_id)
+            .filter(ChatMessage.seq > after_seq)
+            .order_by(ChatMessage.seq)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "seq": row.seq,
+                "role": row.role,
+                "model": row.model,
+                "content": unpack_chat_content(row.content, row.content_compressed),
+                "prompt_tokens": row.prompt_tokens,
+                "completion_tokens": row.completion_tokens,
+                "latency_ms": row.latency_ms,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ]
+    finally:
+        db.close()
+
+
+def iter_chat_messages(transcript_id: int, page_size: int = 50, user_id: int = None):
+    """대화 기록의 메시지를 page_size개씩 끊어 읽으며 하나씩 반환하는 제너레이터"""
+    user_id = current_user_id(user_id)
+    after_seq = -1
+    while True:
+        page = get_chat_messages(transcript_id, after_seq, page_size, user_id=user_id)
+        yield from page
+        if len(page) < page_size:
+            return
+        after_seq = page[-1]["seq"]
+
+
+# 내보내기/가져오기 (대량 데이터)
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_query(dataset: str, user_id: int, board_type: str = None):
+    if dataset == "goals":
+        goals, categories = Goal.__table__, Category.__table__
+        return (
+            select(
+                *(c for c in goals.c if c.name not in ("user_id", "category_id")),
+                categories.c.name.label("category_name"),
             )
-            chat_id = cur.fetchone()[0]
-            conn.commit()
-            return chat_id
-
-
-# 대화 기록 조회 함수
-def get_chat_histories(user_id: int = None, limit: int = None):
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            query = """
-                SELECT ch.id, ch.title, ch.content, ch.created_at, u.username
-                FROM chat_history ch
-                JOIN users u ON ch.user_id = u.id
-            """
-            if user_id:
-                query += " WHERE ch.user_id = %s"
-            query += " ORDER BY ch.created_at DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-
-            if user_id:
-                cur.execute(query, (user_id,))
-            else:
-                cur.execute(query)
-
-            return cur.fetchall()
+            .select_from(
+                goals.outerjoin(
+                    categories,
+                    (categories.c.id == goals.c.category_id)
+                    & (categories.c.user_id == goals.c.user_id),
+                )
+            )
+            .where(goals.c.user_id == user_id)
+            .order_by(goals.c.id)
+        )
+    if dataset == "posts":
+        boards = Board.__table__
+        stmt = select(*(c for c in boards.c if c.name not in ("user_id", "image_path")))
+        stmt = stmt.where(boards.c.user_id == user_id)
+        if board_type:
+            stmt = stmt.where(boards.c.board_type == board_type)
+        return stmt.order_by(boards.c.id)
+    if dataset == "links":
+        links = Link.__table__
+        return (
+            select(*(c for c in links.c if c.name != "user_id"))
+            .where(links.c.user_id == user_id)
+            .order_by(links.c.id)
+        )
+    if dataset == "chat":
+        messages, transcripts = ChatMessage.__table__, ChatTranscript.__table__
+        return (
+            select(
+                messages.c.transcript_id,
+                transcripts.c.title,
+                messages.c.seq,
+                messages.c.role,
+                messages.c.model,
+                messages.c.content,
+                messages.c.content_compressed,
+                messages.c.created_at,
+            )
+            .join(transcripts, transcripts.c.id == messages.c.transcript_id)
+            .where(messages.c.user_id == user_id)
+            .order_by(messages.c.transcript_id, messages.c.seq)
+        )
+    raise ValueError(f"알 수 없는 데이터 종류: {dataset}")
+
+
+def iter_export_rows(
+    dataset: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    board_type: str = None,
+    user_id: int = None,
+):
+    """사용자의 goals/posts/links/chat 행을 chunk_size개씩 dict 목록으로 내보내는 제너레이터
+
+    yield_per로 읽으므로 PostgreSQL에서는 서버 쪽 커서를 써서 전체를 메모리에 올리지
+    않는다. 목표 일시는 저장된 그대로(UTC)이고 카테고리는 이름(category_name)으로 준다.
+    """
+    user_id = current_user_id(user_id)
+    stmt = _export_query(dataset, user_id, board_type)
+    with get_engine().connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for partition in result.mappings().partitions():
+            rows = [dict(row) for row in partition]
+            if dataset == "chat":
+                for row in rows:
+                    row["content"] = unpack_chat_content(row["content"], row.pop("content_compressed"))
+            yield rows
+
+
+IMPORT_MODELS = {"goals": Goal, "posts": Board, "links": Link}
+
+
+def _copy_into(db, table, rows: list):
+    """행들을 PostgreSQL COPY로 넣는 함수 (같은 트랜잭션, NULL은 \\N)"""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([r"\N" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN "
+            r"WITH (FORMAT csv, NULL '\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def import_rows(dataset: str, rows: list, user_id: int = None) -> int:
+    """검증된 행들을 한 트랜잭션으로 넣고 넣은 개수를 반환하는 함수
+
+    PostgreSQL은 COPY, 그 밖의 DB는 executemany INSERT를 쓴다. 목표는 일별 집계도
+    함께 갱신한다. 행마다 변경 알림을 보내지 않고 ("import" 동작, {"user_id", "count"})
+    알림 한 번으로 캐시를 무효화한다.
+    """
+    user_id = current_user_id(user_id)
+    if not rows:
+        return 0
+    table = IMPORT_MODELS[dataset].__table__
+    db = SessionLocal()
+    try:
+        stamp = {"user_id": user_id}
+        if dataset == "goals":
+            stamp["sync_version"] = _next_goal_version(db, user_id)
+        rows = [{**row, **stamp} for row in rows]
+        if db.get_bind().dialect.name == "postgresql":
+            _copy_into(db, table, rows)
+        else:
+            db.execute(insert(table), rows)
+        if dataset == "goals":
+            _apply_rollup_delta(db, new_rows=rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+    entity = {"goals": "goal", "posts": "board", "links": "link"}[dataset]
+    _notify_change(entity, "import", {"user_id": user_id, "count": len(rows)})
+    return len(rows)
+
+
+# 모든 CRUD 함수 실행 시간을 rerun 추적에 기록 (추적하지 않는 rerun에서는 바로 호출)
+instrument_module(
+    globals(),
+    "db",
+    exclude={
+        "get_database_url",
+        "get_engine",
+        "dispose_engine",
+        "SessionLocal",
+        "add_change_listener",
+        "user_context",
+        "current_user_id",
+        "ensure_schema",
+        "iter_chat_messages",
+        "unpack_chat_content",
+        "iter_export_rows",
+        "goal_record",
+    },
+)
@@ -0,0 +1,157 @@
+"""운영용 관리 명령
+
+사용법:
+    python manage.py migrate
+    python manage.py rebuild-rollups [--user-id 1]
+    python manage.py purge-tombstones
+    python manage.py gc-images [--dry-run] [--min-age 3600]
+    python manage.py export --user-id 1 --dataset goals --format csv --output goals.csv
+    python manage.py import --user-id 1 --dataset goals --format csv --input goals.csv
+"""
+import argparse
+
+
+def migrate(args):
+    """테이블, 추가된 컬럼, 검색 인덱스를 데이터베이스에 반영"""
+    from sqlalchemy import inspect
+    from config import validate_settings
+    from database import backfill_chat_search_text, ensure_schema, get_engine, rebuild_goal_rollups
+    from utils.search import ensure_search_schema
+
+    validate_settings(required=("DATABASE",))
+    had_rollups = inspect(get_engine()).has_table("goal_daily_rollups")
+    added = ensure_schema()
+    for column in added:
+        print(f"컬럼 추가: {column}")
+    if "chat_messages.search_text" in added:
+        # 이미 압축 저장된 긴 메시지도 검색되도록 검색용 텍스트 채움
+        print(f"대화 메시지 검색 텍스트 생성: {backfill_chat_search_text()}건")
+    if not had_rollups:
+        # 집계 테이블을 처음 만들면 기존 목표로 채움
+        print(f"목표 일별 집계 생성: {rebuild_goal_rollups()}행")
+    if ensure_search_schema():
+        print("검색 인덱스 확인 완료")
+    print("마이그레이션 완료")
+
+
+def rebuild_rollups(args):
+    """목표 일별 집계를 goals 테이블에서 다시 계산"""
+    from config import validate_settings
+    from database import rebuild_goal_rollups
+
+    validate_settings(required=("DATABASE",))
+    count = rebuild_goal_rollups(args.user_id)
+    target = f"사용자 {args.user_id}" if args.user_id is not None else "전체 사용자"
+    print(f"{target}의 목표 일별 집계 {count}행 생성")
+
+
+def purge_tombstones(args):
+    """보관 기간이 지난 목표 삭제 기록 정리"""
+    from config import validate_settings
+    from database import purge_goal_tombstones
+
+    validate_settings(required=("DATABASE",))
+    print(f"삭제 기록 {purge_goal_tombstones()}건 정리")
+
+
+def gc_images(args):
+    """게시글에서 참조하지 않는 업로드 이미지를 정리"""
+    from database import get_image_paths
+    from utils.image_store import collect_garbage
+
+    removed = collect_garbage(
+        get_image_paths(), min_age_seconds=args.min_age, dry_run=args.dry_run
+    )
+    action = "삭제 대상" if args.dry_run else "삭제됨"
+    for path in removed:
+        print(f"{action}: {path}")
+    print(f"총 {len(removed)}개 파일 {action}")
+
+
+def export_data(args):
+    """사용자 데이터를 파일로 내보내기 (청크 단위로 써서 메모리 사용량 일정)"""
+    from config import validate_settings
+    from utils.data_transfer import export_data
+
+    validate_settings(required=("DATABASE",))
+    with open(args.output, "wb") as f:
+        count = export_data(
+            args.dataset, args.format, f, board_type=args.board_type, user_id=args.user_id
+        )
+    print(f"{args.dataset} {count}행을 {args.output}에 저장")
+
+
+def import_data(args):
+    """파일에서 사용자 데이터 가져오기 (잘못된 행은 건너뛰고 사유 출력)"""
+    from config import validate_settings
+    from utils.data_transfer import import_data
+
+    validate_settings(required=("DATABASE",))
+    with open(args.input, "rb") as f:
+        result = import_data(args.dataset, args.format, f, user_id=args.user_id)
+    for row_number, reason in result["errors"]:
+        print(f"{row_number}행 건너뜀: {reason}")
+    print(f"{args.dataset} {result['imported']}행 가져옴, {result['rejected']}행 건너뜀")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목표 달성 GPT 관리 명령")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="테이블 생성 및 스키마 변경 반영"
+    )
+    migrate_parser.set_defaults(func=migrate)
+
+    rollup_parser = subparsers.add_parser(
+        "rebuild-rollups", help="목표 일별 집계(히트맵용) 다시 계산"
+    )
+    rollup_parser.add_argument(
+        "--user-id", type=int, help="이 사용자만 다시 계산 (기본값: 전체)"
+    )
+    rollup_parser.set_defaults(func=rebuild_rollups)
+
+    tombstone_parser = subparsers.add_parser(
+        "purge-tombstones", help="보관 기간(30일)이 지난 목표 삭제 기록 정리"
+    )
+    tombstone_parser.set_defaults(func=purge_tombstones)
+
+    gc_parser = subparsers.add_parser(
+        "gc-images", help="참조되지 않는 업로드 이미지 정리"
+    )
+    gc_parser.add_argument(
+        "--dry-run", action="store_true", help="삭제하지 않고 대상만 출력"
+    )
+    gc_parser.add_argument(
+        "--min-age",
+        type=int,
+        default=3600,
+        help="이 시간(초)보다 오래된 파일만 정리 (기본값: 3600)",
+    )
+    gc_parser.set_defaults(func=gc_images)
+
+    from utils.data_transfer import EXPORT_COLUMNS, EXPORT_FORMATS, IMPORT_DATASETS, IMPORT_FORMATS
+
+    export_parser = subparsers.add_parser("export", help="사용자 데이터를 파일로 내보내기")
+    export_parser.add_argument("--user-id", type=int, required=True)
+    export_parser.add_argument("--dataset", choices=list(EXPORT_COLUMNS), required=True)
+    export_parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="csv", help="ics는 목표만 가능 (기본값: csv)"
+    )
+    export_parser.add_argument("--output", required=True, help="저장할 파일 경로")
+    export_parser.add_argument("--board-type", help="posts만: 이 게시판의 글만 내보내기")
+    export_parser.set_defaults(func=export_data)
+
+    import_parser = subparsers.add_parser("import", help="파일에서 사용자 데이터 가져오기")
+    import_parser.add_argument("--user-id", type=int, required=True)
+    import_parser.add_argument("--dataset", choices=IMPORT_DATASETS, required=True)
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, default="csv")
+    import_parser.add_argument("--input", required=True, help="가져올 파일 경로")
+    import_parser.set_defaults(func=import_data)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import streamlit as st
-from database import get_posts
+from database import (
+    get_post_summaries,
+    get_post,
+    get_chat_transcripts,
+    count_chat_transcripts,
+    get_chat_messages,
+)
 from utils.menu_utils import show_menu
 from utils.auth_utils import login_required, init_auth
 from datetime import datetime
+from utils.render_cache import show_lazy_record
 
 # 인증 초기화
 init_auth()
@@ -39,15 +46,83 @@ show_menu()
 
 st.title("💬 대화 기록")
 
-# 대화 기록 가져오기 (board_type이 'chat'인 게시물만)
-chat_records = get_posts(board_type="chat")
+# 한 화면에 보여줄 대화 기록 수와 한 번에 불러올 메시지 수
+TRANSCRIPTS_PER_PAGE = 20
+MESSAGES_PER_PAGE = 50
+
+
+def show_transcript_messages(transcript_id):
+    """펼친 대화 기록의 메시지를 MESSAGES_PER_PAGE개씩 이어서 표시하는 함수"""
+    pages_key = f"chat_pages_{transcript_id}"
+    page_count = st.session_state.get(pages_key, 1)
+
+    after_seq = -1
+    has_more = False
+    for _ in range(page_count):
+        messages = get_chat_messages(transcript_id, after_seq, MESSAGES_PER_PAGE)
+        for message in messages:
+            with st.chat_message("user" if message["role"] == "user" else "assistant"):
+                st.markdown(message["content"])
+                if message["role"] == "assistant" and message["model"]:
+                    details = [message["model"]]
+                    if message["latency_ms"] is not None:
+                        details.append(f"{message['latency_ms'] / 1000:.1f}초")
+                    if message["completion_tokens"] is not None:
+                        details.append(
+                            f"토큰 {message['prompt_tokens'] or 0}/{message['completion_tokens']}"
+                        )
+                    st.caption(" · ".join(details))
+        has_more = len(messages) == MESSAGES_PER_PAGE
+        if not has_more:
+            break
+        after_seq = messages[-1]["seq"]
+
+    if has_more and st.button("더 보기", key=f"chat_more_{transcript_id}"):
+        st.session_state[pages_key] = page_count + 1
+        st.rerun()
+
+
+# 대화 기록 목록 (메시지 본문은 펼칠 때만 조회)
+total = count_chat_transcripts()
+if total:
+    page_total = (total - 1) // TRANSCRIPTS_PER_PAGE + 1
+    page = 1
+    if page_total > 1:
+        page = st.number_input("페이지", min_value=1, max_value=page_total, value=1)
+    transcripts = get_chat_transcripts(
+        limit=TRANSCRIPTS_PER_PAGE, offset=(page - 1) * TRANSCRIPTS_PER_PAGE
+    )
+    for _, transcript in transcripts.iterrows():
+        label = (
+            f"📝 {transcript['title']} "
+            f"({transcript['updated_at'].strftime('%Y-%m-%d %H:%M')}, "
+            f"메시지 {transcript['message_count']}개)"
+        )
+        if st.toggle(label, key=f"transcript_open_{transcript['id']}"):
+            with st.container(border=True):
+                show_transcript_messages(int(transcript["id"]))
+
+# 이전 형식(게시판 'chat' 타입)으로 저장된 대화 기록
+chat_records = get_post_summaries(board_type="chat")
+
+
+def load_content(post_id):
+    """펼친 대화 기록의 본문만 조회하는 함수"""
+    post = get_post(post_id)
+    return post.content if post else ""
+
 
 if not chat_records.empty:
+    if total:
+        st.subheader("이전 대화 기록")
     for _, record in chat_records.iterrows():
-        with st.expander(
-            f"📝 {record['title']} ({record['created_at'].strftime('%Y-%m-%d %H:%M')})"
-        ):
-            st.markdown(record["content"])
-            st.markdown("---")
-else:
+        # 펼친 기록만 본문을 불러와 표시 (불러온 본문은 캐시됨)
+        show_lazy_record(
+            record["id"],
+            record["updated_at"],
+            f"📝 {record['title']} ({record['created_at'].strftime('%Y-%m-%d %H:%M')})",
+            lambda post_id=int(record["id"]): load_content(post_id),
+            state_prefix="chat",
+        )
+elif not total:
     st.info("저장된 대화 기록이 없습니다.")
@@ -0,0 +1,88 @@
+import streamlit as st
+
+st.set_page_config(
+    page_title="통합 검색",
+    page_icon="🔍",
+    layout="wide",
+    initial_sidebar_state="collapsed",
+    menu_items=None
+)
+
+# CSS로 사이드바 버튼 숨기기
+st.markdown(
+    """
+    <style>
+        [data-testid="collapsedControl"] {
+            visibility: hidden;
+        }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
+
+from utils.search import search
+from utils.session_utils import clear_goal_session
+from utils.auth_utils import login_required, init_auth
+from utils.menu_utils import show_menu
+
+# 인증 초기화
+init_auth()
+
+# 로그인 체크
+login_required()
+
+# 페이지 진입 시 세션 정리
+clear_goal_session()
+
+# 메뉴 표시
+show_menu()
+
+st.title("🔍 통합 검색")
+
+# 게시판 종류별 이동할 페이지
+BOARD_PAGES = {
+    "info": "pages/5_info_board.py",
+    "idea": "pages/6_idea_board.py",
+    "reflection": "pages/10_reflection_board.py",
+    "chat": "pages/11_chat_history.py",
+}
+
+ENTITY_LABELS = {
+    "board": "📄 게시글",
+    "goal": "🎯 목표",
+    "link": "🔗 링크",
+    "chat": "💬 대화",
+}
+
+keyword = st.text_input("검색어", placeholder="게시글, 목표, 링크, 대화를 한 번에 검색합니다")
+selected_labels = st.multiselect(
+    "검색 대상", list(ENTITY_LABELS.values()), default=list(ENTITY_LABELS.values())
+)
+entities = [key for key, label in ENTITY_LABELS.items() if label in selected_labels]
+
+if keyword and entities:
+    results = search(keyword, entities=entities, limit=50)
+    if not results:
+        st.info("검색 결과가 없습니다.")
+    else:
+        st.caption(f"검색 결과 {len(results)}건")
+        for result in results:
+            label = ENTITY_LABELS[result["entity"]]
+            key = f"search_{result['entity']}_{result['id']}"
+            if st.button(f"{label} · {result['title']}", key=key):
+                if result["entity"] == "goal":
+                    st.session_state.selected_goal_id = int(result["id"])
+                    st.switch_page("pages/3_goal_detail.py")
+                elif result["entity"] == "link":
+                    st.switch_page("pages/8_link_board.py")
+                elif result["entity"] == "chat":
+                    st.switch_page("pages/11_chat_history.py")
+                else:
+                    page = BOARD_PAGES.get(result["board_type"])
+                    if page:
+                        if result["board_type"] != "chat":
+                            st.query_params["mode"] = "view"
+                            st.query_params["post_id"] = str(result["id"])
+                        st.switch_page(page)
+            if result["snippet"]:
+                st.caption(result["snippet"])
@@ -0,0 +1,164 @@
+import streamlit as st
+
+st.set_page_config(
+    page_title="목표 달성 히트맵",
+    page_icon="🗓️",
+    layout="wide",
+    initial_sidebar_state="collapsed",
+    menu_items=None
+)
+
+# CSS로 사이드바 버튼 숨기기
+st.markdown(
+    """
+    <style>
+        [data-testid="collapsedControl"] {
+            visibility: hidden;
+        }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
+
+from datetime import date, datetime
+import altair as alt
+import pandas as pd
+import pytz
+from database import get_goal_rollups, ROLLUP_COUNTS
+from utils.category_cache import get_category_map
+from utils.session_utils import clear_goal_session
+from utils.auth_utils import login_required, init_auth
+from utils.menu_utils import show_menu
+
+# 인증 초기화
+init_auth()
+
+# 로그인 체크
+login_required()
+
+# 페이지 진입 시 세션 정리
+clear_goal_session()
+
+# 메뉴 표시
+show_menu()
+
+st.title("🗓️ 목표 달성 히트맵")
+
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+# 색으로 표시할 값: 라벨 -> (컬럼, 비율 여부)
+METRICS = {
+    "완료율": ("completion_rate", True),
+    "중요도 가중 완료율": ("weighted_rate", True),
+    "완료한 목표 수": ("completed", False),
+    "계획한 목표 수": ("planned", False),
+    "미완료 목표 수": ("incomplete", False),
+}
+
+
+def daily_frame(rollups, start_day, end_day):
+    """기간의 모든 날짜에 대해 집계와 비율을 채운 DataFrame을 만드는 함수"""
+    days = pd.date_range(start_day, end_day, freq="D")
+    frame = (
+        rollups.set_index("day")[ROLLUP_COUNTS]
+        .reindex(days, fill_value=0)
+        .fillna(0)
+        .astype(int)
+        .rename_axis("day")
+        .reset_index()
+    )
+    frame["completion_rate"] = (
+        frame["completed"] / frame["planned"].where(frame["planned"] > 0)
+    ).round(2)
+    frame["weighted_rate"] = (
+        frame["completed_score"]
+        / frame["planned_score"].where(frame["planned_score"] > 0)
+    ).round(2)
+    frame["weekday"] = frame["day"].dt.dayofweek.map(dict(enumerate(WEEKDAYS)))
+    frame["date"] = frame["day"].dt.strftime("%Y-%m-%d")
+    # 기간 첫 주의 월요일부터 센 주 번호
+    first_monday = days[0] - pd.Timedelta(days=days[0].dayofweek)
+    frame["week"] = (frame["day"] - first_monday).dt.days // 7 + 1
+    return frame
+
+
+def heatmap(frame, metric, by_month):
+    """월 보기는 달력 형태(행=주), 연 보기는 잔디 형태(열=주)로 그리는 함수"""
+    column, is_rate = METRICS[metric]
+    if by_month:
+        x = alt.X("weekday:O", sort=WEEKDAYS, title=None)
+        y = alt.Y("week:O", title="주")
+    else:
+        x = alt.X("week:O", title="주", axis=alt.Axis(labels=False, ticks=False))
+        y = alt.Y("weekday:O", sort=WEEKDAYS, title=None)
+
+    color = alt.Color(
+        f"{column}:Q",
+        title=metric,
+        scale=alt.Scale(scheme="greens", domain=[0, 1] if is_rate else None),
+    )
+    tooltip = [
+        alt.Tooltip("date:N", title="날짜"),
+        alt.Tooltip("planned:Q", title="계획"),
+        alt.Tooltip("completed:Q", title="완료"),
+        alt.Tooltip("incomplete:Q", title="미완료"),
+        alt.Tooltip("completion_rate:Q", title="완료율", format=".0%"),
+        alt.Tooltip("weighted_rate:Q", title="중요도 가중 완료율", format=".0%"),
+    ]
+    chart = (
+        alt.Chart(frame)
+        .mark_rect(stroke="white")
+        .encode(x=x, y=y, color=color, tooltip=tooltip)
+    )
+    if by_month:
+        # 달력처럼 날짜 숫자 표시
+        labels = (
+            alt.Chart(frame)
+            .mark_text(baseline="middle")
+            .encode(x=x, y=y, text=alt.Text("day:T", format="%-d"))
+        )
+        chart = chart + labels
+    return chart.properties(height=300 if by_month else 180)
+
+
+today = datetime.now(pytz.timezone("Asia/Seoul")).date()
+
+col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
+with col1:
+    view = st.radio("보기", ["월", "연"], horizontal=True)
+with col2:
+    year = st.selectbox("연도", list(range(today.year + 1, today.year - 5, -1)), index=1)
+with col3:
+    month = st.selectbox(
+        "월", list(range(1, 13)), index=today.month - 1, disabled=view == "연"
+    )
+with col4:
+    metric = st.selectbox("표시 값", list(METRICS))
+
+category_options = {"전체": None, "카테고리 없음": 0}
+category_options.update(get_category_map().ids)
+selected_category = st.selectbox("카테고리", list(category_options))
+
+if view == "월":
+    start_day = date(year, month, 1)
+    end_day = (pd.Timestamp(start_day) + pd.offsets.MonthEnd(1)).date()
+else:
+    start_day, end_day = date(year, 1, 1), date(year, 12, 31)
+
+# 일별 집계 테이블에서 기간 전체를 한 번에 조회
+rollups = get_goal_rollups(start_day, end_day, category_options[selected_category])
+frame = daily_frame(rollups, start_day, end_day)
+
+planned = int(frame["planned"].sum())
+completed = int(frame["completed"].sum())
+stat1, stat2, stat3, stat4 = st.columns(4)
+stat1.metric("계획한 목표", planned)
+stat2.metric("완료한 목표", completed)
+stat3.metric("완료율", f"{completed / planned:.0%}" if planned else "-")
+stat4.metric("목표가 있던 날", int((frame["planned"] > 0).sum()))
+
+if planned == 0:
+    st.info("이 기간에 마감인 목표가 없습니다.")
+else:
+    st.altair_chart(heatmap(frame, metric, view == "월"), use_container_width=True)
+    st.caption("목표는 종료일(없으면 시작일) 기준 날짜에 집계됩니다.")
@@ -0,0 +1,130 @@
+import streamlit as st
+
+st.set_page_config(
+    page_title="쿼리 통계",
+    page_icon="🐢",
+    layout="wide",
+    initial_sidebar_state="collapsed",
+    menu_items=None
+)
+
+# CSS로 사이드바 버튼 숨기기
+st.markdown(
+    """
+    <style>
+        [data-testid="collapsedControl"] {
+            visibility: hidden;
+        }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
+
+import json
+import pandas as pd
+from utils import query_stats
+from utils.session_utils import clear_goal_session
+from utils.auth_utils import login_required, init_auth, is_admin
+from utils.menu_utils import show_menu
+
+# 인증 초기화
+init_auth()
+
+# 로그인 체크
+login_required()
+
+# 페이지 진입 시 세션 정리
+clear_goal_session()
+
+# 메뉴 표시
+show_menu()
+
+if not is_admin():
+    st.error("관리자만 볼 수 있는 페이지입니다.")
+    st.stop()
+
+st.title("🐢 쿼리 통계")
+
+# 정렬 기준: 라벨 -> 컬럼
+SORT_OPTIONS = {
+    "총 시간": "total_ms",
+    "실행 횟수": "count",
+    "p95 시간": "p95_ms",
+    "최대 시간": "max_ms",
+    "행 수": "rows",
+    "N+1 횟수": "n_plus_one",
+}
+
+report = query_stats.report()
+st.caption(
+    f"프로세스 {report['pid']} · {report['since']}부터 집계 · "
+    f"느린 쿼리 기준 {report['slow_query_ms']:.0f} ms · "
+    f"한 번의 rerun/요청에서 같은 쿼리 {report['n_plus_one_threshold']}회 이상이면 N+1 후보"
+)
+
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    sort_label = st.selectbox("정렬", list(SORT_OPTIONS))
+with col2:
+    limit = st.number_input("표시 개수", min_value=5, max_value=200, value=20, step=5)
+with col3:
+    st.write("")
+    if st.button("통계 초기화"):
+        query_stats.reset()
+        st.rerun()
+
+queries = query_stats.snapshot(sort=SORT_OPTIONS[sort_label], limit=int(limit))
+if not queries:
+    st.info("아직 기록된 쿼리가 없습니다.")
+else:
+    total_ms = sum(q["total_ms"] for q in query_stats.snapshot()) or 1
+    table = pd.DataFrame(
+        [
+            {
+                "호출 함수": ", ".join(f"{name}×{count}" for name, count in list(q["callers"].items())[:3]),
+                "횟수": q["count"],
+                "총 ms": q["total_ms"],
+                "비중 %": round(q["total_ms"] / total_ms * 100, 1),
+                "평균 ms": q["mean_ms"],
+                "p95 ms": q["p95_ms"],
+                "최대 ms": q["max_ms"],
+                "행/회": q["rows_per_call"],
+                "느림": q["slow"],
+                "N+1": q["n_plus_one"],
+                "SQL": q["shape"],
+            }
+            for q in queries
+        ]
+    )
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+st.subheader("N+1 후보")
+if report["n_plus_one"]:
+    st.dataframe(
+        pd.DataFrame(report["n_plus_one"]).rename(
+            columns={"at": "시각", "unit": "페이지/요청", "caller": "호출 함수", "count": "횟수", "shape": "SQL"}
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+else:
+    st.caption("감지된 N+1 패턴이 없습니다.")
+
+st.subheader("최근 느린 쿼리")
+if report["slow"]:
+    st.dataframe(
+        pd.DataFrame(report["slow"]).rename(
+            columns={"at": "시각", "ms": "ms", "unit": "페이지/요청", "caller": "호출 함수", "shape": "SQL"}
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+else:
+    st.caption(f"{report['slow_query_ms']:.0f} ms보다 오래 걸린 쿼리가 없습니다.")
+
+st.download_button(
+    "JSON으로 내보내기",
+    data=json.dumps(report, indent=2, ensure_ascii=False),
+    file_name=f"query_stats_{report['pid']}.json",
+    mime="application/json",
+)
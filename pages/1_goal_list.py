@@ -1,9 +1,7 @@
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 from database import (
-    get_goals,
-    get_categories,
     delete_goal,
     get_links,
     get_posts,
@@ -11,6 +9,15 @@ from database import (
 )
 from utils.auth_utils import login_required, init_auth
 from utils.menu_utils import show_menu
+from utils.tracing import traced
+from utils.goal_filters import (
+    PERIODS,
+    filter_goals_for_period,
+    time_range_labels,
+)
+from utils.goal_store import get_goal_snapshot
+from utils.category_cache import get_category_map
+from utils.goal_actions import show_bulk_actions
 import pytz
 
 # 페이지 설정
@@ -35,126 +42,224 @@ st.markdown(
 )
 
 
-def format_time(dt):
-    """datetime 객체에서 시간을 포맷팅하는 함수"""
-    if dt.tzinfo is None:
-        # timezone이 없는 경우 KST 적용
-        dt = pytz.timezone("Asia/Seoul").localize(dt)
-    return dt.strftime("%H:%M")
+# 진행 중/완료 목록에서 한 페이지에 표시할 목표 수
+GOALS_PER_PAGE = 30
 
 
-def show_goals_by_date(selected_date, goals_df):
-    """선택된 날짜의 목표들을 표시하는 함수"""
-    # 선택된 날짜의 목표��� 필터링
-    day_goals = goals_df[
-        (pd.to_datetime(goals_df["start_date"]).dt.date <= selected_date)
-        & (pd.to_datetime(goals_df["end_date"]).dt.date >= selected_date)
-    ]
+def complete_goal(goal_id, title):
+    """목표 완료 버튼 콜백
 
-    if day_goals.empty:
-        st.info(
-            f"{selected_date.strftime('%Y년 %m월 %d일')}에 해당하는 목표가 없습니다."
-        )
+    콜백은 다시 그리기 전에 실행되고, 변경 알림으로 세션의 목표 스냅샷이
+    갱신되므로 목록을 다시 조회하거나 st.rerun()을 호출하지 않는다.
+    """
+    update_goal(goal_id, status="완료")
+    st.toast(f"'{title}' 목표가 완료되었습니다.")
+
+
+def remove_goal(goal_id, title):
+    """목표 삭제 버튼 콜백"""
+    if delete_goal(goal_id):
+        st.toast(f"'{title}' 목표가 삭제되었습니다.")
     else:
-        col1, col2 = st.columns(2)
+        st.toast("이미 삭제되었거나 찾을 수 없는 목표입니다.")
+
+
+def show_incomplete_goal(prefix, goal):
+    """진행 중인 목표 한 줄 (상세 보기, 완료, 삭제 버튼)을 표시하는 함수"""
+    goal_col1, goal_col2, goal_col3 = st.columns([6, 1, 1])
+
+    with goal_col1:
+        unique_key = f"{prefix}_incomplete_{goal.id}_{goal.Index}"
+        if st.button(f"📌 {goal.title} ({goal.time_str})", key=unique_key):
+            st.session_state.selected_goal_id = int(goal.id)
+            st.switch_page("pages/3_goal_detail.py")
+
+    with goal_col2:
+        complete_key = f"complete_{prefix}_{goal.id}_{goal.Index}"
+        st.button(
+            "✅",
+            key=complete_key,
+            help="목표 완료",
+            on_click=complete_goal,
+            args=(int(goal.id), goal.title),
+        )
 
-        # 진행 중인 목표
-        with col1:
-            st.subheader("진행 중인 목표")
-            incomplete_goals = day_goals[day_goals["status"] != "완료"]
-            if incomplete_goals.empty:
-                st.info("진행 중인 목표가 없습니다.")
-            else:
-                for idx, goal in incomplete_goals.iterrows():
-                    start_datetime = pd.to_datetime(goal["start_date"])
-                    end_datetime = pd.to_datetime(goal["end_date"])
-
-                    start_time_str = format_time(start_datetime)
-                    end_time_str = format_time(end_datetime)
-                    time_str = f"{start_time_str} - {end_time_str}"
-
-                    goal_col1, goal_col2, goal_col3 = st.columns([6, 1, 1])
-
-                    with goal_col1:
-                        unique_key = f"date_incomplete_{goal['id']}_{idx}"
-                        if st.button(
-                            f"📌 {goal['title']} ({time_str})", key=unique_key
-                        ):
-                            st.session_state.selected_goal_id = int(goal["id"])
-                            st.switch_page("pages/3_goal_detail.py")
-
-                    with goal_col2:
-                        complete_key = f"complete_date_{goal['id']}_{idx}"
-                        if st.button("✅", key=complete_key, help="목표 완료"):
-                            update_goal(goal["id"], status="완료")
-                            st.success(
-                                f"'{goal['title']}' 목표가 완료되었습니다."
-                            )
-                            st.rerun()
-
-                    with goal_col3:
-                        delete_key = f"delete_date_{goal['id']}_{idx}"
-                        if st.button("✕", key=delete_key, help="목표 삭제"):
-                            if delete_goal(goal["id"]):
-                                st.success(
-                                    f"'{goal['title']}' 목표가 삭제되었습니다."
-                                )
-                                st.rerun()
-                            else:
-                                st.error("목표 삭제 중 오류가 발생했습니다.")
-
-        # 완���된 목표
-        with col2:
-            st.subheader("완료된 목표")
-            complete_goals = day_goals[day_goals["status"] == "완료"]
-            if complete_goals.empty:
-                st.info("완료된 목표가 없습니다.")
-            else:
-                for idx, goal in complete_goals.iterrows():
-                    start_datetime = pd.to_datetime(goal["start_date"])
-                    end_datetime = pd.to_datetime(goal["end_date"])
-
-                    start_time_str = format_time(start_datetime)
-                    end_time_str = format_time(end_datetime)
-                    time_str = f"{start_time_str} - {end_time_str}"
-
-                    unique_key = f"date_complete_{goal['id']}_{idx}"
-                    if st.button(
-                        f"✅ {goal['title']} ({time_str})", key=unique_key
-                    ):
-                        st.session_state.selected_goal_id = int(goal["id"])
-                        st.switch_page("pages/3_goal_detail.py")
+    with goal_col3:
+        delete_key = f"delete_{prefix}_{goal.id}_{goal.Index}"
+        st.button(
+            "✕",
+            key=delete_key,
+            help="목표 삭제",
+            on_click=remove_goal,
+            args=(int(goal.id), goal.title),
+        )
 
-    # 해당 날짜의 회고 표시
-    st.subheader(f"{selected_date.strftime('%Y년 %m월 %d일')}의 회고")
-    reflections = get_posts("reflection")
-    day_reflection = (
-        reflections.query("reflection_date == @selected_date").iloc[0]
+
+def show_complete_goal(prefix, goal):
+    """완료된 목표 한 줄을 표시하는 함수"""
+    unique_key = f"{prefix}_complete_{goal.id}_{goal.Index}"
+    if st.button(f"✅ {goal.title} ({goal.time_str})", key=unique_key):
+        st.session_state.selected_goal_id = int(goal.id)
+        st.switch_page("pages/3_goal_detail.py")
+
+
+def current_page(goals, key):
+    """목표가 많으면 GOALS_PER_PAGE개씩 나누고 선택한 페이지의 목표만 반환하는 함수"""
+    page_total = (len(goals) - 1) // GOALS_PER_PAGE + 1
+    page = 1
+    if page_total > 1:
+        page = st.number_input(
+            f"페이지 (전체 {len(goals)}개)",
+            min_value=1,
+            max_value=page_total,
+            value=1,
+            key=key,
+        )
+    return goals.iloc[(page - 1) * GOALS_PER_PAGE : page * GOALS_PER_PAGE]
+
+
+def show_goal_columns(prefix, goals):
+    """진행 중/완료 목표를 두 열로 나누어 현재 페이지만 표시하는 함수"""
+    col1, col2 = st.columns(2)
+
+    # 진행 중인 목표
+    with col1:
+        st.subheader("진행 중인 목표")
+        incomplete_goals = goals[goals["status"] != "완료"]
+        if incomplete_goals.empty:
+            st.info("진행 중인 목표가 없습니다.")
+        else:
+            page_goals = current_page(incomplete_goals, f"{prefix}_incomplete_page")
+            page_goals = page_goals.assign(time_str=time_range_labels(page_goals))
+            for goal in page_goals.itertuples():
+                show_incomplete_goal(prefix, goal)
+
+    # 완료된 목표
+    with col2:
+        st.subheader("완료된 목표")
+        complete_goals = goals[goals["status"] == "완료"]
+        if complete_goals.empty:
+            st.info("완료된 목표가 없습니다.")
+        else:
+            page_goals = current_page(complete_goals, f"{prefix}_complete_page")
+            page_goals = page_goals.assign(time_str=time_range_labels(page_goals))
+            for goal in page_goals.itertuples():
+                show_complete_goal(prefix, goal)
+
+
+def show_reflection(reflections, target_date, title, key_suffix, empty_message):
+    """해당 날짜의 회고(또는 작성 버튼)를 표시하는 함수"""
+    st.subheader(title)
+    day_reflections = (
+        reflections.query("reflection_date == @target_date")
         if not reflections.empty
-        and not reflections.query("reflection_date == @selected_date").empty
-        else None
+        else reflections
     )
 
-    if day_reflection is not None:
-        col1, col2 = st.columns([6, 1])
+    col1, col2 = st.columns([6, 1])
+    if not day_reflections.empty:
+        reflection = day_reflections.iloc[0]
         with col1:
-            st.markdown(f"### {day_reflection['title']}")
-            st.markdown(day_reflection["content"])
+            st.markdown(f"### {reflection['title']}")
+            st.markdown(reflection["content"])
         with col2:
-            if st.button("✏️", key=f"edit_reflection_{selected_date}"):
+            if st.button("✏️", key=f"edit_reflection_{key_suffix}"):
                 st.query_params["mode"] = "edit"
-                st.query_params["post_id"] = str(day_reflection["id"])
+                st.query_params["post_id"] = str(reflection["id"])
                 st.switch_page("pages/10_reflection_board.py")
     else:
-        col1, col2 = st.columns([6, 1])
         with col1:
-            st.info("이 날의 회고가 없습니다.")
+            st.info(empty_message)
         with col2:
-            if st.button("✏️ 작성", key=f"write_reflection_{selected_date}"):
+            if st.button("✏️ 작성", key=f"write_reflection_{key_suffix}"):
                 st.query_params["mode"] = "write"
                 st.switch_page("pages/10_reflection_board.py")
 
 
+@traced(kind="render")
+def show_goals_by_date(selected_date, goals_df, reflections):
+    """선택된 날짜의 목표들을 표시하는 함수"""
+    # 선택된 날짜의 목표들 필터링
+    day_goals = goals_df[
+        (pd.to_datetime(goals_df["start_date"]).dt.date <= selected_date)
+        & (pd.to_datetime(goals_df["end_date"]).dt.date >= selected_date)
+    ]
+
+    if day_goals.empty:
+        st.info(
+            f"{selected_date.strftime('%Y년 %m월 %d일')}에 해당하는 목표가 없습니다."
+        )
+    else:
+        show_goal_columns("date", day_goals)
+
+    # 해당 날짜의 회고 표시
+    show_reflection(
+        reflections,
+        selected_date,
+        f"{selected_date.strftime('%Y년 %m월 %d일')}의 회고",
+        selected_date,
+        "이 날의 회고가 없습니다.",
+    )
+
+
+@st.fragment
+def show_goal_periods(category_id, reflections):
+    """선택한 기간의 목표만 표시하는 함수
+
+    선택하지 않은 기간의 목표는 위젯을 만들지 않는다. 기간을 바꾸거나 목표를
+    완료·삭제하면 페이지 전체가 아니라 이 영역만 다시 실행된다.
+    """
+    goals_df = get_goal_snapshot()
+    if goals_df.empty:
+        st.info(
+            "등록된 목표가 없습니다. '새 목표 추가'에서 목표를 추가해보세요!"
+        )
+        return
+
+    period = st.radio(
+        "기간",
+        PERIODS + ["전체"],
+        horizontal=True,
+        key="goal_period",
+        label_visibility="collapsed",
+    )
+
+    # 전체: 날짜별 목표 보기
+    if period == "전체":
+        st.subheader("날짜별 목표 보기")
+        selected_date = st.date_input(
+            "날짜 선택",
+            value=datetime.now(pytz.timezone("Asia/Seoul")).date(),
+            help="목표를 확인할 날짜를 선택하세요",
+        )
+        show_goals_by_date(selected_date, goals_df, reflections)
+        return
+
+    current_time = pd.Timestamp.now(tz=pytz.timezone("Asia/Seoul"))
+    period_goals = filter_goals_for_period(goals_df, period, current_time)
+
+    # 카테고리 필터링
+    if category_id is not None:
+        period_goals = period_goals[period_goals["category_id"] == category_id]
+
+    if period_goals.empty:
+        st.info(f"{period}의 목표가 없습니다.")
+        return
+
+    show_bulk_actions(period_goals, f"bulk_{period}")
+    show_goal_columns(period, period_goals)
+
+    # 오늘에만 회고 섹션 추가
+    if period == "오늘":
+        show_reflection(
+            reflections,
+            current_time.date(),
+            "오늘의 회고",
+            "today",
+            "오늘의 회고가 없습니다.",
+        )
+
+
 # 메인 로직
 def main():
     # 인증 초기화
@@ -168,12 +273,11 @@ def main():
 
     # 세션 상태 정리
     st.session_state.pop("current_goal_id", None)
-    st.session_state.pop("goals_df", None)
 
     st.title("진행중/완료 목표 목록")
 
-    # 전체 목표 데이터 가져오기
-    goals_df = get_goals()
+    # 전체 목표 데이터 (세션 스냅샷, 처음 들어올 때만 DB에서 조회)
+    goals_df = get_goal_snapshot()
 
     if goals_df.empty:
         st.info(
@@ -182,254 +286,14 @@ def main():
         return
 
     # 카테고리 필터
-    categories_df = get_categories()
-    category_options = ["전체"] + categories_df["name"].tolist()
-    selected_category = st.selectbox("카테고리 필터", category_options)
+    categories = get_category_map()
+    selected_category = st.selectbox("카테고리 필터", ["전체"] + categories.options())
+    category_id = categories.id(selected_category)
 
-    # 필터링된 데이터프레임 생성
-    current_time = pd.Timestamp.now(tz=pytz.timezone("Asia/Seoul"))
-
-    # 각 기간별 필터링된 데이터프레임 생성
-    filtered_dfs = {
-        "오늘": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                == current_time.date()
-            )
-            | (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                == current_time.date()
-            )
-            | (
-                (pd.to_datetime(goals_df["start_date"]) <= current_time)
-                & (pd.to_datetime(goals_df["end_date"]) >= current_time)
-            )
-        ],
-        "내일": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                == (current_time + timedelta(days=1)).date()
-            )
-            | (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                == (current_time + timedelta(days=1)).date()
-            )
-        ],
-        "2일 후": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                == (current_time + timedelta(days=2)).date()
-            )
-            | (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                == (current_time + timedelta(days=2)).date()
-            )
-        ],
-        "3일 후": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                == (current_time + timedelta(days=3)).date()
-            )
-            | (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                == (current_time + timedelta(days=3)).date()
-            )
-        ],
-        "1주": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                <= (current_time + timedelta(days=7)).date()
-            )
-            & (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                >= current_time.date()
-            )
-        ],
-        "1개월": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                <= (current_time + timedelta(days=30)).date()
-            )
-            & (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                >= current_time.date()
-            )
-        ],
-        "1년": goals_df[
-            (
-                pd.to_datetime(goals_df["start_date"]).dt.date
-                <= (current_time + timedelta(days=365)).date()
-            )
-            & (
-                pd.to_datetime(goals_df["end_date"]).dt.date
-                >= current_time.date()
-            )
-        ],
-    }
-
-    # 카테고리 필터링
-    if selected_category != "전체":
-        category_id = categories_df[
-            categories_df["name"] == selected_category
-        ].iloc[0]["id"]
-        filtered_dfs = {
-            period: df[df["category_id"] == category_id]
-            for period, df in filtered_dfs.items()
-        }
-
-    # 탭 생성 및 표시
-    tabs = st.tabs(
-        ["오늘", "내일", "2일 후", "3일 후", "1주", "1개월", "1년", "전체"]
-    )
+    # 회고는 한 번만 조회해 오늘과 전체 보기에서 함께 사용
+    reflections = get_posts("reflection")
 
-    # 각 탭의 내용 표시
-    for tab, (period, filtered_df) in zip(tabs[:-1], filtered_dfs.items()):
-        with tab:
-            if filtered_df.empty:
-                st.info(f"{period}의 목표가 없습니다.")
-            else:
-                col1, col2 = st.columns(2)
-
-                # 진행 중인 목표
-                with col1:
-                    st.subheader("진행 중인 목표")
-                    incomplete_goals = filtered_df[
-                        filtered_df["status"] != "완료"
-                    ]
-                    if incomplete_goals.empty:
-                        st.info("진행 중인 목표가 없습니다.")
-                    else:
-                        for idx, goal in incomplete_goals.iterrows():
-                            start_datetime = pd.to_datetime(goal["start_date"])
-                            end_datetime = pd.to_datetime(goal["end_date"])
-
-                            start_time_str = format_time(start_datetime)
-                            end_time_str = format_time(end_datetime)
-                            time_str = f"{start_time_str} - {end_time_str}"
-
-                            goal_col1, goal_col2, goal_col3 = st.columns(
-                                [6, 1, 1]
-                            )
-
-                            with goal_col1:
-                                unique_key = (
-                                    f"{period}_incomplete_{goal['id']}_{idx}"
-                                )
-                                if st.button(
-                                    f"📌 {goal['title']} ({time_str})",
-                                    key=unique_key,
-                                ):
-                                    st.session_state.selected_goal_id = int(
-                                        goal["id"]
-                                    )
-                                    st.switch_page("pages/3_goal_detail.py")
-
-                            with goal_col2:
-                                complete_key = (
-                                    f"complete_{period}_{goal['id']}_{idx}"
-                                )
-                                if st.button(
-                                    "✅", key=complete_key, help="목표 완료"
-                                ):
-                                    update_goal(goal["id"], status="완료")
-                                    st.success(
-                                        f"'{goal['title']}' 목표가 완료되었습니다."
-                                    )
-                                    st.rerun()
-
-                            with goal_col3:
-                                delete_key = (
-                                    f"delete_{period}_{goal['id']}_{idx}"
-                                )
-                                if st.button(
-                                    "✕", key=delete_key, help="목표 삭제"
-                                ):
-                                    if delete_goal(goal["id"]):
-                                        st.success(
-                                            f"'{goal['title']}' 목표가 삭제되었습니다."
-                                        )
-                                        st.rerun()
-                                    else:
-                                        st.error(
-                                            "목표 삭제 중 오류가 발생했습니다."
-                                        )
-
-                # 완료된 목표
-                with col2:
-                    st.subheader("완료된 목표")
-                    complete_goals = filtered_df[
-                        filtered_df["status"] == "완료"
-                    ]
-                    if complete_goals.empty:
-                        st.info("완료된 목표가 없습니다.")
-                    else:
-                        for idx, goal in complete_goals.iterrows():
-                            start_datetime = pd.to_datetime(goal["start_date"])
-                            end_datetime = pd.to_datetime(goal["end_date"])
-
-                            start_time_str = format_time(start_datetime)
-                            end_time_str = format_time(end_datetime)
-                            time_str = f"{start_time_str} - {end_time_str}"
-
-                            unique_key = (
-                                f"{period}_complete_{goal['id']}_{idx}"
-                            )
-                            if st.button(
-                                f"✅ {goal['title']} ({time_str})",
-                                key=unique_key,
-                            ):
-                                st.session_state.selected_goal_id = int(
-                                    goal["id"]
-                                )
-                                st.switch_page("pages/3_goal_detail.py")
-
-                # 오늘 탭에만 회고 섹션 추가
-                if period == "오늘":
-                    st.subheader(f"오늘의 회고")
-                    reflections = get_posts("reflection")
-                    today_reflection = (
-                        reflections.query(
-                            "reflection_date == @current_time.date()"
-                        ).iloc[0]
-                        if not reflections.empty
-                        and not reflections.query(
-                            "reflection_date == @current_time.date()"
-                        ).empty
-                        else None
-                    )
-
-                    if today_reflection is not None:
-                        col1, col2 = st.columns([6, 1])
-                        with col1:
-                            st.markdown(f"### {today_reflection['title']}")
-                            st.markdown(today_reflection["content"])
-                        with col2:
-                            if st.button("✏️", key=f"edit_reflection_today"):
-                                st.query_params["mode"] = "edit"
-                                st.query_params["post_id"] = str(
-                                    today_reflection["id"]
-                                )
-                                st.switch_page("pages/10_reflection_board.py")
-                    else:
-                        col1, col2 = st.columns([6, 1])
-                        with col1:
-                            st.info("오늘의 회고가 없습니다.")
-                        with col2:
-                            if st.button(
-                                "✏️ 작성", key=f"write_reflection_today"
-                            ):
-                                st.query_params["mode"] = "write"
-                                st.switch_page("pages/10_reflection_board.py")
-
-    # 전체 탭
-    with tabs[-1]:
-        st.subheader("날짜별 목표 보기")
-        selected_date = st.date_input(
-            "날짜 선택",
-            value=datetime.now(pytz.timezone("Asia/Seoul")).date(),
-            help="목표를 확인할 날짜를 선택하세요",
-        )
-        show_goals_by_date(selected_date, goals_df)
+    show_goal_periods(category_id, reflections)
 
 
 if __name__ == "__main__":
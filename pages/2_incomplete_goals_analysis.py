@@ -21,12 +21,13 @@ st.markdown(
 )
 from datetime import datetime, timedelta
 import pandas as pd
-import openai
-from database import get_goals, get_goal_analysis, add_goal_analysis
-from config import OPENAI_API_KEY
+from database import get_goal_analyses, add_goal_analysis
 from utils.llm_utils import LLMFactory, StreamHandler
 import uuid
-from utils.session_utils import clear_goal_session
+from utils.goal_store import get_goal_snapshot
+from utils.category_cache import get_category_map
+from utils.goal_analytics import get_goal_analytics, analytics_summary
+from utils.goal_actions import show_bulk_actions
 from utils.auth_utils import login_required, init_auth
 from utils.menu_utils import show_menu  # 추가
 import pytz
@@ -36,8 +37,8 @@ import pytz
 # 메뉴 표시 추가
 show_menu()
 
-# 페이지 진입 시 세션 정리
-clear_goal_session()
+# 페이지 진입 시 세션 정리 (목표 스냅샷은 메뉴 이동 시 정리되므로 유지)
+st.session_state.pop("current_goal_id", None)
 
 # 인증 초기화
 init_auth()
@@ -51,11 +52,67 @@ if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
 
 # 전체 목표 데이터 가져오기
-goals_df = get_goals()
+goals_df = get_goal_snapshot()
+
+
+def show_goal_statistics(analytics, category_names):
+    """완료율·추세·반복 목표 연속 기록을 보여주는 함수"""
+    st.subheader("📈 목표 통계")
+    overview = analytics["overview"]
+    timing = analytics["timing"]
+
+    def percent(value):
+        return "-" if value is None else f"{value:.0%}"
+
+    delta = None
+    if overview["rate_7d"] is not None and overview["prev_rate_7d"] is not None:
+        delta = f"{(overview['rate_7d'] - overview['prev_rate_7d']) * 100:+.0f}%p"
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("전체 완료율", percent(overview["rate"]), help="마감이 지난 목표 기준")
+    col2.metric("최근 7일 완료율", percent(overview["rate_7d"]), delta=delta)
+    col3.metric("최근 30일 완료율", percent(overview["rate_30d"]))
+    col4.metric(
+        "제때 완료",
+        f"{timing['on_time']} / {timing['on_time'] + timing['late']}",
+        help="완료 시각이 기록된 목표 중 종료일 전에 완료한 목표 수",
+    )
+
+    left, right = st.columns(2)
+    with left:
+        st.caption("카테고리별 완료율")
+        categories = analytics["categories"].assign(
+            카테고리=lambda df: df["category_id"].map(category_names).fillna("미분류")
+        )
+        st.bar_chart(categories.set_index("카테고리")[["rate", "weighted_rate"]].rename(
+            columns={"rate": "완료율", "weighted_rate": "중요도 가중"}
+        ))
+    with right:
+        st.caption("완료율 추세 (이동 평균)")
+        st.line_chart(analytics["trend"][["rate_7d", "rate_30d"]].rename(
+            columns={"rate_7d": "7일", "rate_30d": "30일"}
+        ))
+
+    streaks = analytics["streaks"]
+    if not streaks.empty:
+        st.caption("반복 목표 연속 완료")
+        st.dataframe(
+            streaks.rename(columns={
+                "title": "목표", "occurrences": "횟수", "completed": "완료",
+                "current": "현재 연속", "best": "최고 연속",
+            }),
+            hide_index=True,
+            use_container_width=True,
+        )
+
 
 if goals_df.empty:
     st.info("등록된 목표가 없습니다.")
 else:
+    category_names = get_category_map().names
+    analytics = get_goal_analytics()
+    show_goal_statistics(analytics, category_names)
+
     current_time = pd.Timestamp.now(tz=pytz.timezone('Asia/Seoul'))
 
     # 각 기간별 미달성 목표 필터링
@@ -87,6 +144,15 @@ else:
         ].sort_values(by='start_date', ascending=False),
     }
 
+    # 탭마다 조회하지 않도록 기간별 기존 분석 결과를 한 번에 조회
+    analyses = get_goal_analyses(
+        {
+            period: filtered_df.nlargest(3, "importance").index.tolist()
+            for period, filtered_df in filtered_dfs.items()
+            if not filtered_df.empty
+        }
+    )
+
     tabs = st.tabs(list(filtered_dfs.keys()))
 
     for tab, (period, filtered_df) in zip(tabs, filtered_dfs.items()):
@@ -95,6 +161,7 @@ else:
                 st.info(f"{period}에 미달성된 목표가 없습니다.")
             else:
                 st.subheader(f"{period} 미달성 목표")
+                show_bulk_actions(filtered_df, f"bulk_{period}")
                 for idx, goal in filtered_df.iterrows():
                     start_date = pd.to_datetime(goal["start_date"]).strftime(
                         "%Y-%m-%d"
@@ -121,7 +188,7 @@ else:
                     goal_ids = important_goals.index.tolist()
 
                     # 기존 분석 결과 인
-                    existing_analysis = get_goal_analysis(period, goal_ids)
+                    existing_analysis = analyses.get(period)
 
                     # GPT 메시지 제목과 재생성 버튼을 나란히 배치
                     col1, col2 = st.columns([3, 1])
@@ -147,7 +214,10 @@ else:
                         user_prompt = f"""다음은 달성하지 못한 소중한 목표들이에요:\n{goals_text}\n
                         이 목표들이 이뤄졌다면 어떤 멋진 변화들이 있었을지, 
                         마치 친한 고객님에게 이야기하듯이 따뜻하게 이야기해주세요.
-                        구체적인 상황과 감정을 상상하면서, 앞으로의 가능성도 함께 이야기해주세요."""
+                        구체적인 상황과 감정을 상상하면서, 앞으로의 가능성도 함께 이야기해주세요.
+
+                        참고로 최근 목표 달성 현황은 다음과 같아요:
+{analytics_summary(analytics, category_names)}"""
 
                         # StreamHandler 초기화
                         chat_container = st.empty()
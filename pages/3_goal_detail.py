@@ -21,11 +21,12 @@ st.markdown(
     unsafe_allow_html=True,
 )
 from datetime import datetime
-from database import get_goals, update_goal, add_goal, get_categories
+from database import get_goal, update_goal, add_goal
 from config import GOAL_STATUS, IMPORTANCE_LEVELS
 import pandas as pd
 from utils.auth_utils import login_required, init_auth
 from utils.menu_utils import show_menu  # 추가
+from utils.category_cache import get_category_map
 import pytz
 
 
@@ -38,10 +39,6 @@ init_auth()
 # 로그인 체크
 login_required()
 
-# 전체 목표 데이터 먼저 가져오기
-if "goals_df" not in st.session_state:
-    st.session_state.goals_df = get_goals()
-
 # goal_id 가져오는 부분
 if (
     "current_goal_id" not in st.session_state
@@ -56,13 +53,10 @@ goal_id = st.session_state.get("current_goal_id")
 goal = None
 if goal_id:
     try:
-        # id로 목표 찾기
-        filtered_goals = st.session_state.goals_df[
-            st.session_state.goals_df["id"].astype(int) == goal_id
-        ]
+        # 기본 키와 user_id로 목표 한 건만 조회
+        goal = get_goal(goal_id)
 
-        if not filtered_goals.empty:
-            goal = filtered_goals.iloc[0]
+        if goal is not None:
             st.title(f"목표 상세: {goal['title']}")
         else:
             st.error(f"해당 목표를 찾을 수 없습니다. (ID: {goal_id})")
@@ -105,121 +99,118 @@ def format_datetime_for_display(dt):
     return dt.strftime("%H:%M")
 
 
-# 입력 필드
-title = st.text_input("목표", value=goal["title"] if goal is not None else "")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    default_start = datetime.now(pytz.timezone("Asia/Seoul"))
-    start_date = st.date_input(
-        "시작일",
+# 입력 필드 (폼 안의 입력은 저장을 누를 때만 다시 실행됨)
+with st.form("goal_form"):
+    title = st.text_input("목표", value=goal["title"] if goal is not None else "")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        default_start = datetime.now(pytz.timezone("Asia/Seoul"))
+        start_date = st.date_input(
+            "시작일",
+            value=(
+                pd.to_datetime(goal["start_date"]).date()
+                if goal is not None and pd.notnull(goal["start_date"])
+                else default_start.date()
+            ),
+        )
+
+        start_time_str = st.text_input(
+            "시작 시간",
+            value=(
+                format_datetime_for_display(pd.to_datetime(goal["start_date"]))
+                if goal is not None and pd.notnull(goal["start_date"])
+                else default_start.strftime("%H:%M")
+            ),
+            help="24시간 형식으로 입력해주세요 (예: 14:30)",
+        )
+
+    with col2:
+        default_end = datetime.now(pytz.timezone("Asia/Seoul"))
+        end_date = st.date_input(
+            "종료일",
+            value=(
+                pd.to_datetime(goal["end_date"]).date()
+                if goal is not None and pd.notnull(goal["end_date"])
+                else default_end.date()
+            ),
+        )
+
+        end_time_str = st.text_input(
+            "종료 시간",
+            value=(
+                format_datetime_for_display(pd.to_datetime(goal["end_date"]))
+                if goal is not None and pd.notnull(goal["end_date"])
+                else default_end.strftime("%H:%M")
+            ),
+            help="24시간 형식으로 입력해주세요 (예: 14:30)",
+        )
+
+    trigger_action = st.text_input(
+        "트리거(원인과 결과)",
         value=(
-            pd.to_datetime(goal["start_date"]).date()
-            if goal is not None and pd.notnull(goal["start_date"])
-            else default_start.date()
+            goal["trigger_action"]
+            if goal is not None and pd.notnull(goal["trigger_action"])
+            else ""
         ),
     )
 
-    start_time_str = st.text_input(
-        "시작 시간",
-        value=(
-            format_datetime_for_display(pd.to_datetime(goal["start_date"]))
-            if goal is not None and pd.notnull(goal["start_date"])
-            else default_start.strftime("%H:%M")
+    importance = st.selectbox(
+        "중요도",
+        IMPORTANCE_LEVELS,
+        index=(
+            IMPORTANCE_LEVELS.index(goal["importance"])
+            if goal is not None
+            and pd.notnull(goal["importance"])
+            and goal["importance"] in IMPORTANCE_LEVELS
+            else 4
         ),
-        help="24시간 형식으로 입력해주세요 (예: 14:30)",
     )
 
-with col2:
-    default_end = datetime.now(pytz.timezone("Asia/Seoul"))
-    end_date = st.date_input(
-        "종료일",
+    memo = st.text_area(
+        "메모",
         value=(
-            pd.to_datetime(goal["end_date"]).date()
-            if goal is not None and pd.notnull(goal["end_date"])
-            else default_end.date()
+            goal["memo"] if goal is not None and pd.notnull(goal["memo"]) else ""
         ),
     )
 
-    end_time_str = st.text_input(
-        "종료 시간",
-        value=(
-            format_datetime_for_display(pd.to_datetime(goal["end_date"]))
-            if goal is not None and pd.notnull(goal["end_date"])
-            else default_end.strftime("%H:%M")
+    status = st.selectbox(
+        "상태",
+        GOAL_STATUS,
+        index=(
+            GOAL_STATUS.index(goal["status"])
+            if goal is not None
+            and pd.notnull(goal["status"])
+            and goal["status"] in GOAL_STATUS
+            else 0
         ),
-        help="24시간 형식으로 입력해주세요 (예: 14:30)",
     )
 
-trigger_action = st.text_input(
-    "트리거(원인과 결과)",
-    value=(
-        goal["trigger_action"]
-        if goal is not None and pd.notnull(goal["trigger_action"])
-        else ""
-    ),
-)
-
-importance = st.selectbox(
-    "중요도",
-    IMPORTANCE_LEVELS,
-    index=(
-        IMPORTANCE_LEVELS.index(goal["importance"])
-        if goal is not None
-        and pd.notnull(goal["importance"])
-        and goal["importance"] in IMPORTANCE_LEVELS
-        else 4
-    ),
-)
-
-memo = st.text_area(
-    "메모",
-    value=(
-        goal["memo"] if goal is not None and pd.notnull(goal["memo"]) else ""
-    ),
-)
-
-status = st.selectbox(
-    "상태",
-    GOAL_STATUS,
-    index=(
-        GOAL_STATUS.index(goal["status"])
-        if goal is not None
-        and pd.notnull(goal["status"])
-        and goal["status"] in GOAL_STATUS
-        else 0
-    ),
-)
-
-# 카테고리 선택
-categories_df = get_categories()
-category_options = ["전체"] + categories_df["name"].tolist()
+    # 카테고리 선택
+    categories = get_category_map()
+    category_options = ["전체"] + categories.options()
 
-# 현재 선택된 카테고리 찾기
-current_category_index = 0
-if goal is not None and pd.notnull(goal["category_id"]):
-    category_match = categories_df[categories_df["id"] == goal["category_id"]]
-    if not category_match.empty:
-        category_name = category_match.iloc[0]["name"]
+    # 현재 선택된 카테고리 찾기
+    current_category_index = 0
+    if goal is not None:
+        category_name = categories.name(goal["category_id"], None)
         if category_name in category_options:
             current_category_index = category_options.index(category_name)
 
-selected_category = st.selectbox(
-    "카테고리", category_options, index=current_category_index
-)
+    selected_category = st.selectbox(
+        "카테고리", category_options, index=current_category_index
+    )
 
-# 선택된 카테고리의 ID 찾기
-category_id = None
-if selected_category != "전체":
-    category_match = categories_df[categories_df["name"] == selected_category]
-    if not category_match.empty:
-        category_id = category_match.iloc[0]["id"]
+    # 선택된 카테고리의 ID 찾기
+    category_id = categories.id(selected_category)
 
-if end_date < start_date:
-    st.error("종료일은 시작일보다 늦어야 합니다.")
-else:
-    if st.button("저장"):
+    submitted = st.form_submit_button("저장")
+
+if submitted:
+    if end_date < start_date:
+        st.error("종료일은 시작일보다 늦어야 합니다.")
+    else:
         try:
             # 시작 시간과 종료 시간 생성
             start_datetime = get_local_datetime(start_date, start_time_str)
@@ -230,8 +221,10 @@ else:
             elif end_datetime < start_datetime:
                 st.error("종료일시는 시작일시보다 늦어야 합니다.")
             else:
+                saved = True
                 if goal_id:
-                    update_goal(
+                    # 다른 곳에서 삭제되었거나 다른 사용자의 목표면 False
+                    saved = update_goal(
                         int(goal_id),
                         title=title,
                         start_date=start_datetime,
@@ -253,10 +246,12 @@ else:
                         status,
                         category_id,
                     )
-                st.success("저장되었습니다!")
-                st.session_state.pop("current_goal_id", None)
-                st.session_state.pop("goals_df", None)
-                st.query_params.clear()
-                st.switch_page("pages/1_goal_list.py")
+                if saved:
+                    st.success("저장되었습니다!")
+                    st.session_state.pop("current_goal_id", None)
+                    st.query_params.clear()
+                    st.switch_page("pages/1_goal_list.py")
+                else:
+                    st.error("이미 삭제되었거나 찾을 수 없는 목표입니다.")
         except Exception as e:
             st.error(f"저장 중 오류가 발생했습니다: {str(e)}")
@@ -21,12 +21,12 @@ st.markdown(
 )
 
 from database import (
-    get_categories,
     add_category,
     update_category,
     delete_category,
 )
 from utils.session_utils import clear_goal_session
+from utils.category_cache import get_category_map
 from utils.auth_utils import login_required, init_auth
 from utils.menu_utils import show_menu  # 추가
 
@@ -50,30 +50,30 @@ with st.form("new_category"):
             st.error(f"카테고리 추가 중 오류가 발생했습니다: {str(e)}")
 
 # 카테고리 목록 표시
-categories_df = get_categories()
-if not categories_df.empty:
+categories = get_category_map().names
+if categories:
     st.subheader("카테고리 목록")
-    for idx, category in categories_df.iterrows():
+    for category_id, name in categories.items():
         col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
-            st.text(category["name"])
+            st.text(name)
         with col2:
-            if st.button("수정", key=f"edit_{category['id']}"):
-                st.session_state[f"edit_mode_{category['id']}"] = True
+            if st.button("수정", key=f"edit_{category_id}"):
+                st.session_state[f"edit_mode_{category_id}"] = True
         with col3:
-            if st.button("삭제", key=f"delete_{category['id']}"):
-                delete_category(category["id"])
-                st.success(f"카테고리 '{category['name']}'가 삭제되었습니다!")
+            if st.button("삭제", key=f"delete_{category_id}"):
+                delete_category(category_id)
+                st.success(f"카테고리 '{name}'가 삭제되었습니다!")
                 st.rerun()
 
         # 수정 모드
-        if st.session_state.get(f"edit_mode_{category['id']}", False):
-            with st.form(f"edit_category_{category['id']}"):
-                new_name = st.text_input("새 이름", value=category["name"])
+        if st.session_state.get(f"edit_mode_{category_id}", False):
+            with st.form(f"edit_category_{category_id}"):
+                new_name = st.text_input("새 이름", value=name)
                 if st.form_submit_button("저장"):
-                    update_category(category["id"], new_name)
+                    update_category(category_id, new_name)
                     st.success("카테고리가 수정되었습니다!")
-                    st.session_state[f"edit_mode_{category['id']}"] = False
+                    st.session_state[f"edit_mode_{category_id}"] = False
                     st.rerun()
 else:
     st.info("등록된 카테고리가 없습니다.")
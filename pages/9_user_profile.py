@@ -21,7 +21,11 @@ st.markdown(
 )
 
 
-from database import update_user_profile, get_user_profile
+import os
+import tempfile
+from database import update_user_profile
+from utils.profile_cache import get_cached_profile
+from utils.data_transfer import EXPORT_FORMATS, IMPORT_DATASETS, IMPORT_FORMATS, export_data, import_data
 from utils.session_utils import clear_goal_session
 from utils.auth_utils import login_required, init_auth
 from utils.menu_utils import show_menu  # 추가
@@ -43,7 +47,7 @@ show_menu()
 st.title("프로필 관리")
 
 # 현재 프로필 정보 가져오기
-current_profile = get_user_profile()
+current_profile = get_cached_profile()
 
 # 프로필 입력 폼
 with st.form("profile_form"):
@@ -90,3 +94,62 @@ if content:
             st.markdown("---")
             st.markdown("**AI 컨설턴트 스타일:**")
             st.markdown(consultant_style)
+
+st.markdown("---")
+st.subheader("데이터 내보내기 / 가져오기")
+
+DATASET_LABELS = {"goals": "목표", "posts": "게시글", "links": "링크", "chat": "AI 대화"}
+
+export_col, import_col = st.columns(2)
+
+with export_col:
+    export_dataset = st.selectbox(
+        "내보낼 데이터", list(DATASET_LABELS), format_func=DATASET_LABELS.get, key="export_dataset"
+    )
+    formats = EXPORT_FORMATS if export_dataset == "goals" else [f for f in EXPORT_FORMATS if f != "ics"]
+    export_format = st.selectbox("형식", formats, key="export_format")
+    if st.button("내보내기 파일 만들기"):
+        # DB에서 청크 단위로 읽어 임시 파일에 씀 (다운로드 버튼은 완성된 파일을 전달)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{export_format}") as f:
+            try:
+                count = export_data(export_dataset, export_format, f)
+            except Exception as e:
+                st.error(f"내보내기 중 오류가 발생했습니다: {str(e)}")
+                count = None
+        previous = st.session_state.get("export_file")
+        if previous and os.path.exists(previous["path"]):
+            os.remove(previous["path"])
+        if count is None:
+            os.remove(f.name)
+            st.session_state.pop("export_file", None)
+        else:
+            st.session_state.export_file = {
+                "path": f.name,
+                "name": f"{export_dataset}.{export_format}",
+                "count": count,
+            }
+
+    export_file = st.session_state.get("export_file")
+    if export_file and os.path.exists(export_file["path"]):
+        with open(export_file["path"], "rb") as f:
+            st.download_button(
+                f"{export_file['name']} 다운로드 ({export_file['count']}행)",
+                data=f,
+                file_name=export_file["name"],
+            )
+
+with import_col:
+    import_dataset = st.selectbox(
+        "가져올 데이터", IMPORT_DATASETS, format_func=DATASET_LABELS.get, key="import_dataset"
+    )
+    uploaded = st.file_uploader("파일 (csv, jsonl, parquet)", type=IMPORT_FORMATS, key="import_file")
+    if uploaded is not None and st.button("가져오기"):
+        try:
+            result = import_data(import_dataset, uploaded.name.rsplit(".", 1)[-1].lower(), uploaded)
+            st.success(f"{result['imported']}행을 가져왔습니다. ({result['rejected']}행 건너뜀)")
+            if result["errors"]:
+                with st.expander("건너뛴 행"):
+                    for row_number, reason in result["errors"]:
+                        st.write(f"{row_number}행: {reason}")
+        except Exception as e:
+            st.error(f"가져오기 중 오류가 발생했습니다: {str(e)}")
@@ -4,10 +4,21 @@ from functools import wraps
 from database import get_user_by_credentials, update_last_login, get_user_by_id, update_session, delete_session
 from datetime import datetime, timedelta
 import secrets
+import os
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from streamlit_cookies_controller import CookieController
+from config import get_settings
+from utils.tracing import start_rerun
+from utils.query_stats import begin_unit
 
-# 전역 쿠키 컨트롤러 인스턴스 생성
-cookie_manager = CookieController()
+def _cookie_manager() -> CookieController:
+    """현재 세션의 쿠키 컨트롤러를 반환하는 함수
+
+    컨트롤러는 쿠키를 인스턴스에 보관하므로 모듈 전역으로 만들면 모든 세션이
+    처음 접속한 사용자의 쿠키를 함께 쓰게 된다. 쿠키 값은 세션 상태('cookies')에
+    저장되므로 rerun마다 새로 만들어도 브라우저에서 다시 읽지 않는다.
+    """
+    return CookieController()
 
 def hash_password(password: str) -> str:
     """비밀번호 해싱"""
@@ -43,6 +54,7 @@ def login(email: str, password: str) -> bool:
         st.session_state.email = user['email']
         
         # 쿠키에 세션 정보 저장
+        cookie_manager = _cookie_manager()
         cookie_manager.set('session_token', token)
         cookie_manager.set('user_id', str(user['id']))
         
@@ -58,13 +70,37 @@ def logout():
         delete_session(st.session_state.session_token)
     
     # 쿠키에서 세션 정보 삭제 (max_age=0으로 설정하여 즉시 만료)
+    cookie_manager = _cookie_manager()
     cookie_manager.set('session_token', '', max_age=0)
     cookie_manager.set('user_id', '', max_age=0)
     
     clear_auth_state()
 
+def _current_page(ctx) -> str:
+    """현재 실행 중인 페이지 스크립트 파일명 (ScriptRunContext가 없으면 "unknown")"""
+    if ctx is None:
+        return "unknown"
+    page = ctx.pages_manager.get_pages().get(ctx.page_script_hash)
+    script_path = page["script_path"] if page else ctx.main_script_path
+    return os.path.basename(script_path)
+
+def _start_rerun_trace():
+    """이번 rerun의 성능 추적을 시작 (샘플링되지 않으면 기록하지 않음)"""
+    ctx = get_script_run_ctx()
+    page = _current_page(ctx)
+    # SQL 실행 통계의 N+1 판단 단위
+    begin_unit(page)
+    start_rerun(
+        page,
+        session_id=ctx.session_id if ctx else None,
+        force=st.session_state.get("trace_debug", False),
+    )
+
+
 def init_auth():
     """인증 관련 세션 상태 초기화"""
+    _start_rerun_trace()
+
     # 인증 상태가 없으면 무조건 False로 초기화
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
@@ -73,6 +109,7 @@ def init_auth():
         st.session_state.session_token = None
         
         # 쿠키에서 세션 토큰 확인
+        cookie_manager = _cookie_manager()
         session_token = cookie_manager.get('session_token')
         user_id = cookie_manager.get('user_id')
         
@@ -116,6 +153,10 @@ def login_required(func=None):
         return decorator
     return decorator(func)
 
+def is_admin() -> bool:
+    """현재 사용자가 관리자(ADMIN_USER_IDS)인지 확인"""
+    return st.session_state.get('user_id') in get_settings().admin_user_ids
+
 def clear_auth_state():
     """인증 상태 초기화"""
     st.session_state.authenticated = False
@@ -1,33 +1,39 @@
 import streamlit as st
-from database import add_post, get_posts, get_post, update_post, delete_post
+from database import add_post, get_post_summaries, get_post, update_post, delete_post, is_image_referenced
 from datetime import datetime
-import os
-from PIL import Image
-import uuid
 import pandas as pd
 import pytz
-
-# 이미지 저장 경로 설정
-UPLOAD_DIR = "uploads"
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
+from utils.image_store import save_image, get_image_for_display, release_image
+from utils.search import search
+from utils.tracing import traced
 
 def save_uploaded_image(uploaded_file):
     """업로드된 이미지를 저장하고 경로를 반환하는 함수"""
-    if uploaded_file is None:
-        return None
-        
-    # 고유한 파일명 생성
-    file_ext = os.path.splitext(uploaded_file.name)[1]
-    file_name = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
-    
-    # 이미지 저장
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-        
-    return file_path
+    # 같은 이미지는 한 번만 저장되고 썸네일도 함께 생성됨
+    return save_image(uploaded_file)
 
+@traced(kind="render")
+def render_search_results(board_type: str) -> bool:
+    """게시판 검색창과 결과를 렌더링하는 함수 (검색어가 있으면 True 반환)"""
+    keyword = st.text_input(
+        "🔍 검색", key=f"search_{board_type}", placeholder="제목이나 내용으로 검색"
+    )
+    if not keyword:
+        return False
+
+    results = search(keyword, entities=["board"], board_type=board_type)
+    if not results:
+        st.info("검색 결과가 없습니다.")
+    for result in results:
+        if st.button(f"📄 {result['title']}", key=f"search_result_{result['id']}"):
+            st.query_params["post_id"] = str(result['id'])
+            st.query_params["mode"] = "view"
+            st.rerun()
+        if result['snippet']:
+            st.caption(result['snippet'])
+    return True
+
+@traced(kind="render")
 def render_post_list(board_type: str, board_title: str):
     """게시글 목록을 렌더링하는 함수"""
     st.title(board_title)
@@ -36,9 +42,13 @@ def render_post_list(board_type: str, board_title: str):
     if st.button("✏️ 새 글 작성"):
         st.query_params["mode"] = "write"
         st.rerun()
+
+    # 검색 중이면 목록 대신 검색 결과 표시
+    if render_search_results(board_type):
+        return
         
     # 게시글 목록 표시
-    posts = get_posts(board_type)
+    posts = get_post_summaries(board_type)
     if posts.empty:
         st.info("등록된 글이 없습니다.")
     else:
@@ -46,12 +56,24 @@ def render_post_list(board_type: str, board_title: str):
             # 수정일이 있으면 수정일을, 없으면 작성일을 표시
             display_date = post['updated_at'].strftime("%Y-%m-%d") if post['updated_at'] else post['created_at'].strftime("%Y-%m-%d")
             
+            # 첨부 이미지가 있으면 목록용 썸네일을 함께 표시
+            thumb_path = get_image_for_display(post['image_path'], "list") if pd.notnull(post['image_path']) else None
+            if thumb_path:
+                col1, col2 = st.columns([1, 11])
+                with col1:
+                    st.image(thumb_path, width=48)
+                button_container = col2
+            else:
+                button_container = st.container()
+
             # 버튼 하에 제목과 날짜를 함께 표시
-            if st.button(f"📄 {post['title']} ({display_date})", key=f"post_{post['id']}"):
-                st.query_params["post_id"] = str(post['id'])
-                st.query_params["mode"] = "view"
-                st.rerun()
+            with button_container:
+                if st.button(f"📄 {post['title']} ({display_date})", key=f"post_{post['id']}"):
+                    st.query_params["post_id"] = str(post['id'])
+                    st.query_params["mode"] = "view"
+                    st.rerun()
 
+@traced(kind="render")
 def render_post_detail(post_id: int, board_type: str):
     """게시글 상세 보기를 렌더링하는 함수"""
     post = get_post(post_id)
@@ -65,9 +87,10 @@ def render_post_detail(post_id: int, board_type: str):
     st.markdown("---")
     st.markdown(post.content)
     
-    # 이미지가 있으면 표시
-    if post.image_path and os.path.exists(post.image_path):
-        st.image(post.image_path, caption="첨부 이미지")
+    # 이미지가 있으면 상세 화면용 크기로 표시
+    display_path = get_image_for_display(post.image_path, "detail")
+    if display_path:
+        st.image(display_path, caption="첨부 이미지")
     
     col1, col2, col3 = st.columns([1, 1, 4])
     with col1:
@@ -77,9 +100,8 @@ def render_post_detail(post_id: int, board_type: str):
     with col2:
         if st.button("삭제"):
             if delete_post(post_id):
-                # 이미지 파일도 삭제
-                if post.image_path and os.path.exists(post.image_path):
-                    os.remove(post.image_path)
+                # 다른 게시글이 쓰지 않는 이미지 파일만 삭제
+                release_image(post.image_path, is_image_referenced)
                 st.success("게시글이 삭제되었습니다.")
                 st.query_params.clear()
                 st.rerun()
@@ -90,6 +112,7 @@ def render_post_detail(post_id: int, board_type: str):
             st.query_params.clear()
             st.rerun()
 
+@traced(kind="render")
 def render_post_form(board_type: str, post_id: int = None):
     """게시글 작성/수정 폼을 렌더링하는 함수"""
     post = get_post(post_id) if post_id else None
@@ -134,17 +157,18 @@ def render_post_form(board_type: str, post_id: int = None):
         help="마크다운 문법을 사용하여 작성할 수 있습니다. 위의 '마크다운 작성 가이드'를 참고하세요."
     )
     
-    # 작성한 내용 미리보기
-    if content:
-        with st.expander("내용 미리보기"):
+    # 작성한 내용 미리보기 (켰을 때만 표시)
+    if content and st.toggle("내용 미리보기", key="show_preview"):
+        with st.container(border=True):
             st.markdown(content)
     
     # 이미지 업로드 필드
     uploaded_file = st.file_uploader("이미지 첨부", type=['png', 'jpg', 'jpeg'])
     
     # 기존 이미지 표시 (수정 모드일 경우)
-    if post and post.image_path and os.path.exists(post.image_path):
-        st.image(post.image_path, caption="현재 첨부된 이미지")
+    current_image = get_image_for_display(post.image_path, "detail") if post else None
+    if current_image:
+        st.image(current_image, caption="현재 첨부된 이미지")
     
     col1, col2 = st.columns([1, 5])
     with col1:
@@ -160,6 +184,9 @@ def render_post_form(board_type: str, post_id: int = None):
                 
             if post_id:
                 update_post(post_id, title, content, image_path)
+                # 이미지를 교체했다면 이전 이미지 정리
+                if image_path and post.image_path and post.image_path != image_path:
+                    release_image(post.image_path, is_image_referenced)
                 st.success("게시글이 수정되었습니다.")
             else:
                 add_post(title, content, board_type, image_path)
@@ -173,6 +200,7 @@ def render_post_form(board_type: str, post_id: int = None):
             st.query_params.clear()
             st.rerun()
 
+@traced(kind="render")
 def render_reflection_list():
     """회고 게시글 목록을 렌더링하는 함수"""
     st.title("회고 게시판")
@@ -181,9 +209,13 @@ def render_reflection_list():
     if st.button("✏️ 새 회고 작성"):
         st.query_params["mode"] = "write"
         st.rerun()
+
+    # 검색 중이면 목록 대신 검색 결과 표시
+    if render_search_results("reflection"):
+        return
         
     # 게시글 목록 표시
-    posts = get_posts("reflection")  # reflection 타입의 게시글 가져오기
+    posts = get_post_summaries("reflection")  # reflection 타입의 게시글 가져오기
     if posts.empty:
         st.info("등록된 회고가 없습니다.")
     else:
@@ -197,6 +229,7 @@ def render_reflection_list():
                 st.query_params["mode"] = "view"
                 st.rerun()
 
+@traced(kind="render")
 def render_reflection_form(post_id: int = None):
     """회고 작성/수정 폼을 렌더링하는 함수"""
     post = get_post(post_id) if post_id else None
@@ -214,9 +247,9 @@ def render_reflection_form(post_id: int = None):
         help="마크다운 문법을 사용하여 작성할 수 있습니다."
     )
     
-    # 작성한 내용 미리보기
-    if content:
-        with st.expander("내용 미리보기"):
+    # 작성한 내용 미리보기 (켰을 때만 표시)
+    if content and st.toggle("내용 미리보기", key="show_preview"):
+        with st.container(border=True):
             st.markdown(content)
     
     col1, col2 = st.columns([1, 5])
@@ -241,6 +274,7 @@ def render_reflection_form(post_id: int = None):
             st.query_params.clear()
             st.rerun()
 
+@traced(kind="render")
 def render_reflection_detail(post_id: int):
     """회고 상세 보기를 렌더링하는 함수"""
     post = get_post(post_id)
@@ -0,0 +1,39 @@
+import streamlit as st
+from database import get_categories
+from utils.invalidation import UserCache
+
+
+class CategoryMap:
+    """한 사용자의 카테고리 id ↔ 이름 조회용 딕셔너리 묶음 (이름순)"""
+
+    def __init__(self, categories_df):
+        self.names = dict(zip(categories_df["id"].astype(int), categories_df["name"]))
+        self.ids = {name: category_id for category_id, name in self.names.items()}
+
+    def name(self, category_id, default: str = "미분류") -> str:
+        try:
+            return self.names.get(int(category_id), default)
+        except (TypeError, ValueError):
+            return default  # None / NaN
+
+    def id(self, name):
+        return self.ids.get(name)
+
+    def options(self) -> list:
+        """selectbox에 쓸 이름 목록"""
+        return list(self.names.values())
+
+
+# 사용자별 카테고리 맵 (프로세스 전체 공유, 카테고리가 바뀌면 해당 사용자만 삭제)
+# 다른 프로세스의 변경도 무효화 버스로 전달받아 삭제한다
+_maps = UserCache(lambda user_id: CategoryMap(get_categories(user_id=user_id)), ["category"])
+
+
+def get_category_map() -> CategoryMap:
+    """현재 사용자의 카테고리 맵을 반환하는 함수 (없을 때만 DB에서 읽음)"""
+    return _maps.get(st.session_state.user_id)
+
+
+def invalidate_categories(user_id):
+    """user_id가 None이면 모든 사용자의 맵을 지움"""
+    _maps.invalidate(user_id)
@@ -0,0 +1,452 @@
+"""사용자 데이터 내보내기/가져오기
+
+내보내기는 database.iter_export_rows()가 주는 청크를 바로 CSV/JSONL/Parquet/iCal
+파일에 써서 행 수와 관계없이 메모리 사용량이 청크 크기로 유지된다.
+가져오기는 파일을 IMPORT_BATCH_SIZE행씩 읽어 pandas로 한꺼번에 검증하고
+database.import_rows()로 넣는다 (PostgreSQL은 COPY).
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+import pandas as pd
+import pytz
+from config import GOAL_STATUS, IMPORTANCE_LEVELS
+from database import add_category, get_categories, import_rows, iter_export_rows
+
+KST = pytz.timezone("Asia/Seoul")
+
+# 데이터 종류별 내보내는 컬럼과 형식
+# kst: UTC로 저장된 일시를 KST로 변환, datetime: 저장된 그대로(서버 로컬 시각)
+EXPORT_COLUMNS = {
+    "goals": {
+        "id": "int",
+        "title": "str",
+        "start_date": "kst",
+        "end_date": "kst",
+        "trigger_action": "str",
+        "importance": "int",
+        "memo": "str",
+        "status": "str",
+        "category_name": "str",
+        "completed_at": "kst",
+        "created_at": "datetime",
+        "updated_at": "datetime",
+    },
+    "posts": {
+        "id": "int",
+        "board_type": "str",
+        "title": "str",
+        "content": "str",
+        "reflection_date": "date",
+        "created_at": "datetime",
+        "updated_at": "datetime",
+    },
+    "links": {
+        "id": "int",
+        "site_name": "str",
+        "url": "str",
+        "created_at": "datetime",
+        "updated_at": "datetime",
+    },
+    "chat": {
+        "transcript_id": "int",
+        "title": "str",
+        "seq": "int",
+        "role": "str",
+        "model": "str",
+        "content": "str",
+        "created_at": "datetime",
+    },
+}
+
+EXPORT_FORMATS = ["csv", "jsonl", "parquet", "ics"]
+IMPORT_DATASETS = ["goals", "posts", "links"]
+IMPORT_FORMATS = ["csv", "jsonl", "parquet"]
+
+# 가져오기에서 한 번에 검증하고 넣는 행 수
+IMPORT_BATCH_SIZE = 5000
+
+# 가져오기 결과에 남기는 거부 사유 최대 개수
+MAX_REJECTED_DETAILS = 100
+
+BOARD_TYPES = ["info", "idea", "reflection", "chat"]
+
+
+# 내보내기
+def _convert_rows(dataset: str, rows: list) -> list:
+    """내보낼 컬럼만 순서대로 남기고 목표 일시를 KST로 바꾸는 함수"""
+    columns = EXPORT_COLUMNS[dataset]
+    converted = []
+    for row in rows:
+        record = {}
+        for name, kind in columns.items():
+            value = row.get(name)
+            if kind == "kst" and value is not None:
+                value = value.replace(tzinfo=pytz.UTC).astimezone(KST)
+            record[name] = value
+        converted.append(record)
+    return converted
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 바꿀 수 없는 값: {type(value).__name__}")
+
+
+def _write_csv(dataset, chunks, out):
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=list(EXPORT_COLUMNS[dataset]))
+    writer.writeheader()
+    count = 0
+    for rows in chunks:
+        writer.writerows(
+            {
+                name: value.isoformat() if isinstance(value, (datetime, date)) else value
+                for name, value in row.items()
+            }
+            for row in rows
+        )
+        count += len(rows)
+    text.detach()  # out은 호출한 쪽이 닫음
+    return count
+
+
+def _write_jsonl(dataset, chunks, out):
+    count = 0
+    for rows in chunks:
+        out.write(
+            "".join(
+                json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows
+            ).encode("utf-8")
+        )
+        count += len(rows)
+    return count
+
+
+def _parquet_schema(dataset):
+    import pyarrow as pa
+
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "kst": pa.timestamp("us", tz="Asia/Seoul"),
+        "datetime": pa.timestamp("us"),
+        "date": pa.date32(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS[dataset].items()])
+
+
+def _write_parquet(dataset, chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(dataset)
+    count = 0
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        for rows in chunks:
+            # 청크 하나가 row group 하나
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+    return count
+
+
+def _ics_text(value) -> str:
+    text = str(value or "")
+    for old, new in (("\\", "\\\\"), (";", "\\;"), (",", "\\,"), ("\r\n", "\\n"), ("\n", "\\n")):
+        text = text.replace(old, new)
+    return text
+
+
+def _ics_line(line: str) -> bytes:
+    """75바이트마다 줄을 접은 iCal 한 줄 (UTF-8 문자 중간에서 자르지 않음)"""
+    encoded = line.encode("utf-8")
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        while (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut])
+        encoded = encoded[cut:]
+    parts.append(encoded)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _ics_time(value) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _write_ics(dataset, chunks, out):
+    if dataset != "goals":
+        raise ValueError("iCal(.ics)은 목표만 내보낼 수 있습니다.")
+    stamp = _ics_time(datetime.now(timezone.utc))
+    out.write(
+        b"".join(
+            _ics_line(line)
+            for line in (
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                "PRODID:-//goal-app//goals export//KO",
+                "CALSCALE:GREGORIAN",
+            )
+        )
+    )
+    count = 0
+    for rows in chunks:
+        lines = []
+        for row in rows:
+            start = row["start_date"] or row["end_date"]
+            if start is None:
+                continue  # 일정이 없는 목표는 달력에 표시할 수 없음
+            end = row["end_date"] or start
+            summary = ("✅ " if row["status"] == "완료" else "") + row["title"]
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:goal-{row['id']}@goal-app",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_ics_time(start)}",
+                f"DTEND:{_ics_time(max(start, end))}",
+                f"SUMMARY:{_ics_text(summary)}",
+            ]
+            if row["memo"]:
+                lines.append(f"DESCRIPTION:{_ics_text(row['memo'])}")
+            if row["category_name"]:
+                lines.append(f"CATEGORIES:{_ics_text(row['category_name'])}")
+            lines.append("END:VEVENT")
+            count += 1
+        out.write(b"".join(_ics_line(line) for line in lines))
+    out.write(_ics_line("END:VCALENDAR"))
+    return count
+
+
+WRITERS = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+    "ics": _write_ics,
+}
+
+
+def export_data(dataset: str, fmt: str, out, board_type: str = None, user_id: int = None) -> int:
+    """사용자의 데이터를 바이너리 파일 객체 out에 fmt 형식으로 쓰고 행 수를 반환하는 함수"""
+    if dataset not in EXPORT_COLUMNS:
+        raise ValueError(f"알 수 없는 데이터 종류: {dataset}")
+    if fmt not in WRITERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    chunks = (
+        _convert_rows(dataset, rows)
+        for rows in iter_export_rows(dataset, board_type=board_type, user_id=user_id)
+    )
+    return WRITERS[fmt](dataset, chunks, out)
+
+
+# 가져오기
+def _read_batches(source, fmt: str):
+    """파일을 IMPORT_BATCH_SIZE행씩 DataFrame으로 읽는 제너레이터"""
+    if fmt == "csv":
+        yield from pd.read_csv(
+            source, chunksize=IMPORT_BATCH_SIZE, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+        )
+    elif fmt == "jsonl":
+        yield from pd.read_json(source, lines=True, chunksize=IMPORT_BATCH_SIZE, dtype=False)
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=IMPORT_BATCH_SIZE):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+
+def _text(batch, column, default=""):
+    if column not in batch:
+        return pd.Series(default, index=batch.index, dtype=object)
+    values = batch[column].astype(object).where(batch[column].notna(), default)
+    return values.astype(str).str.strip()
+
+
+def _utc_datetimes(batch, column):
+    """일시 컬럼을 UTC(tz 없음)로 바꾸는 함수 (오프셋이 없는 값은 KST로 간주, 빈 값은 NaT)
+
+    반환값은 (변환 결과, 값이 있었는데 변환하지 못한 행 마스크)이다.
+    """
+    if column not in batch:
+        empty = pd.Series(pd.NaT, index=batch.index, dtype="datetime64[ns]")
+        return empty, pd.Series(False, index=batch.index)
+    values = batch[column]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        aware = values if values.dt.tz is not None else values.dt.tz_localize(KST)
+        return aware.dt.tz_convert("UTC").dt.tz_localize(None), pd.Series(False, index=batch.index)
+
+    text = values.astype(object).where(values.notna(), "").astype(str).str.strip()
+    missing = text == ""
+    parsed = pd.to_datetime(text.where(~missing), utc=True, errors="coerce", format="ISO8601")
+    naive = ~text.str.contains(r"(?:Z|[+-]\d{2}:?\d{2})$", regex=True)
+    parsed = parsed.where(~naive, parsed - pd.Timedelta(hours=9))  # KST는 UTC+9 고정
+    return parsed.dt.tz_localize(None), parsed.isna() & ~missing
+
+
+def _local_datetimes(batch, column, now):
+    """created_at 같은 저장 그대로의 일시 (없거나 잘못되면 now)"""
+    if column not in batch:
+        return pd.Series(now, index=batch.index)
+    values = batch[column]
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values.astype(object).where(values.notna()), errors="coerce", format="ISO8601")
+    if values.dt.tz is not None:
+        values = values.dt.tz_localize(None)
+    return values.fillna(now)
+
+
+def _to_python(value):
+    """DataFrame 값을 DB 드라이버에 넘길 파이썬 값으로 바꾸는 함수"""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, float) and pd.isna(value):
+        return None
+    if hasattr(value, "item"):
+        return value.item()  # numpy 스칼라
+    return value
+
+
+def _records(frame: pd.DataFrame) -> list:
+    return [
+        {name: _to_python(value) for name, value in zip(frame.columns, values)}
+        for values in frame.itertuples(index=False, name=None)
+    ]
+
+
+def _category_ids(names: pd.Series, user_id: int) -> pd.Series:
+    """카테고리 이름을 id로 바꾸는 함수 (없는 이름은 새로 만듦, 빈 이름은 None)"""
+    categories = get_categories(user_id=user_id)
+    ids = dict(zip(categories["name"], categories["id"].astype(int)))
+    for name in names[names != ""].unique():
+        if name not in ids:
+            ids[name] = add_category(name, user_id=user_id).id
+    return names.map(ids).astype(object).where(names != "", None)
+
+
+def _validate_goals(batch, user_id, now):
+    title = _text(batch, "title")
+    start, bad_start = _utc_datetimes(batch, "start_date")
+    end, bad_end = _utc_datetimes(batch, "end_date")
+    completed, _ = _utc_datetimes(batch, "completed_at")
+    status = _text(batch, "status", GOAL_STATUS[0]).replace("", GOAL_STATUS[0])
+    importance_text = _text(batch, "importance", "5").replace("", "5")
+    importance = pd.to_numeric(importance_text, errors="coerce")
+
+    reasons = pd.Series("", index=batch.index)
+    reasons = reasons.mask(title == "", "제목이 없습니다")
+    reasons = reasons.mask((reasons == "") & (bad_start | bad_end), "일시 형식이 잘못되었습니다")
+    reasons = reasons.mask((reasons == "") & (end < start), "종료 일시가 시작 일시보다 빠릅니다")
+    reasons = reasons.mask((reasons == "") & ~status.isin(GOAL_STATUS), "상태 값이 잘못되었습니다")
+    reasons = reasons.mask(
+        (reasons == "") & ~importance.isin(IMPORTANCE_LEVELS), "중요도는 1~10이어야 합니다"
+    )
+
+    valid = reasons == ""
+    done = status == "완료"
+    frame = pd.DataFrame(
+        {
+            "title": title,
+            "start_date": start,
+            "end_date": end,
+            "trigger_action": _text(batch, "trigger_action"),
+            "importance": importance.fillna(5).astype(int),
+            "memo": _text(batch, "memo"),
+            "status": status,
+            "category_id": None,
+            # 완료 상태인데 완료 시각이 없으면 가져온 시각
+            "completed_at": completed.where(done).fillna(pd.Timestamp(now)).where(done),
+            "created_at": _local_datetimes(batch, "created_at", now),
+            "updated_at": now,
+        }
+    )[valid]
+    frame["category_id"] = _category_ids(_text(batch, "category_name")[valid], user_id)
+    return frame, reasons
+
+
+def _validate_posts(batch, user_id, now):
+    title = _text(batch, "title")
+    board_type = _text(batch, "board_type")
+    reflection_text = _text(batch, "reflection_date")
+    reflection = pd.to_datetime(
+        reflection_text.where(reflection_text != ""), errors="coerce", format="ISO8601"
+    )
+    reasons = pd.Series("", index=batch.index)
+    reasons = reasons.mask(title == "", "제목이 없습니다")
+    reasons = reasons.mask(
+        (reasons == "") & ~board_type.isin(BOARD_TYPES), "게시판 종류(board_type)가 잘못되었습니다"
+    )
+    reasons = reasons.mask(
+        (reasons == "") & reflection.isna() & (reflection_text != ""), "회고 날짜 형식이 잘못되었습니다"
+    )
+    frame = pd.DataFrame(
+        {
+            "title": title,
+            "content": _text(batch, "content"),
+            "board_type": board_type,
+            "reflection_date": reflection.dt.date.astype(object).where(reflection.notna(), None),
+            "created_at": _local_datetimes(batch, "created_at", now),
+            "updated_at": now,
+        }
+    )[reasons == ""]
+    return frame, reasons
+
+
+def _validate_links(batch, user_id, now):
+    site_name = _text(batch, "site_name")
+    url = _text(batch, "url")
+    reasons = pd.Series("", index=batch.index)
+    reasons = reasons.mask(site_name == "", "사이트 이름이 없습니다")
+    reasons = reasons.mask(
+        (reasons == "") & ~url.str.match(r"^https?://", case=False), "URL은 http(s)://로 시작해야 합니다"
+    )
+    frame = pd.DataFrame(
+        {
+            "site_name": site_name,
+            "url": url,
+            "created_at": _local_datetimes(batch, "created_at", now),
+            "updated_at": now,
+        }
+    )[reasons == ""]
+    return frame, reasons
+
+
+VALIDATORS = {
+    "goals": _validate_goals,
+    "posts": _validate_posts,
+    "links": _validate_links,
+}
+
+
+def import_data(dataset: str, fmt: str, source, user_id: int = None) -> dict:
+    """파일을 배치 단위로 검증해 넣고 결과를 반환하는 함수
+
+    반환값은 {"imported": 넣은 행 수, "rejected": 거부된 행 수,
+    "errors": [(행 번호(1부터), 사유), ...] (최대 MAX_REJECTED_DETAILS개)}이다.
+    배치마다 따로 커밋하므로 중간에 실패하면 앞 배치까지는 들어간다.
+    """
+    from database import current_user_id
+
+    if dataset not in VALIDATORS:
+        raise ValueError(f"가져올 수 없는 데이터 종류: {dataset}")
+    user_id = current_user_id(user_id)
+    result = {"imported": 0, "rejected": 0, "errors": []}
+    offset = 0
+    for batch in _read_batches(source, fmt):
+        batch = batch.reset_index(drop=True)
+        now = datetime.now()
+        frame, reasons = VALIDATORS[dataset](batch, user_id, now)
+        rejected = reasons[reasons != ""]
+        result["rejected"] += len(rejected)
+        for index, reason in rejected.items():
+            if len(result["errors"]) >= MAX_REJECTED_DETAILS:
+                break
+            result["errors"].append((offset + index + 1, reason))
+        result["imported"] += import_rows(dataset, _records(frame), user_id=user_id)
+        offset += len(batch)
+    return result
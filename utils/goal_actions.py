@@ -0,0 +1,106 @@
+import pandas as pd
+import streamlit as st
+from database import update_goals_status, reschedule_goals, delete_goals
+
+
+def _selected_ids(key) -> list:
+    if st.session_state.get(f"{key}_all"):
+        return st.session_state.get(f"{key}_ids", [])
+    return st.session_state.get(f"{key}_selected", [])
+
+
+def _finish(key, message):
+    """작업 후 선택을 비우고 결과를 알리는 함수"""
+    st.session_state[f"{key}_selected"] = []
+    st.session_state[f"{key}_all"] = False
+    st.toast(message)
+
+
+def _complete(key):
+    count = update_goals_status(_selected_ids(key), "완료")
+    _finish(key, f"목표 {count}개를 완료했습니다.")
+
+
+def _reschedule(key):
+    days = int(st.session_state[f"{key}_days"])
+    count = reschedule_goals(_selected_ids(key), days)
+    _finish(key, f"목표 {count}개의 일정을 {days}일 옮겼습니다.")
+
+
+def _delete(key):
+    count = delete_goals(_selected_ids(key))
+    _finish(key, f"목표 {count}개를 삭제했습니다.")
+
+
+def show_bulk_actions(goals: pd.DataFrame, key: str):
+    """표시된 목표 중 여러 개를 골라 한 번에 완료/일정 이동/삭제하는 영역
+
+    버튼은 콜백에서 한 문장으로 처리하고, 변경 알림으로 세션의 목표 스냅샷이
+    갱신되므로 목록을 다시 조회하지 않는다.
+    """
+    if goals.empty:
+        return
+    labels = {
+        int(goal.id): f"{goal.title} ({pd.Timestamp(goal.end_date).strftime('%m-%d %H:%M')})"
+        if pd.notnull(goal.end_date)
+        else goal.title
+        for goal in goals.itertuples()
+    }
+    st.session_state[f"{key}_ids"] = list(labels)
+
+    with st.expander("☑️ 여러 목표 한 번에 처리"):
+        select_all = st.checkbox(f"표시된 목표 전체 선택 ({len(labels)}개)", key=f"{key}_all")
+        if not select_all:
+            # 목록이 바뀌어 사라진 목표는 선택에서 제외
+            selected = [
+                goal_id
+                for goal_id in st.session_state.get(f"{key}_selected", [])
+                if goal_id in labels
+            ]
+            st.session_state[f"{key}_selected"] = selected
+            st.multiselect(
+                "처리할 목표",
+                list(labels),
+                format_func=labels.get,
+                key=f"{key}_selected",
+            )
+        disabled = not _selected_ids(key)
+
+        col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+        with col1:
+            st.button(
+                "✅ 완료",
+                key=f"{key}_complete",
+                on_click=_complete,
+                args=(key,),
+                disabled=disabled,
+                use_container_width=True,
+            )
+        with col2:
+            st.number_input(
+                "옮길 일수",
+                min_value=-365,
+                max_value=365,
+                value=1,
+                key=f"{key}_days",
+                label_visibility="collapsed",
+                help="양수는 미루기, 음수는 앞당기기",
+            )
+        with col3:
+            st.button(
+                "📅 일정 옮기기",
+                key=f"{key}_reschedule",
+                on_click=_reschedule,
+                args=(key,),
+                disabled=disabled,
+                use_container_width=True,
+            )
+        with col4:
+            st.button(
+                "🗑️ 삭제",
+                key=f"{key}_delete",
+                on_click=_delete,
+                args=(key,),
+                disabled=disabled,
+                use_container_width=True,
+            )
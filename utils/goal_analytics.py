@@ -0,0 +1,217 @@
+import pandas as pd
+import pytz
+import streamlit as st
+from utils.goal_store import get_goal_snapshot, snapshot_version
+
+KST = pytz.timezone("Asia/Seoul")
+
+# 추세 그래프에 표시할 기간 (일)
+TREND_DAYS = 90
+
+# 세션 상태에 보관하는 계산 결과 ((스냅샷 버전, 날짜), 다음 마감 시각, 결과)
+ANALYTICS_KEY = "goal_analytics"
+
+
+def _prepare(goals_df: pd.DataFrame, now: pd.Timestamp) -> pd.DataFrame:
+    """계산에 필요한 컬럼만 정리한 DataFrame을 만드는 함수"""
+    end = pd.to_datetime(goals_df["end_date"], utc=True).dt.tz_convert(KST)
+    if "completed_at" in goals_df:
+        completed_at = pd.to_datetime(goals_df["completed_at"], utc=True).dt.tz_convert(KST)
+    else:
+        completed_at = pd.Series(pd.NaT, index=goals_df.index, dtype=end.dtype)
+    done = goals_df["status"] == "완료"
+    importance = pd.to_numeric(goals_df["importance"], errors="coerce").fillna(0)
+    return pd.DataFrame(
+        {
+            "title": goals_df["title"],
+            "category_id": pd.to_numeric(goals_df["category_id"], errors="coerce")
+            .fillna(0)
+            .astype(int),
+            "importance": importance,
+            "done": done,
+            "done_score": importance.where(done, 0),
+            "end": end,
+            "completed_at": completed_at,
+            # 마감이 지난 목표만 달성률 계산에 포함
+            "due": end.notna() & (end <= now),
+        }
+    )
+
+
+def _rate(completed, total):
+    return completed / total if total else None
+
+
+def category_rates(frame: pd.DataFrame) -> pd.DataFrame:
+    """카테고리별 완료율과 중요도 가중 완료율"""
+    due = frame[frame["due"]]
+    rates = due.groupby("category_id").agg(
+        total=("done", "size"),
+        completed=("done", "sum"),
+        score=("importance", "sum"),
+        completed_score=("done_score", "sum"),
+    )
+    rates["rate"] = rates["completed"] / rates["total"]
+    rates["weighted_rate"] = rates["completed_score"] / rates["score"].where(rates["score"] > 0)
+    return rates.sort_values("rate", ascending=False).reset_index()
+
+
+def completion_timing(frame: pd.DataFrame) -> dict:
+    """완료한 목표 중 마감 전/후에 완료한 개수"""
+    completed = frame[frame["done"]]
+    late_by = completed["completed_at"] - completed["end"]
+    known = late_by.notna()
+    late = known & (late_by > pd.Timedelta(0))
+    return {
+        "on_time": int((known & ~late).sum()),
+        "late": int(late.sum()),
+        # 완료 시각 기록 전에 완료된 목표
+        "unknown": int((~known).sum()),
+        "median_late_hours": (
+            round(late_by[late].median().total_seconds() / 3600, 1) if late.any() else None
+        ),
+    }
+
+
+def recurring_streaks(frame: pd.DataFrame) -> pd.DataFrame:
+    """같은 제목으로 여러 번 등록된 반복 목표의 현재/최고 연속 완료 횟수"""
+    due = frame[frame["due"]]
+    recurring = due[due.duplicated("title", keep=False)]
+    if recurring.empty:
+        return pd.DataFrame(columns=["title", "occurrences", "completed", "current", "best"])
+
+    recurring = recurring.sort_values(["title", "end"])
+    # 미완료가 나올 때마다 구간 번호를 올리고, 구간 안에서 완료 수를 누적
+    breaks = (~recurring["done"]).groupby(recurring["title"]).cumsum()
+    run = recurring["done"].astype(int).groupby([recurring["title"], breaks]).cumsum()
+    streaks = (
+        pd.DataFrame({"title": recurring["title"], "done": recurring["done"], "run": run})
+        .groupby("title")
+        .agg(
+            occurrences=("done", "size"),
+            completed=("done", "sum"),
+            current=("run", "last"),
+            best=("run", "max"),
+        )
+    )
+    return streaks.sort_values(["current", "best"], ascending=False).reset_index()
+
+
+def rolling_trend(frame: pd.DataFrame, now: pd.Timestamp) -> pd.DataFrame:
+    """일별 완료 수와 최근 7일/30일 이동 완료율"""
+    today = now.normalize()
+    # 첫날의 30일 이동값을 위해 29일 앞부터 집계
+    start = today - pd.Timedelta(days=TREND_DAYS + 29)
+    due = frame[frame["due"] & (frame["end"] >= start)]
+    days = pd.date_range(start, today, freq="D")
+    daily = (
+        due.groupby(due["end"].dt.normalize())
+        .agg(planned=("done", "size"), completed=("done", "sum"))
+        .reindex(days, fill_value=0)
+    )
+    for window in (7, 30):
+        rolled = daily[["planned", "completed"]].rolling(window, min_periods=1).sum()
+        daily[f"rate_{window}d"] = rolled["completed"] / rolled["planned"].where(rolled["planned"] > 0)
+    return daily.iloc[-TREND_DAYS:].rename_axis("day")
+
+
+def compute_goal_analytics(goals_df: pd.DataFrame, now: pd.Timestamp = None) -> dict:
+    """목표 스냅샷에서 통계를 계산하는 함수
+
+    반환값: overview(전체 수치), categories, timing, streaks, trend
+    """
+    now = now if now is not None else pd.Timestamp.now(tz=KST)
+    if goals_df.empty:
+        return {}
+
+    frame = _prepare(goals_df, now)
+    trend = rolling_trend(frame, now)
+    due = frame["due"]
+    week_ago = now.normalize() - pd.Timedelta(days=7)
+    overview = {
+        "due": int(due.sum()),
+        "completed": int((due & frame["done"]).sum()),
+        "rate": _rate((due & frame["done"]).sum(), due.sum()),
+        "rate_7d": trend["rate_7d"].iloc[-1],
+        "prev_rate_7d": trend["rate_7d"].get(week_ago),
+        "rate_30d": trend["rate_30d"].iloc[-1],
+    }
+    # NaN(해당 기간 목표 없음)은 None으로 통일
+    overview = {key: (None if pd.isna(value) else value) for key, value in overview.items()}
+    return {
+        "overview": overview,
+        "categories": category_rates(frame),
+        "timing": completion_timing(frame),
+        "streaks": recurring_streaks(frame),
+        "trend": trend,
+    }
+
+
+def _next_deadline(goals_df: pd.DataFrame, now: pd.Timestamp):
+    """아직 지나지 않은 가장 가까운 마감 시각 (이 시각이 지나면 due가 바뀜)"""
+    if goals_df.empty:
+        return None
+    end = pd.to_datetime(goals_df["end_date"], utc=True)
+    upcoming = end[end > now]
+    return upcoming.min() if not upcoming.empty else None
+
+
+def get_goal_analytics() -> dict:
+    """현재 세션 스냅샷의 통계를 반환하는 함수
+
+    스냅샷 버전·날짜가 같고 그 사이 새로 마감이 지난 목표가 없으면 다시 계산하지 않는다.
+    """
+    goals_df = get_goal_snapshot()
+    now = pd.Timestamp.now(tz=KST)
+    key = (snapshot_version(), now.date())
+    cached = st.session_state.get(ANALYTICS_KEY)
+    if cached is not None and cached[0] == key and (cached[1] is None or now < cached[1]):
+        return cached[2]
+    analytics = compute_goal_analytics(goals_df, now)
+    st.session_state[ANALYTICS_KEY] = (key, _next_deadline(goals_df, now), analytics)
+    return analytics
+
+
+def _percent(value) -> str:
+    return "-" if value is None else f"{value:.0%}"
+
+
+def analytics_summary(analytics: dict, category_names: dict = None, max_items: int = 3) -> str:
+    """LLM 프롬프트에 넣을 짧은 수치 요약을 만드는 함수"""
+    if not analytics:
+        return "목표 통계 없음"
+    category_names = category_names or {}
+    overview = analytics["overview"]
+    lines = [
+        f"- 마감 지난 목표 {overview['due']}개 중 {overview['completed']}개 완료 "
+        f"(완료율 {_percent(overview['rate'])})",
+        f"- 최근 7일 완료율 {_percent(overview['rate_7d'])} "
+        f"(그 전 7일 {_percent(overview['prev_rate_7d'])}), "
+        f"최근 30일 {_percent(overview['rate_30d'])}",
+    ]
+
+    categories = analytics["categories"]
+    if not categories.empty:
+        items = [
+            f"{category_names.get(row.category_id, '미분류')} {_percent(row.rate)}"
+            for row in categories.itertuples()
+        ]
+        if len(items) > max_items * 2:
+            items = items[:max_items] + ["…"] + items[-max_items:]
+        lines.append(f"- 카테고리별 완료율: {', '.join(items)}")
+
+    timing = analytics["timing"]
+    if timing["on_time"] or timing["late"]:
+        line = f"- 제때 완료 {timing['on_time']}개, 늦게 완료 {timing['late']}개"
+        if timing["median_late_hours"] is not None:
+            line += f" (늦은 경우 중앙값 {timing['median_late_hours']}시간)"
+        lines.append(line)
+
+    streaks = analytics["streaks"]
+    if not streaks.empty:
+        items = [
+            f"{row.title} 연속 {row.current}회(최고 {row.best}회)"
+            for row in streaks.head(max_items).itertuples()
+        ]
+        lines.append(f"- 반복 목표: {', '.join(items)}")
+    return "\n".join(lines)
@@ -0,0 +1,63 @@
+import pandas as pd
+
+# 목표 목록 기간 선택 순서 ("전체" 제외)
+PERIODS = ["오늘", "내일", "2일 후", "3일 후", "1주", "1개월", "1년"]
+
+# 특정 날짜에 시작하거나 끝나는 목표를 보여주는 기간 (오늘로부터 며칠 뒤)
+_DAY_OFFSETS = {"내일": 1, "2일 후": 2, "3일 후": 3}
+
+# 오늘부터 며칠 안에 걸쳐 있는 목표를 보여주는 기간
+_RANGE_DAYS = {"1주": 7, "1개월": 30, "1년": 365}
+
+
+def _goal_dates(goals_df: pd.DataFrame):
+    """시작/종료 일시와 그 날짜(자정 기준)를 한 번만 변환하는 함수"""
+    start = pd.to_datetime(goals_df["start_date"])
+    end = pd.to_datetime(goals_df["end_date"])
+    return start, end, start.dt.normalize(), end.dt.normalize()
+
+
+def _period_mask(dates, period: str, current_time: pd.Timestamp) -> pd.Series:
+    start, end, start_day, end_day = dates
+    today = current_time.normalize()
+
+    if period == "오늘":
+        return (
+            (start_day == today)
+            | (end_day == today)
+            | ((start <= current_time) & (end >= current_time))
+        )
+    if period in _DAY_OFFSETS:
+        day = today + pd.Timedelta(days=_DAY_OFFSETS[period])
+        return (start_day == day) | (end_day == day)
+    if period in _RANGE_DAYS:
+        last_day = today + pd.Timedelta(days=_RANGE_DAYS[period])
+        return (start_day <= last_day) & (end_day >= today)
+    raise ValueError(f"알 수 없는 기간입니다: {period}")
+
+
+def filter_goals_for_period(goals_df: pd.DataFrame, period: str, current_time: pd.Timestamp) -> pd.DataFrame:
+    """선택한 기간에 해당하는 목표만 반환하는 함수
+
+    current_time은 KST 기준 pd.Timestamp이다.
+    """
+    return goals_df[_period_mask(_goal_dates(goals_df), period, current_time)]
+
+
+def filter_goals_by_period(goals_df: pd.DataFrame, current_time: pd.Timestamp) -> dict:
+    """목표 목록을 기간별로 나눈 DataFrame 딕셔너리를 반환하는 함수
+
+    current_time은 KST 기준 pd.Timestamp이다.
+    """
+    dates = _goal_dates(goals_df)
+    return {
+        period: goals_df[_period_mask(dates, period, current_time)]
+        for period in PERIODS
+    }
+
+
+def time_range_labels(goals_df: pd.DataFrame) -> pd.Series:
+    """목표별 "HH:MM - HH:MM" 시간 문자열을 한 번에 만드는 함수"""
+    start = pd.to_datetime(goals_df["start_date"]).dt.strftime("%H:%M")
+    end = pd.to_datetime(goals_df["end_date"]).dt.strftime("%H:%M")
+    return start.fillna("") + " - " + end.fillna("")
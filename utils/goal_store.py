@@ -0,0 +1,168 @@
+import threading
+import time
+import warnings
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from database import (
+    get_goals_for_sync,
+    get_goal_changes,
+    goal_record,
+    add_change_listener,
+    TOMBSTONE_RETENTION,
+)
+from utils.invalidation import get_bus, subscribe
+
+# 세션 상태에 보관하는 목표 스냅샷 (get_goals() 결과)
+SNAPSHOT_KEY = "goals_df"
+
+# 스냅샷의 사용자와 마지막으로 반영한 변경 번호 (get_goal_changes의 since)
+SNAPSHOT_USER_KEY = "goals_df_user_id"
+SYNC_VERSION_KEY = "goals_df_sync_version"
+
+# 마지막으로 DB를 확인한 시각 (이 프로세스의 time.monotonic(), 다른 프로세스 변경 비교용)
+CHECKED_AT_KEY = "goals_df_checked_at"
+
+# 메뉴 이동 등으로 다른 세션의 변경을 확인해야 할 때 True (다음 조회 때 바뀐 행만 병합)
+STALE_KEY = "goals_df_stale"
+
+# 바뀐 행이 이보다 많으면 병합하지 않고 전체를 다시 읽음
+MAX_MERGE_ROWS = 200
+
+# 다른 프로세스에서 목표가 바뀐 시각 (사용자별, None 키는 전체 사용자, time.monotonic())
+# 스냅샷을 마지막으로 확인한 이후 값이면 다음 조회 때 바뀐 행만 병합
+_remote_changed_at = {}
+_remote_lock = threading.Lock()
+
+# 스냅샷을 새로 읽거나 변경을 반영할 때마다 1씩 증가 (파생 계산 캐시 키)
+VERSION_KEY = "goals_df_version"
+
+
+def _bump_version():
+    st.session_state[VERSION_KEY] = st.session_state.get(VERSION_KEY, 0) + 1
+
+
+def _load_snapshot() -> pd.DataFrame:
+    get_bus()  # 스냅샷을 읽기 전에 다른 프로세스의 무효화 알림 수신 시작
+    checked_at = time.monotonic()
+    snapshot, version = get_goals_for_sync()
+    st.session_state[SNAPSHOT_KEY] = snapshot
+    st.session_state[SNAPSHOT_USER_KEY] = st.session_state.user_id
+    st.session_state[SYNC_VERSION_KEY] = version
+    st.session_state[CHECKED_AT_KEY] = checked_at
+    st.session_state[STALE_KEY] = False
+    _bump_version()
+    return snapshot
+
+
+def _sync_snapshot(snapshot: pd.DataFrame) -> pd.DataFrame:
+    """마지막 동기화 이후 바뀐 목표만 스냅샷에 병합하는 함수"""
+    checked_at = time.monotonic()
+    changes, deleted_ids, version = get_goal_changes(st.session_state[SYNC_VERSION_KEY])
+    if len(changes) > MAX_MERGE_ROWS:
+        return _load_snapshot()
+
+    for goal_id in deleted_ids:
+        snapshot = apply_goal_change(snapshot, "delete", {"id": goal_id})
+    for record in changes.to_dict("records"):
+        snapshot = apply_goal_change(snapshot, "update", record)
+
+    st.session_state[SNAPSHOT_KEY] = snapshot
+    st.session_state[SYNC_VERSION_KEY] = version
+    st.session_state[CHECKED_AT_KEY] = checked_at
+    st.session_state[STALE_KEY] = False
+    if deleted_ids or len(changes):
+        _bump_version()
+    return snapshot
+
+
+def get_goal_snapshot() -> pd.DataFrame:
+    """현재 사용자의 목표 스냅샷을 반환하는 함수
+
+    처음에는 전체를 읽고, 이후 mark_goal_snapshot_stale()이 호출된 뒤에는
+    바뀐 목표만 DB에서 읽어 병합한다.
+    """
+    snapshot = st.session_state.get(SNAPSHOT_KEY)
+    if (
+        snapshot is None
+        or st.session_state.get(SNAPSHOT_USER_KEY) != st.session_state.user_id
+        or time.monotonic() - st.session_state[CHECKED_AT_KEY] > TOMBSTONE_RETENTION.total_seconds()
+    ):
+        return _load_snapshot()
+    if st.session_state.get(STALE_KEY) or _changed_remotely():
+        return _sync_snapshot(snapshot)
+    return snapshot
+
+
+def _changed_remotely() -> bool:
+    checked_at = st.session_state[CHECKED_AT_KEY]
+    return any(
+        changed_at > checked_at
+        for changed_at in (
+            _remote_changed_at.get(st.session_state.user_id),
+            _remote_changed_at.get(None),
+        )
+        if changed_at is not None
+    )
+
+
+def mark_goal_snapshot_stale():
+    """다음 get_goal_snapshot() 때 다른 세션의 변경을 확인하도록 표시하는 함수"""
+    if SNAPSHOT_KEY in st.session_state:
+        st.session_state[STALE_KEY] = True
+
+
+def snapshot_version() -> int:
+    """현재 스냅샷의 버전을 반환하는 함수"""
+    return st.session_state.get(VERSION_KEY, 0)
+
+
+def apply_goal_change(snapshot: pd.DataFrame, action: str, record: dict) -> pd.DataFrame:
+    """변경된 목표 한 건을 스냅샷에 바로 반영하고 스냅샷을 반환하는 함수
+
+    수정된 목표는 원래 위치(인덱스)를 유지하므로 인덱스를 쓰는 위젯 key도 바뀌지 않는다.
+    """
+    if snapshot.empty and len(snapshot.columns) == 0:
+        # 목표가 하나도 없던 사용자 (컬럼 없는 빈 DataFrame)
+        return snapshot if action == "delete" else pd.DataFrame([record])
+
+    matched = snapshot.index[snapshot["id"] == record["id"]]
+    if action == "delete":
+        snapshot.drop(matched, inplace=True)
+    elif len(matched):
+        # 동기화로 이미 반영된 추가가 다시 와도 같은 행을 덮어씀
+        snapshot.loc[matched[0], list(record)] = pd.Series(record)
+    else:
+        with warnings.catch_warnings():
+            # 빈 값이 있는 행을 추가할 때 나오는 pandas dtype 경고 (결과 dtype은 기존 컬럼 유지)
+            warnings.simplefilter("ignore", FutureWarning)
+            snapshot.loc[snapshot.index.max() + 1 if len(snapshot) else 0] = pd.Series(record)
+    return snapshot
+
+
+def _on_change(entity, action, row):
+    """같은 세션에서 목표가 바뀌면 DB를 다시 읽지 않고 스냅샷만 갱신하는 함수"""
+    if entity != "goal" or get_script_run_ctx() is None:
+        return
+    snapshot = st.session_state.get(SNAPSHOT_KEY)
+    if snapshot is None or row.get("user_id") != st.session_state.get("user_id"):
+        return
+    if action == "import":
+        # 한꺼번에 들어간 목표는 다음 조회 때 updated_at 기준으로 병합
+        mark_goal_snapshot_stale()
+        return
+    st.session_state[SNAPSHOT_KEY] = apply_goal_change(snapshot, action, goal_record(row))
+    _bump_version()
+
+
+add_change_listener(_on_change)
+
+
+def _on_invalidate(user_id, entity, remote):
+    """다른 프로세스의 목표 변경 시각을 기록하는 함수 (세션 상태는 다음 조회 때 갱신)"""
+    if remote and entity in ("goal", "*"):
+        with _remote_lock:
+            _remote_changed_at[user_id] = time.monotonic()
+
+
+subscribe(_on_invalidate)
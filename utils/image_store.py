@@ -0,0 +1,190 @@
+import hashlib
+import os
+import tempfile
+import time
+from PIL import Image, ImageOps, features
+
+# 이미지 저장 경로 설정
+UPLOAD_DIR = "uploads"
+THUMBNAIL_DIR = os.path.join(UPLOAD_DIR, "thumbs")
+
+# 업로드 파일을 나눠 읽을 크기 (1MB)
+CHUNK_SIZE = 1024 * 1024
+
+# 화면별 썸네일 최대 크기 (가로, 세로)
+THUMBNAIL_SIZES = {
+    "list": (160, 160),
+    "detail": (1280, 1280),
+}
+
+# WebP를 지원하지 않는 Pillow 빌드에서는 JPEG로 저장
+THUMBNAIL_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+THUMBNAIL_EXT = ".webp" if THUMBNAIL_FORMAT == "WEBP" else ".jpg"
+
+
+def _ensure_dirs():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+
+
+def _content_path(digest: str, ext: str) -> str:
+    """해시값으로 원본 파일 경로를 만드는 함수 (uploads/ab/abcd....png)"""
+    return os.path.join(UPLOAD_DIR, digest[:2], f"{digest}{ext}")
+
+
+def _thumbnail_path(image_path: str, size: str) -> str:
+    """원본 경로에 대응하는 썸네일 경로를 만드는 함수"""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    return os.path.join(THUMBNAIL_DIR, f"{stem}_{size}{THUMBNAIL_EXT}")
+
+
+def _make_thumbnail(image_path: str, size: str) -> str:
+    """원본 이미지에서 지정한 크기의 썸네일을 만드는 함수"""
+    thumb_path = _thumbnail_path(image_path, size)
+    with Image.open(image_path) as img:
+        # EXIF 회전 정보를 반영한 뒤 비율을 유지하며 축소
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(THUMBNAIL_SIZES[size])
+        if THUMBNAIL_FORMAT == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=THUMBNAIL_DIR, suffix=THUMBNAIL_EXT)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                img.save(f, THUMBNAIL_FORMAT, quality=80)
+            os.replace(tmp_path, thumb_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return thumb_path
+
+
+def save_image(uploaded_file) -> str:
+    """업로드된 이미지를 내용 해시 기준으로 저장하고 원본 경로를 반환하는 함수
+
+    같은 내용의 이미지가 이미 있으면 새로 저장하지 않고 기존 경로를 돌려준다.
+    파일은 CHUNK_SIZE 단위로 읽어 쓰므로 큰 이미지도 메모리에 한 번에 올리지 않는다.
+    """
+    if uploaded_file is None:
+        return None
+
+    _ensure_dirs()
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+
+    # 임시 파일에 나눠 쓰면서 해시 계산
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=ext)
+    try:
+        uploaded_file.seek(0)
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = uploaded_file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+
+        # 이미지가 아닌 파일은 저장하지 않음
+        with Image.open(tmp_path) as img:
+            img.verify()
+
+        file_path = _content_path(digest.hexdigest(), ext)
+        try:
+            # 중복 업로드: 기존 파일 재사용 (수정 시각을 갱신해 gc-images가 새 파일로 보게 함)
+            os.utime(file_path)
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # 업로드 시점에 화면별 썸네일 생성 (이미 있으면 원본과 같이 수정 시각만 갱신)
+    for size in THUMBNAIL_SIZES:
+        thumbnail_path = _thumbnail_path(file_path, size)
+        try:
+            os.utime(thumbnail_path)
+        except FileNotFoundError:
+            _make_thumbnail(file_path, size)
+
+    return file_path
+
+
+def get_image_for_display(image_path: str, size: str = "detail") -> str:
+    """화면 크기에 맞는 썸네일 경로를 반환하는 함수
+
+    썸네일이 없는 예전 업로드는 이 시점에 만들고, 만들 수 없으면 원본 경로를 반환한다.
+    """
+    if not image_path or not os.path.exists(image_path):
+        return None
+
+    thumb_path = _thumbnail_path(image_path, size)
+    if os.path.exists(thumb_path):
+        return thumb_path
+
+    try:
+        _ensure_dirs()
+        return _make_thumbnail(image_path, size)
+    except Exception:
+        return image_path
+
+
+def _remove_with_thumbnails(image_path: str):
+    for size in THUMBNAIL_SIZES:
+        thumb_path = _thumbnail_path(image_path, size)
+        if os.path.exists(thumb_path):
+            os.remove(thumb_path)
+    if os.path.exists(image_path):
+        os.remove(image_path)
+
+
+def release_image(image_path: str, is_referenced) -> bool:
+    """더 이상 참조되지 않는 이미지를 썸네일과 함께 삭제하는 함수
+
+    is_referenced(image_path)가 True이면 다른 게시글이 같은 파일을 쓰고 있으므로 남겨둔다.
+    """
+    if not image_path or is_referenced(image_path):
+        return False
+    _remove_with_thumbnails(image_path)
+    return True
+
+
+def collect_garbage(referenced_paths, min_age_seconds: int = 3600, dry_run=False):
+    """어떤 게시글에서도 참조하지 않는 업로드 파일을 정리하는 함수
+
+    저장 직후 아직 게시글에 연결되지 않은 파일을 지우지 않도록
+    min_age_seconds보다 오래된 파일만 대상으로 하며, 삭제한 경로 목록을 반환한다.
+    """
+    referenced = {os.path.normpath(p) for p in referenced_paths if p}
+    referenced_stems = {
+        os.path.splitext(os.path.basename(p))[0] for p in referenced
+    }
+    cutoff = time.time() - min_age_seconds
+    removed = []
+
+    if not os.path.isdir(UPLOAD_DIR):
+        return removed
+
+    for root, dirs, files in os.walk(UPLOAD_DIR):
+        for name in files:
+            path = os.path.normpath(os.path.join(root, name))
+            if os.path.getmtime(path) > cutoff:
+                continue
+
+            if os.path.dirname(path) == os.path.normpath(THUMBNAIL_DIR):
+                # 썸네일은 원본 파일명(stem)_크기 형식
+                stem = name.rsplit("_", 1)[0]
+                unused = stem not in referenced_stems
+            else:
+                unused = path not in referenced
+
+            if unused:
+                removed.append(path)
+                if not dry_run:
+                    os.remove(path)
+
+    return removed
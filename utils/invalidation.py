@@ -0,0 +1,251 @@
+import os
+import select
+import statistics
+import threading
+import time
+import uuid
+from collections import deque
+from sqlalchemy import text
+from database import add_change_listener, get_engine
+
+# PostgreSQL NOTIFY 채널 이름
+CHANNEL = "goal_app_invalidation"
+
+# 이 프로세스가 보낸 알림을 구분하는 값
+ORIGIN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# 도착 지연 시간을 보관하는 개수
+LATENCY_SAMPLES = 1000
+
+# subscribe()로 등록한 함수 (버스보다 먼저 등록되므로 모듈에 보관, 모든 버스가 공유)
+_subscribers = []
+
+
+class InvalidationBus:
+    """사용자·데이터 종류 단위의 캐시 무효화 알림을 주고받는 버스 (프로세스 안에서만 전달)
+
+    subscribe(callback)로 등록한 함수는 callback(user_id, entity, remote)로 호출된다.
+    remote는 다른 프로세스에서 온 알림인지 여부이고, 연결이 끊겼다 다시 연결되어
+    놓친 알림이 있을 수 있으면 user_id=None, entity="*"로 호출된다 (전체 무효화).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.published = 0
+        self.received = 0
+
+    def publish(self, user_id, entity: str):
+        """변경을 알리는 함수 (이 프로세스의 구독자에게는 바로 전달)"""
+        with self._lock:
+            self.published += 1
+        self._dispatch(user_id, entity, remote=False)
+        self._send(f"{user_id}:{entity}:{ORIGIN}:{time.time():.6f}")
+
+    def _send(self, payload: str):
+        """다른 프로세스로 보내는 함수 (메모리 버스는 보낼 곳이 없음)"""
+
+    def _receive(self, payload: str):
+        """다른 프로세스에서 온 알림을 처리하는 함수"""
+        try:
+            user_id, entity, origin, sent_at = payload.split(":")
+            user_id, sent_at = int(user_id), float(sent_at)
+        except ValueError:
+            print(f"잘못된 무효화 알림: {payload}")
+            return
+        if origin == ORIGIN:
+            return  # 보낼 때 이미 전달함
+        with self._lock:
+            self.received += 1
+            self._latencies.append((time.time() - sent_at) * 1000)
+        self._dispatch(user_id, entity, remote=True)
+
+    def _dispatch(self, user_id, entity, remote: bool):
+        for callback in list(_subscribers):
+            try:
+                callback(user_id, entity, remote)
+            except Exception as e:
+                # 캐시 무효화 실패가 원래 작업을 실패시키지 않도록 함
+                print(f"무효화 알림 처리 중 오류 발생 ({entity}): {e}")
+
+    def stats(self) -> dict:
+        """보낸/받은 알림 수와 도착 지연 시간(ms)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        result = {"published": self.published, "received": self.received}
+        if samples:
+            result.update(
+                latency_p50_ms=round(statistics.median(samples), 1),
+                latency_p95_ms=round(samples[int(len(samples) * 0.95) - 1], 1),
+                latency_max_ms=round(samples[-1], 1),
+            )
+        return result
+
+
+class MemoryBus(InvalidationBus):
+    """프로세스 하나에서만 전달하는 버스 (SQLite·테스트용)
+
+    deliver()로 다른 프로세스에서 온 알림을 흉내낼 수 있다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def _send(self, payload: str):
+        self.sent.append(payload)
+
+    def deliver(self, payload: str):
+        self._receive(payload)
+
+
+class PostgresBus(InvalidationBus):
+    """PostgreSQL LISTEN/NOTIFY로 다른 프로세스와 알림을 주고받는 버스"""
+
+    def __init__(self, engine, channel: str = CHANNEL, poll_seconds: float = 5.0):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.reconnects = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._listen, name="invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def _send(self, payload: str):
+        with self.engine.connect() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+            conn.commit()
+
+    def _listen(self):
+        """LISTEN 전용 연결로 알림을 기다리는 백그라운드 스레드"""
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                # 풀에서 꺼낸 연결을 떼어 내 LISTEN 전용으로 사용
+                connection = self.engine.raw_connection()
+                connection.detach()
+                try:
+                    dbapi = connection.driver_connection
+                    dbapi.autocommit = True
+                    dbapi.cursor().execute(f"LISTEN {self.channel}")
+                    if self.reconnects:
+                        # 끊긴 동안 놓친 알림이 있을 수 있음
+                        self._dispatch(None, "*", remote=True)
+                    backoff = 1
+                    while not self._stop.is_set():
+                        if select.select([dbapi], [], [], self.poll_seconds) == ([], [], []):
+                            continue
+                        dbapi.poll()
+                        while dbapi.notifies:
+                            self._receive(dbapi.notifies.pop(0).payload)
+                finally:
+                    connection.close()
+            except Exception as e:
+                print(f"무효화 알림 연결 오류, {backoff}초 후 다시 연결: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+            self.reconnects += 1
+
+    def stats(self) -> dict:
+        return {**super().stats(), "reconnects": self.reconnects}
+
+    def stop(self):
+        self._stop.set()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> InvalidationBus:
+    """DB 종류에 맞는 프로세스 공용 버스 (PostgreSQL이면 LISTEN/NOTIFY)
+
+    처음 호출할 때 엔진을 만들고 PostgreSQL이면 LISTEN 스레드를 시작한다.
+    import 시점에는 호출하지 않고, 첫 알림을 보내거나 캐시가 처음 DB를 읽을 때 호출한다.
+    """
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                engine = get_engine()
+                if engine.dialect.name == "postgresql":
+                    _bus = PostgresBus(engine)
+                else:
+                    _bus = MemoryBus()
+    return _bus
+
+
+def set_bus(bus: InvalidationBus):
+    """버스를 교체하는 함수 (테스트용, 구독자는 그대로 유지)"""
+    global _bus
+    with _bus_lock:
+        _bus = bus
+
+
+def subscribe(callback):
+    """무효화 알림을 받을 함수를 등록하는 함수 (버스를 만들지 않으므로 import 시점에 호출해도 됨)"""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+class UserCache:
+    """사용자별 값을 프로세스 전체에서 공유하고 무효화 알림을 받으면 지우는 캐시
+
+    entities 중 하나가 바뀌었다는 알림(다른 프로세스 포함)이 오면 그 사용자의 값을
+    지우고, 다음 get() 때 load(user_id)로 다시 읽는다. load()가 DB를 읽는 동안
+    무효화되면 읽은 값을 돌려주기만 하고 저장하지 않는다.
+    """
+
+    def __init__(self, load, entities):
+        self._load = load
+        self._entities = set(entities) | {"*"}
+        self._values = {}
+        self._lock = threading.Lock()
+        self._generations = {}  # 사용자 ID -> 무효화 횟수
+        self._global_generation = 0  # 전체 무효화 횟수
+        subscribe(self._on_invalidate)
+
+    def _generation(self, user_id) -> tuple:
+        return self._global_generation, self._generations.get(user_id, 0)
+
+    def get(self, user_id):
+        value = self._values.get(user_id)
+        if value is None:
+            get_bus()  # 값을 채우기 전에 다른 프로세스의 무효화 알림 수신 시작
+            with self._lock:
+                generation = self._generation(user_id)
+            value = self._load(user_id)
+            with self._lock:
+                if self._generation(user_id) == generation:
+                    self._values[user_id] = value
+        return value
+
+    def invalidate(self, user_id):
+        """user_id가 None이면 모든 사용자의 값을 지움"""
+        with self._lock:
+            if user_id is None:
+                self._global_generation += 1
+                self._values.clear()
+            else:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+                self._values.pop(user_id, None)
+
+    def _on_invalidate(self, user_id, entity, remote):
+        if entity in self._entities:
+            self.invalidate(user_id)
+
+
+def _on_change(entity, action, row):
+    """커밋마다 바뀐 사용자·종류 단위로 무효화 알림을 한 번 보내는 함수"""
+    user_id = row.get("user_id")
+    if user_id is not None:
+        get_bus().publish(user_id, entity)
+
+
+add_change_listener(_on_change, per_commit=True)
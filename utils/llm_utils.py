@@ -1,25 +1,30 @@
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
+import importlib
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 import streamlit as st
-from dotenv import load_dotenv
-import os
-from langchain.callbacks.base import BaseCallbackHandler
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from config import get_env_var
+from utils.tracing import span, traced
+from database import create_chat_transcript, append_chat_messages
+
+# 모델 접두사별 LangChain 제공자 (모듈, 클래스)
+# 제공자 패키지는 import 비용이 커서 create_llm에서 처음 필요할 때만 불러온다.
+LLM_PROVIDERS = {
+    "gpt": ("langchain_openai", "ChatOpenAI"),
+    "claude": ("langchain_anthropic", "ChatAnthropic"),
+    "gemini": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+}
+
+
+def load_provider(prefix: str):
+    """모델 접두사에 해당하는 채팅 모델 클래스를 불러오는 함수"""
+    module_name, class_name = LLM_PROVIDERS[prefix]
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 def get_api_key(key_name: str) -> str:
-    api_key = None
-    if hasattr(st, "secrets"):  # Streamlit Cloud 환경
-        try:
-            api_key = st.secrets["api_keys"][key_name]
-        except KeyError:
-            raise ValueError(
-                f"Streamlit secrets에서 {key_name}를 찾을 수 없습니다."
-            )
-    else:  # 로컬 환경
-        load_dotenv()
-        api_key = os.getenv(key_name)
+    # Streamlit secrets를 먼저 보고, 없으면 환경 변수에서 가져옴
+    api_key = get_env_var(key_name)
 
     if not api_key:
         raise ValueError(f"{key_name} API 키가 설정되지 않았습니다.")
@@ -47,6 +52,10 @@ class ChatMemory:
         self.max_pairs = max_pairs
         self.buffer_key = f"chat_buffer_{session_id}"
         self.display_key = f"chat_display_{session_id}"
+        self.session_id = session_id
+        # 저장 중인 대화 기록 ID와 DB에 기록된 display 메시지 수
+        self.transcript_key = f"chat_transcript_{session_id}"
+        self.persisted_key = f"chat_persisted_{session_id}"
 
         # 세션 상태 초기화
         if self.history_key not in st.session_state:
@@ -56,12 +65,13 @@ class ChatMemory:
         if self.display_key not in st.session_state:
             st.session_state[self.display_key] = []
 
-    def add_message(self, role: str, content: str):
-        # 메시지 객체 생성
+    def add_message(self, role: str, content: str, metadata: dict = None):
+        # 메시지 객체 생성 (모델명, 토큰 수, 응답 시간은 response_metadata에 보관)
+        metadata = metadata or {}
         if role == "user":
-            message = HumanMessage(content=content)
+            message = HumanMessage(content=content, response_metadata=metadata)
         elif role == "assistant":
-            message = AIMessage(content=content)
+            message = AIMessage(content=content, response_metadata=metadata)
         else:
             message = SystemMessage(content=content)
 
@@ -110,6 +120,49 @@ class ChatMemory:
         # UI 표시 메시지 (전체 대화 내역)
         return st.session_state[self.display_key]
 
+    @property
+    def transcript_id(self):
+        return st.session_state.get(self.transcript_key)
+
+    def start_transcript(self, title: str) -> int:
+        """대화 기록 저장을 시작하고 지금까지의 전체 대화를 기록하는 함수
+
+        이후 대화는 flush()가 호출될 때마다 새 메시지만 이어서 기록된다.
+        """
+        if not self.transcript_id:
+            st.session_state[self.transcript_key] = create_chat_transcript(
+                self.session_id, title
+            )
+            st.session_state[self.persisted_key] = 0
+        self.flush()
+        return self.transcript_id
+
+    def flush(self):
+        """아직 기록되지 않은 display 메시지를 대화 기록에 추가하는 함수"""
+        if not self.transcript_id:
+            return 0
+        persisted = st.session_state.get(self.persisted_key, 0)
+        pending = st.session_state[self.display_key][persisted:]
+        if not pending:
+            return 0
+
+        records = []
+        for msg in pending:
+            metadata = msg.response_metadata or {}
+            records.append(
+                {
+                    "role": "user" if isinstance(msg, HumanMessage) else "assistant",
+                    "content": msg.content,
+                    "model": metadata.get("model"),
+                    "prompt_tokens": metadata.get("prompt_tokens"),
+                    "completion_tokens": metadata.get("completion_tokens"),
+                    "latency_ms": metadata.get("latency_ms"),
+                }
+            )
+        append_chat_messages(self.transcript_id, records)
+        st.session_state[self.persisted_key] = persisted + len(pending)
+        return len(pending)
+
     def _move_to_history(self):
         # 버퍼의 모든 메시지를 한번에 요약
         messages_to_summarize = st.session_state[self.buffer_key]
@@ -174,9 +227,10 @@ class ChatMemory:
 
             # 요약을 위해 Gemini-Flash 모델 사용
             llm = LLMFactory.create_llm("gemini-1.5-flash-latest")
-            response = llm.invoke([
-                HumanMessage(content=summary_prompt.format(conversation=conversation_text))
-            ])
+            with span("llm.summary", "llm", model="gemini-1.5-flash-latest"):
+                response = llm.invoke([
+                    HumanMessage(content=summary_prompt.format(conversation=conversation_text))
+                ])
             
             # 임시 UI로 요약 과정 표시
             with st.expander("🔍 요약 디버그"):
@@ -238,10 +292,43 @@ class ChatMemory:
 
 
 class LLMFactory:
+    @staticmethod
+    def _with_context(messages, context: str = None):
+        """시스템 메시지 바로 뒤에 참고 정보를 끼워 넣은 메시지 목록을 반환"""
+        if not context:
+            return messages
+        insert_at = 1 if messages and isinstance(messages[0], SystemMessage) else 0
+        return (
+            messages[:insert_at]
+            + [SystemMessage(content=context)]
+            + messages[insert_at:]
+        )
+
+    @staticmethod
+    def _persist_turn(memory):
+        """대화 기록 저장 중이면 이번 턴의 메시지를 이어서 기록하는 함수"""
+        try:
+            memory.flush()
+        except Exception as e:
+            # 기록 실패가 응답 표시를 막지 않도록 경고만 표시
+            st.warning(f"대화 기록 저장 중 오류가 발생했습니다: {str(e)}")
+
+    @staticmethod
+    def _response_metadata(model_name: str, response, latency_ms: int) -> dict:
+        """응답의 모델명, 토큰 사용량, 응답 시간을 정리하는 함수"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        return {
+            "model": model_name,
+            "prompt_tokens": usage.get("input_tokens"),
+            "completion_tokens": usage.get("output_tokens"),
+            "latency_ms": latency_ms,
+        }
+
     @staticmethod
     def create_llm(model_name: str):
         try:
             if model_name.startswith("gpt"):
+                ChatOpenAI = load_provider("gpt")
                 model_version = model_name.split("-", 1)[1]
                 return ChatOpenAI(
                     api_key=get_api_key("OPENAI_API_KEY"),
@@ -250,6 +337,7 @@ class LLMFactory:
                     streaming=True,
                 )
             elif model_name.startswith("claude"):
+                ChatAnthropic = load_provider("claude")
                 model_version = model_name.split("-", 1)[1]
                 return ChatAnthropic(
                     anthropic_api_key=get_api_key("ANTHROPIC_API_KEY"),
@@ -262,6 +350,7 @@ class LLMFactory:
                 if not api_key:
                     raise ValueError("Google API 가 설정되지 않았습니다.")
 
+                ChatGoogleGenerativeAI = load_provider("gemini")
                 model_version = model_name.split("-", 1)[1]
                 llm = ChatGoogleGenerativeAI(
                     google_api_key=api_key,
@@ -281,13 +370,20 @@ class LLMFactory:
             raise Exception(error_msg)
 
     @staticmethod
+    @traced("llm.get_response", "llm")
     def get_response(
         model_name: str,
         system_prompt: str,
         user_input: str,
         session_id: str,
         stream_handler: StreamHandler = None,
+        context: str = None,
     ) -> str:
+        """LLM 응답을 생성하는 함수
+
+        context는 이번 호출에만 시스템 메시지 뒤에 덧붙는 참고 정보이며
+        대화 기록에는 저장되지 않는다.
+        """
         try:
             llm = LLMFactory.create_llm(model_name)
             memory = ChatMemory(session_id)
@@ -303,7 +399,7 @@ class LLMFactory:
 
                     # 사용자 메시지 추가
                     memory.add_message("user", user_input)
-                    messages = memory.get_messages()
+                    messages = LLMFactory._with_context(memory.get_messages(), context)
 
                     # 메시지 형식을 Gemini용으로 변환
                     gemini_messages = []
@@ -318,7 +414,10 @@ class LLMFactory:
                             gemini_messages.append(msg)
 
                     # 응답 생성 시도
-                    response = llm.invoke(gemini_messages)
+                    started = time.perf_counter()
+                    with span("llm.invoke", "llm", model=model_name, messages=len(gemini_messages)):
+                        response = llm.invoke(gemini_messages)
+                    latency_ms = int((time.perf_counter() - started) * 1000)
 
                     # 응답 표시 (스트리밍 대신 직접 표시)
                     if stream_handler:
@@ -326,7 +425,12 @@ class LLMFactory:
                         stream_handler.container.markdown(response.content)
 
                     # AI 응답 저장
-                    memory.add_message("assistant", response.content)
+                    memory.add_message(
+                        "assistant",
+                        response.content,
+                        LLMFactory._response_metadata(model_name, response, latency_ms),
+                    )
+                    LLMFactory._persist_turn(memory)
                     return response.content
 
                 except Exception as gemini_error:
@@ -339,15 +443,23 @@ class LLMFactory:
                     memory.add_message("system", system_prompt)
                     messages = memory.get_messages()
                 memory.add_message("user", user_input)
-                messages = memory.get_messages()
+                messages = LLMFactory._with_context(memory.get_messages(), context)
 
-                response = llm.invoke(
-                    messages,
-                    config={"callbacks": ([stream_handler] if stream_handler else None)}
-                )
+                started = time.perf_counter()
+                with span("llm.invoke", "llm", model=model_name, messages=len(messages)):
+                    response = llm.invoke(
+                        messages,
+                        config={"callbacks": ([stream_handler] if stream_handler else None)}
+                    )
+                latency_ms = int((time.perf_counter() - started) * 1000)
 
                 # AI 응답 저장
-                memory.add_message("assistant", response.content)
+                memory.add_message(
+                    "assistant",
+                    response.content,
+                    LLMFactory._response_metadata(model_name, response, latency_ms),
+                )
+                LLMFactory._persist_turn(memory)
                 return response.content
 
         except Exception as e:
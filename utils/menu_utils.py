@@ -1,7 +1,56 @@
+import pandas as pd
 import streamlit as st
-from utils.auth_utils import logout
+from utils.auth_utils import logout, is_admin
+from utils.tracing import traced, recent_traces
+from utils.goal_store import mark_goal_snapshot_stale
+from utils.invalidation import get_bus
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 
+def show_trace_panel():
+    """관리자용 성능 추적 패널 (최근 rerun의 DB/LLM/렌더링 시간)"""
+    st.sidebar.markdown("---")
+    enabled = st.sidebar.toggle("🛠 성능 추적", key="trace_debug")
+    if not enabled:
+        return
+
+    with st.sidebar.expander("캐시 무효화 알림"):
+        st.json(get_bus().stats())
+
+    ctx = get_script_run_ctx()
+    only_mine = st.sidebar.checkbox("내 세션만", value=True, key="trace_only_mine")
+    traces = [
+        t for t in recent_traces(ctx.session_id if ctx and only_mine else None) if t.spans
+    ]
+    if not traces:
+        st.sidebar.caption("기록된 rerun이 없습니다. 페이지를 한 번 더 실행하면 표시됩니다.")
+        return
+
+    options = {
+        f"{t.page} · {t.duration_ms:.0f}ms · {pd.Timestamp(t.started_at, unit='ns'):%H:%M:%S}": t
+        for t in traces[:20]
+    }
+    trace = options[st.sidebar.selectbox("rerun", list(options.keys()), key="trace_selected")]
+
+    with st.sidebar.expander("종류별 합계", expanded=True):
+        for kind, total in sorted(trace.summary().items(), key=lambda x: -x[1]):
+            st.write(f"{kind}: {total:.1f} ms")
+
+    spans = pd.DataFrame(
+        [
+            {
+                "span": "  " * s["depth"] + s["name"].rsplit(".", 1)[-1],
+                "kind": s["kind"],
+                "ms": round(s["duration_ms"], 1),
+                "error": s["error"] or "",
+            }
+            for s in sorted(trace.spans, key=lambda s: s["start_ns"])
+        ]
+    )
+    st.sidebar.dataframe(spans, hide_index=True, use_container_width=True)
+
+
+@traced(kind="render")
 def show_menu():
     # 사용자 정보와 로그아웃 버튼을 상단에 배치
     col1, col2 = st.sidebar.columns([3, 1])
@@ -29,12 +78,20 @@ def show_menu():
         "👤 프로필 관리": "pages/9_user_profile.py",
         "📝 회고 게시판": "pages/10_reflection_board.py",  # 회고 게시판 메뉴 추가
         "💬 대화 기록": "pages/11_chat_history.py",  # 회고 게시판 메뉴 추가
+        "🔍 통합 검색": "pages/12_search.py",
+        "🗓️ 목표 히트맵": "pages/13_goal_heatmap.py",
     }
 
+    if is_admin():
+        menu_items["🐢 쿼리 통계"] = "pages/14_query_stats.py"
+
     # 메뉴 렌더링
     for label, page in menu_items.items():
         if st.sidebar.button(label):
             # 목표 관련 세션 상태 정리
             st.session_state.pop("current_goal_id", None)
-            st.session_state.pop("goals_df", None)
+            mark_goal_snapshot_stale()
             st.switch_page(page)
+
+    if is_admin():
+        show_trace_panel()
@@ -1,43 +1,314 @@
-import requests
-import os
-from dotenv import load_dotenv
+import asyncio
+import random
+import threading
+import time
+from collections import OrderedDict
+import httpx
+
+PPLX_API_URL = "https://api.perplexity.ai/chat/completions"
+PPLX_MODEL = "llama-3.1-sonar-small-128k-online"
+
+SYSTEM_PROMPT = "당신은 검색 전문가입니다. 사용자의 검색어에 대해 최신의 정확한 정보를 제공합니다. 답변은 명확하고 구체적이어야 하며, 가능한 한 최신 정보를 포함해야 합니다."
+
+# 재시도 대상 상태 코드 (요청 한도 초과, 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 재시도 후 남은 시간이 이보다 짧으면 다시 요청하지 않음 (초)
+MIN_ATTEMPT_SECONDS = 1.0
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키로 쓸 수 있도록 검색어를 정규화하는 함수 (대소문자, 공백 통일)"""
+    return " ".join(query.lower().split())
+
+
+class PplxClient:
+    """연결을 재사용하는 Perplexity 검색 클라이언트
+
+    - 동기 요청은 keep-alive 연결 풀을 가진 httpx.Client를 재사용한다.
+    - 비동기 요청은 전용 이벤트 루프 스레드의 httpx.AsyncClient를 재사용한다.
+    - 429/5xx 및 네트워크 오류는 지터가 섞인 지수 백오프로 재시도한다.
+      요청 한 번은 timeout초, 재시도를 포함한 검색 한 번은 deadline초를 넘지 않는다.
+    - 같은 검색어(정규화 기준)의 결과는 cache_ttl초 동안 캐시한다.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = PPLX_API_URL,
+        timeout: float = 10.0,
+        deadline: float = 20.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4.0,
+        cache_ttl: float = 600.0,
+        cache_size: int = 256,
+        max_connections: int = 10,
+    ):
+        self._api_key = api_key
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout, connect=5.0)
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # 정규화된 검색어 -> (만료 시각, 결과)
+        self._client = None
+        self._loop = None
+        self._async_client = None
+
+        # 재시도/캐시 동작 확인용 통계
+        self.stats = {"requests": 0, "retries": 0, "cache_hits": 0}
+
+    @property
+    def api_key(self) -> str:
+        if self._api_key is None:
+            # Streamlit secrets 또는 환경 변수에서 읽음
+            from config import get_settings
+
+            self._api_key = get_settings().pplx_api_key
+        return self._api_key
+
+    def _headers(self) -> dict:
+        return {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "authorization": f"Bearer {self.api_key}",
+        }
+
+    @staticmethod
+    def _payload(query: str) -> dict:
+        return {
+            "model": PPLX_MODEL,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"다음 주제에 대해 최신 정보를 알려주세요: {query}",
+                },
+            ],
+        }
+
+    def _backoff_delay(self, attempt: int, response: httpx.Response = None) -> float:
+        """재시도 전 대기 시간 (full jitter, Retry-After 헤더 우선)"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except (TypeError, ValueError):
+                pass
+        return delay
+
+    def _retry_delay(self, attempt: int, deadline: float, response: httpx.Response = None):
+        """다시 요청하기 전 대기 시간 (재시도 횟수나 전체 시간을 다 썼으면 None)"""
+        if attempt >= self.max_retries:
+            return None
+        delay = self._backoff_delay(attempt, response)
+        if time.monotonic() + delay + MIN_ATTEMPT_SECONDS > deadline:
+            return None
+        return delay
+
+    def _attempt_timeout(self, deadline: float) -> httpx.Timeout:
+        """전체 마감 시각까지 남은 시간에 맞춘 이번 요청의 타임아웃"""
+        remaining = max(deadline - time.monotonic(), 0.1)
+        return httpx.Timeout(
+            min(self.timeout.read, remaining), connect=min(self.timeout.connect, remaining)
+        )
+
+    # 캐시
+    def _cache_get(self, key: str):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return value
+
+    def _cache_set(self, key: str, value: str):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _parse(response: httpx.Response) -> str:
+        return response.json()["choices"][0]["message"]["content"]
+
+    # 동기 요청
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, limits=self.limits)
+            return self._client
+
+    def search(self, query: str) -> str:
+        """검색 결과 본문을 반환하는 함수 (실패 시 예외 발생)"""
+        key = normalize_query(query)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
+        deadline = time.monotonic() + self.deadline
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            try:
+                response = client.post(
+                    self.base_url,
+                    headers=self._headers(),
+                    json=self._payload(query),
+                    timeout=self._attempt_timeout(deadline),
+                )
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                delay = self._retry_delay(attempt, deadline, response)
+                if delay is not None:
+                    self.stats["retries"] += 1
+                    time.sleep(delay)
+                    continue
+
+            response.raise_for_status()
+            result = self._parse(response)
+            self._cache_set(key, result)
+            return result
+
+    # 비동기 요청
+    def _ensure_loop(self):
+        """AsyncClient 연결을 유지할 전용 이벤트 루프 스레드를 시작하는 함수"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._loop.run_forever, name="pplx-client", daemon=True
+                )
+                thread.start()
+            return self._loop
+
+    async def _asearch_in_loop(self, query: str) -> str:
+        key = normalize_query(query)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+
+        deadline = time.monotonic() + self.deadline
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            try:
+                response = await self._async_client.post(
+                    self.base_url,
+                    headers=self._headers(),
+                    json=self._payload(query),
+                    timeout=self._attempt_timeout(deadline),
+                )
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                delay = self._retry_delay(attempt, deadline, response)
+                if delay is not None:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(delay)
+                    continue
+
+            response.raise_for_status()
+            result = self._parse(response)
+            self._cache_set(key, result)
+            return result
+
+    async def asearch(self, query: str) -> str:
+        """어떤 이벤트 루프에서든 await할 수 있는 비동기 검색 함수"""
+        future = asyncio.run_coroutine_threadsafe(
+            self._asearch_in_loop(query), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def search_many(self, queries) -> list:
+        """여러 검색어를 동시에 요청하고 입력 순서대로 결과를 반환하는 함수
+
+        실패한 검색어 자리에는 예외 객체가 들어간다.
+        """
+
+        async def gather():
+            return await asyncio.gather(
+                *(self._asearch_in_loop(query) for query in queries),
+                return_exceptions=True,
+            )
+
+        future = asyncio.run_coroutine_threadsafe(gather(), self._ensure_loop())
+        return future.result()
+
+    def close(self):
+        """열린 연결과 이벤트 루프를 정리하는 함수"""
+        with self._lock:
+            client, self._client = self._client, None
+            loop, self._loop = self._loop, None
+            async_client, self._async_client = self._async_client, None
+        if client is not None:
+            client.close()
+        if loop is not None:
+            if async_client is not None:
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+# 프로세스 전체에서 공유하는 기본 클라이언트
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_pplx_client() -> PplxClient:
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = PplxClient()
+        return _default_client
+
+
+def _format_result(result) -> str:
+    if isinstance(result, Exception):
+        return f"검색 중 오류가 발생했습니다: {str(result)}"
+    # "Perplexity 검색결과입니다:" 텍스트 추가
+    return "Perplexity 검색결과입니다:\n\n" + result
 
-load_dotenv()
 
 def search_with_pplx(query: str) -> str:
     """PPLX API를 사용하여 검색을 수행하는 함수"""
-    
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "authorization": f"Bearer {os.getenv('PPLX_API_KEY')}"
-    }
-    
-    payload = {
-        "model": "llama-3.1-sonar-small-128k-online",
-        "messages": [
-            {
-                "role": "system",
-                "content": "당신은 검색 전문가입니다. 사용자의 검색어에 대해 최신의 정확한 정보를 제공합니다. 답변은 명확하고 구체적이어야 하며, 가능한 한 최신 정보를 포함해야 합니다."
-            },
-            {
-                "role": "user",
-                "content": f"다음 주제에 대해 최신 정보를 알려주세요: {query}"
-            }
-        ]
-    }
-    
     try:
-        response = requests.post(
-            "https://api.perplexity.ai/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=10
-        )
-        response.raise_for_status()
-        result = response.json()
-        
-        # "Perplexity 검색결과입니다:" 텍스트 추가
-        return "Perplexity 검색결과입니다:\n\n" + result["choices"][0]["message"]["content"]
+        return _format_result(get_pplx_client().search(query))
     except Exception as e:
-        return f"검색 중 오류가 발생했습니다: {str(e)}"
+        return _format_result(e)
+
+
+def search_many_with_pplx(queries) -> list:
+    """연관된 여러 검색어를 동시에 검색하는 함수 (입력 순서대로 결과 반환)"""
+    return [_format_result(result) for result in get_pplx_client().search_many(queries)]
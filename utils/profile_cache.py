@@ -0,0 +1,16 @@
+import streamlit as st
+from database import get_user_profile
+from utils.invalidation import UserCache
+
+# 사용자별 프로필 (프로세스 전체 공유, 프로필이 바뀌면 무효화 버스로 해당 사용자만 삭제)
+_profiles = UserCache(lambda user_id: get_user_profile(user_id=user_id), ["profile"])
+
+
+def get_cached_profile() -> dict:
+    """현재 사용자의 프로필을 반환하는 함수 (없을 때만 DB에서 읽음)"""
+    return _profiles.get(st.session_state.user_id)
+
+
+def invalidate_profile(user_id):
+    """user_id가 None이면 모든 사용자의 프로필을 지움"""
+    _profiles.invalidate(user_id)
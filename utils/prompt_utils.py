@@ -0,0 +1,55 @@
+from database import get_todays_goals, get_incomplete_goals
+from utils.profile_cache import get_cached_profile
+
+
+def generate_system_message():
+    """프로필, 오늘의 할일, 미완료 목표로 채팅 시스템 메시지를 만드는 함수"""
+    profile = get_cached_profile()
+    todays_goals = get_todays_goals()
+    incomplete_goals = get_incomplete_goals()
+
+    # 오늘의 할일 문자열 생성 - 간단하게 수정
+    todays_goals_str = "없음"
+    if todays_goals:
+        goals_details = []
+        for goal in todays_goals:
+            start_time = goal.start_date.strftime("%H:%M")
+            end_time = goal.end_date.strftime("%H:%M")
+            importance = goal.importance if goal.importance else "미설정"
+            memo = goal.memo if goal.memo else "미정"
+            status = goal.status if goal.status else "미정"
+           
+            goal_detail = (
+                f"일정 : {goal.title} / 시간 : {start_time}-{end_time} / 중요도: {importance} / 메모: {memo} / 상태: {status} "
+            )
+            goals_details.append(goal_detail)
+        todays_goals_str = "\n".join(goals_details)
+
+    # 미완료 목표 문자열 생성 - 간단하게 수정
+    incomplete_goals_str = "없음"
+    if incomplete_goals:
+        goals_details = []
+        for goal in incomplete_goals:
+            deadline = goal.end_date.strftime("%Y-%m-%d")
+            importance = goal.importance if goal.importance else "미정"
+            memo = goal.memo if goal.memo else "미정"
+            status = goal.status if goal.status else "미정"
+
+            goal_detail = (
+                f"- {goal.title} / 마감: {deadline} / 중요도: {importance} / 메모: {memo} / 상태: {status} "
+            )
+            goals_details.append(goal_detail)
+        incomplete_goals_str = "\n".join(goals_details)
+
+    return f"""
+    {profile.get("content", "")}
+    
+    오늘의 할일:
+    {todays_goals_str}
+    
+    미완료된 목표:
+    {incomplete_goals_str}
+
+    
+    {profile.get('consultant_style', '')}
+    """
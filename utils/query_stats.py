@@ -0,0 +1,266 @@
+"""SQL 실행 통계 (pg_stat_statements와 비슷한 프로세스 단위 집계)
+
+모든 엔진의 cursor 실행 전후 이벤트에서 SQL을 정규화(값·IN 목록을 ?로 치환)한
+모양별로 실행 횟수, 총/p95/최대 시간, 영향 행 수, 호출한 database.py 함수를 모은다.
+
+begin_unit()으로 시작한 작업 단위(페이지 rerun, API 요청) 안에서 같은 모양이
+N_PLUS_ONE_THRESHOLD번 이상 실행되면 N+1 후보로 기록하고, settings.slow_query_ms보다
+오래 걸린 SQL은 로그로 출력한다.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import get_settings
+
+# 작업 단위 하나에서 같은 모양의 SQL이 이만큼 실행되면 N+1 후보
+N_PLUS_ONE_THRESHOLD = 10
+
+# 모양별로 보관하는 실행 시간 수 (p95 계산용)
+SAMPLE_SIZE = 500
+
+# 모양 수 상한 (넘으면 "(기타)"로 합산)
+MAX_SHAPES = 1000
+OTHER_SHAPE = "(기타)"
+
+# 최근 느린 쿼리·N+1 후보 보관 개수
+RECENT_SIZE = 100
+
+# 호출 위치를 찾을 때 건너뛰는 모듈
+_SKIP_MODULES = ("sqlalchemy", "pandas", "utils.query_stats", "utils.tracing")
+
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"--[^\n]*|/\*.*?\*/", re.S), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    # DB 드라이버별 바인드 파라미터 (::type 캐스트는 제외)
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+"), "?"),
+    (re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\s+"), " "),
+    # 길이가 바뀌는 IN 목록, 여러 행 VALUES
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+    (re.compile(r"(\((?:\?|\?, \.\.\.)\))(?:\s*,\s*\((?:\?|\?, \.\.\.)\))+"), r"\1, ..."),
+]
+
+# 원래 SQL -> 정규화한 모양 (같은 SQL 문자열이 반복되므로 정규식 비용을 한 번만 씀)
+_shape_cache = {}
+_SHAPE_CACHE_SIZE = 5000
+
+
+def normalize(statement: str) -> str:
+    """SQL에서 값을 ?로 바꿔 같은 모양의 쿼리를 하나로 묶는 함수"""
+    shape = _shape_cache.get(statement)
+    if shape is None:
+        shape = statement
+        for pattern, replacement in _NORMALIZE_PATTERNS:
+            shape = pattern.sub(replacement, shape)
+        shape = shape.strip()
+        if len(_shape_cache) >= _SHAPE_CACHE_SIZE:
+            _shape_cache.clear()
+        _shape_cache[statement] = shape
+    return shape
+
+
+class QueryUnit:
+    """작업 단위(페이지 rerun, API 요청) 하나에서 실행된 SQL 수"""
+
+    __slots__ = ("name", "statements", "counts", "flagged")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements = 0
+        self.counts = {}  # 모양 -> 실행 횟수
+        self.flagged = {}  # 모양 -> N+1 기록
+
+
+class _ShapeStats:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "samples", "callers", "slow", "n_plus_one")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = None  # 드라이버가 행 수를 알려주지 않으면 None (SQLite SELECT)
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+        self.callers = {}
+        self.slow = 0
+        self.n_plus_one = 0
+
+
+_current_unit: ContextVar = ContextVar("current_query_unit", default=None)
+_shapes = {}
+_slow_log = deque(maxlen=RECENT_SIZE)
+_n_plus_one_log = deque(maxlen=RECENT_SIZE)
+_lock = threading.Lock()
+_started_at = datetime.now()
+
+
+def begin_unit(name: str) -> QueryUnit:
+    """새 작업 단위를 시작하는 함수 (이후 같은 컨텍스트의 SQL을 이 단위로 셈)"""
+    unit = QueryUnit(name)
+    _current_unit.set(unit)
+    return unit
+
+
+def current_unit():
+    return _current_unit.get()
+
+
+def _caller() -> str:
+    """SQL을 실행한 함수 (database.py 안이면 가장 바깥 database 함수)"""
+    frame = sys._getframe(1)
+    entry = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "database":
+            entry = frame.f_code.co_name
+        elif not module.startswith(_SKIP_MODULES):
+            if entry is not None:
+                break
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return entry or "-"
+
+
+def _record(statement: str, elapsed_ms: float, rowcount: int):
+    shape = normalize(statement)
+    caller = _caller()
+    unit = _current_unit.get()
+    slow_ms = get_settings().slow_query_ms
+
+    with _lock:
+        stats = _shapes.get(shape)
+        if stats is None:
+            if len(_shapes) >= MAX_SHAPES:
+                shape = OTHER_SHAPE
+                stats = _shapes.setdefault(shape, _ShapeStats())
+            else:
+                stats = _shapes[shape] = _ShapeStats()
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.samples.append(elapsed_ms)
+        stats.callers[caller] = stats.callers.get(caller, 0) + 1
+        if rowcount is not None and rowcount >= 0:
+            stats.rows = (stats.rows or 0) + rowcount
+
+        if unit is not None:
+            unit.statements += 1
+            count = unit.counts[shape] = unit.counts.get(shape, 0) + 1
+            if count == N_PLUS_ONE_THRESHOLD:
+                stats.n_plus_one += 1
+                unit.flagged[shape] = {
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "unit": unit.name,
+                    "caller": caller,
+                    "count": count,
+                    "shape": shape,
+                }
+                _n_plus_one_log.append(unit.flagged[shape])
+            elif count > N_PLUS_ONE_THRESHOLD:
+                unit.flagged[shape]["count"] = count
+
+        slow = slow_ms > 0 and elapsed_ms >= slow_ms
+        if slow:
+            stats.slow += 1
+            _slow_log.append(
+                {
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "ms": round(elapsed_ms, 1),
+                    "unit": unit.name if unit else None,
+                    "caller": caller,
+                    "shape": shape,
+                }
+            )
+    if slow:
+        print(f"느린 쿼리 {elapsed_ms:.0f} ms ({caller}): {shape[:300]}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_stats_started"].pop()
+    _record(statement, (time.perf_counter() - started) * 1000, cursor.rowcount)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # 실패한 SQL은 after_cursor_execute가 호출되지 않으므로 시작 시각만 버림
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_stats_started"):
+        conn.info["query_stats_started"].pop()
+
+
+def _percentile(samples: list, q: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def snapshot(sort: str = "total_ms", limit: int = None) -> list:
+    """모양별 통계를 sort 기준 내림차순으로 반환하는 함수"""
+    with _lock:
+        items = [
+            (shape, s.count, s.total_ms, s.max_ms, s.rows, sorted(s.samples), dict(s.callers), s.slow, s.n_plus_one)
+            for shape, s in _shapes.items()
+        ]
+    rows = []
+    for shape, count, total_ms, max_ms, total_rows, samples, callers, slow, n_plus_one in items:
+        rows.append(
+            {
+                "shape": shape,
+                "count": count,
+                "total_ms": round(total_ms, 2),
+                "mean_ms": round(total_ms / count, 3),
+                "p95_ms": round(_percentile(samples, 0.95), 3),
+                "max_ms": round(max_ms, 3),
+                "rows": total_rows,
+                "rows_per_call": round(total_rows / count, 1) if total_rows is not None else None,
+                "callers": dict(sorted(callers.items(), key=lambda x: -x[1])),
+                "slow": slow,
+                "n_plus_one": n_plus_one,
+            }
+        )
+    rows.sort(key=lambda r: r[sort] if r[sort] is not None else -1, reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def report(limit: int = None) -> dict:
+    """관리자 화면·벤치마크용 전체 보고서"""
+    with _lock:
+        slow = list(_slow_log)[::-1]
+        n_plus_one = [dict(item) for item in _n_plus_one_log][::-1]
+    return {
+        "pid": os.getpid(),
+        "since": _started_at.isoformat(timespec="seconds"),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "slow_query_ms": get_settings().slow_query_ms,
+        "n_plus_one_threshold": N_PLUS_ONE_THRESHOLD,
+        "queries": snapshot(limit=limit),
+        "n_plus_one": n_plus_one,
+        "slow": slow,
+    }
+
+
+def export_json(path: str, limit: int = None):
+    """보고서를 JSON 파일로 저장하는 함수"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(limit), f, indent=2, ensure_ascii=False)
+
+
+def reset():
+    """모은 통계를 모두 지우는 함수"""
+    global _started_at
+    with _lock:
+        _shapes.clear()
+        _slow_log.clear()
+        _n_plus_one_log.clear()
+        _started_at = datetime.now()
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+import streamlit as st
+
+
+class LRUCache:
+    """최근에 사용한 항목만 maxsize개까지 유지하는 스레드 안전 캐시"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        """캐시에 없을 때만 factory()를 호출해 값을 채우는 함수"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# 프로세스 전체에서 공유하는 본문 캐시 (마크다운 렌더링은 브라우저에서 하므로 원문을 보관)
+_content_cache = LRUCache(maxsize=512)
+
+
+def render_key(record_id, updated_at) -> tuple:
+    """저장된 게시글의 본문 캐시 키를 만드는 함수 (수정되면 키가 바뀜)"""
+    return ("post", record_id, str(updated_at))
+
+
+def show_lazy_record(record_id, updated_at, label: str, load_content, state_prefix: str = "record"):
+    """펼쳤을 때만 본문을 불러와 표시하는 접이식 항목을 표시하는 함수
+
+    load_content()는 본문 문자열을 반환하며, 같은 (record_id, updated_at)에 대해
+    이미 불러온 본문이 있으면 호출되지 않는다.
+    """
+    opened = st.toggle(label, key=f"{state_prefix}_open_{record_id}")
+    if not opened:
+        return False
+
+    content = _content_cache.get_or_set(
+        render_key(record_id, updated_at), lambda: load_content() or ""
+    )
+    with st.container(border=True):
+        st.markdown(content)
+    return True
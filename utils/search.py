@@ -0,0 +1,437 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+import streamlit as st
+from sqlalchemy import text
+from database import (
+    SessionLocal,
+    get_engine,
+    Goal,
+    Board,
+    Link,
+    ChatMessage,
+    ChatTranscript,
+    add_change_listener,
+    unpack_chat_content,
+)
+
+# 검색 대상: entity -> (모델, 제목 필드, 본문 필드들)
+SEARCH_TARGETS = {
+    "board": (Board, "title", ["content"]),
+    "goal": (Goal, "title", ["memo", "trigger_action"]),
+    "link": (Link, "site_name", ["url"]),
+    "chat": (ChatMessage, "title", ["content"]),  # title은 대화 기록 제목
+}
+
+# PostgreSQL 검색 컬럼 정의 (제목 가중치 A, 본문 B/C)
+_TSVECTOR_DEFINITIONS = {
+    "boards": (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '')), 'B')"
+    ),
+    "goals": (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(trigger_action, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(memo, '')), 'C')"
+    ),
+    "links": (
+        "setweight(to_tsvector('simple', coalesce(site_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(url, '')), 'B')"
+    ),
+    # 압축 저장된 긴 메시지는 content가 NULL이므로 search_text(단어 목록)로 색인
+    "chat_messages": "to_tsvector('simple', coalesce(content, search_text, ''))",
+}
+
+# 정의가 바뀐 검색 컬럼: 기존 컬럼 식에 이 문자열이 없으면 다시 만듦
+_TSVECTOR_REQUIRED = {"chat_messages": "search_text"}
+
+_HEADLINE_OPTIONS = "StartSel=**, StopSel=**, MaxWords=20, MinWords=5, MaxFragments=2"
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_SNIPPET_WIDTH = 80
+
+
+def tokenize(value) -> list:
+    """검색용 토큰 목록을 만드는 함수 (소문자, 단어 문자 기준 분리)"""
+    if not value or not isinstance(value, str):
+        return []
+    return _TOKEN_PATTERN.findall(value.lower())
+
+
+def _highlight(value: str, tokens) -> str:
+    """본문에서 첫 번째 일치 위치 주변을 잘라 검색어를 강조하는 함수"""
+    if not value:
+        return ""
+    lowered = value.lower()
+    positions = [lowered.find(token) for token in tokens if token in lowered]
+    start = max(min(positions) - _SNIPPET_WIDTH // 4, 0) if positions else 0
+    snippet = value[start:start + _SNIPPET_WIDTH]
+
+    for token in sorted(set(tokens), key=len, reverse=True):
+        snippet = re.sub(
+            re.escape(token),
+            lambda m: f"**{m.group(0)}**",
+            snippet,
+            flags=re.IGNORECASE,
+        )
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + _SNIPPET_WIDTH < len(value) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+class InMemorySearchIndex:
+    """PostgreSQL 전문 검색을 쓸 수 없을 때 사용하는 역색인
+
+    문서는 (entity, id) 단위로 저장되며 add/update/delete 시 해당 문서만 갱신된다.
+    한국어 조사를 고려해 검색어는 토큰의 접두어로 일치시킨다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}  # (entity, id) -> 문서 정보
+        self._postings = defaultdict(dict)  # token -> {(entity, id): tf}
+        self._vocabulary = []  # 정렬된 토큰 목록 (접두어 검색용)
+        self._vocabulary_dirty = False
+        self._loaded_users = set()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def index(self, entity: str, row: dict):
+        """문서를 색인에 추가하거나 갱신하는 함수"""
+        model, title_field, body_fields = SEARCH_TARGETS[entity]
+        key = (entity, row["id"])
+        title = row.get(title_field) or ""
+        body = "\n".join(str(row.get(f) or "") for f in body_fields).strip()
+
+        term_freqs = defaultdict(int)
+        for token in tokenize(title):
+            term_freqs[token] += 3  # 제목 가중치
+        for token in tokenize(body):
+            term_freqs[token] += 1
+
+        with self._lock:
+            self._remove_locked(key)
+            self._documents[key] = {
+                "entity": entity,
+                "id": row["id"],
+                "user_id": row.get("user_id"),
+                "title": title,
+                "body": body,
+                "board_type": row.get("board_type"),
+                "length": max(sum(term_freqs.values()), 1),
+                "terms": list(term_freqs),
+            }
+            for token, freq in term_freqs.items():
+                if token not in self._postings:
+                    self._vocabulary_dirty = True
+                self._postings[token][key] = freq
+
+    def remove(self, entity: str, doc_id: int):
+        """문서를 색인에서 제거하는 함수"""
+        with self._lock:
+            self._remove_locked((entity, doc_id))
+
+    def _remove_locked(self, key):
+        document = self._documents.pop(key, None)
+        if not document:
+            return
+        for token in document["terms"]:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def _expand(self, token: str) -> list:
+        """접두어가 일치하는 색인 토큰 목록을 반환하는 함수"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, token)
+        matches = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, user_id, query, entities=None, board_type=None, limit=20, match_any=False):
+        """TF-IDF 점수 순으로 검색 결과를 반환하는 함수"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            total_docs = max(len(self._documents), 1)
+            scores = defaultdict(float)
+            matched_tokens = defaultdict(int)
+            for token in set(tokens):
+                token_hits = {}
+                for term in self._expand(token):
+                    for key, freq in self._postings[term].items():
+                        token_hits[key] = token_hits.get(key, 0) + freq
+                if not token_hits:
+                    continue
+                idf = math.log(1 + total_docs / len(token_hits))
+                for key, freq in token_hits.items():
+                    document = self._documents[key]
+                    scores[key] += idf * freq / document["length"]
+                    matched_tokens[key] += 1
+
+            results = []
+            required = 1 if match_any else len(set(tokens))
+            for key, score in scores.items():
+                document = self._documents[key]
+                if matched_tokens[key] < required:
+                    continue
+                if document["user_id"] != user_id:
+                    continue
+                if entities and document["entity"] not in entities:
+                    continue
+                if board_type and document["board_type"] != board_type:
+                    continue
+                results.append(
+                    {
+                        "entity": document["entity"],
+                        "id": document["id"],
+                        "title": document["title"],
+                        "board_type": document["board_type"],
+                        "rank": score,
+                        "snippet": _highlight(document["body"] or document["title"], tokens),
+                    }
+                )
+
+        results.sort(key=lambda r: r["rank"], reverse=True)
+        return results[:limit]
+
+    def ensure_user_loaded(self, user_id):
+        """사용자의 기존 데이터를 처음 검색할 때 한 번만 색인하는 함수"""
+        if user_id in self._loaded_users:
+            return
+        db = SessionLocal()
+        try:
+            for entity, (model, _, _) in SEARCH_TARGETS.items():
+                if entity == "chat":
+                    continue
+                rows = db.query(model).filter(model.user_id == user_id).all()
+                for row in rows:
+                    self.index(
+                        entity,
+                        {c.name: getattr(row, c.name) for c in model.__table__.columns},
+                    )
+
+            # 대화 메시지는 대화 기록 제목과 함께 색인 (압축된 메시지는 풀어서 색인)
+            messages = (
+                db.query(ChatMessage, ChatTranscript.title)
+                .join(ChatTranscript, ChatTranscript.id == ChatMessage.transcript_id)
+                .filter(ChatMessage.user_id == user_id)
+                .all()
+            )
+            for message, title in messages:
+                self.index(
+                    "chat",
+                    {
+                        "id": message.id,
+                        "user_id": message.user_id,
+                        "title": title,
+                        "content": unpack_chat_content(message.content, message.content_compressed),
+                    },
+                )
+        finally:
+            db.close()
+        self._loaded_users.add(user_id)
+
+    def forget_user(self, user_id):
+        """사용자를 색인하지 않은 상태로 되돌리는 함수 (다음 검색 때 다시 색인)"""
+        self._loaded_users.discard(user_id)
+
+
+class PostgresSearchBackend:
+    """tsvector 생성 컬럼과 GIN 인덱스를 사용하는 검색 백엔드
+
+    검색 컬럼은 GENERATED ALWAYS ... STORED 이므로 행이 추가·수정·삭제될 때
+    데이터베이스가 해당 행의 색인만 갱신한다. 컬럼과 인덱스는 테이블을 잠그므로
+    검색 요청에서 만들지 않고 `python manage.py migrate`(ensure_search_schema)로 만든다.
+    """
+
+    def ensure_schema(self):
+        """검색 컬럼과 GIN 인덱스를 생성하는 함수 (이미 있으면 건너뜀)"""
+        with get_engine().begin() as conn:
+            for table, expression in _TSVECTOR_DEFINITIONS.items():
+                required = _TSVECTOR_REQUIRED.get(table)
+                if required:
+                    current = conn.execute(
+                        text(
+                            "SELECT generation_expression FROM information_schema.columns "
+                            "WHERE table_name = :table AND column_name = 'search_vector'"
+                        ),
+                        {"table": table},
+                    ).scalar()
+                    if current is not None and required not in current:
+                        # 예전 정의로 만든 컬럼 (인덱스도 함께 삭제됨)
+                        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN search_vector"))
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector "
+                        f"tsvector GENERATED ALWAYS AS ({expression}) STORED"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                        f"ON {table} USING GIN (search_vector)"
+                    )
+                )
+
+    def search(self, user_id, query, entities=None, board_type=None, limit=20, match_any=False):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # 접두어 일치 tsquery (예: "목표:* & 달성:*")
+        operator = " | " if match_any else " & "
+        ts_query = operator.join(f"{token}:*" for token in dict.fromkeys(tokens))
+
+        selects = []
+        if not entities or "board" in entities:
+            board_filter = "AND board_type = :board_type" if board_type else ""
+            selects.append(
+                f"""
+                SELECT 'board' AS entity, id, title, board_type,
+                       ts_rank(search_vector, q.query) AS rank,
+                       coalesce(content, '') AS body, NULL::bytea AS compressed
+                FROM boards, q
+                WHERE user_id = :user_id AND search_vector @@ q.query {board_filter}
+                """
+            )
+        if not board_type and (not entities or "goal" in entities):
+            selects.append(
+                """
+                SELECT 'goal', id, title, NULL,
+                       ts_rank(search_vector, q.query),
+                       concat_ws(' ', trigger_action, memo), NULL
+                FROM goals, q
+                WHERE user_id = :user_id AND search_vector @@ q.query
+                """
+            )
+        if not board_type and (not entities or "link" in entities):
+            selects.append(
+                """
+                SELECT 'link', id, site_name, NULL,
+                       ts_rank(search_vector, q.query),
+                       url, NULL
+                FROM links, q
+                WHERE user_id = :user_id AND search_vector @@ q.query
+                """
+            )
+        if not board_type and (not entities or "chat" in entities):
+            selects.append(
+                """
+                SELECT 'chat', m.id, t.title, NULL,
+                       ts_rank(m.search_vector, q.query),
+                       m.content, m.content_compressed
+                FROM chat_messages m
+                JOIN chat_transcripts t ON t.id = m.transcript_id
+                CROSS JOIN q
+                WHERE m.user_id = :user_id AND m.search_vector @@ q.query
+                """
+            )
+        if not selects:
+            return []
+
+        # 순위 상위 결과에 대해서만 하이라이트 생성
+        sql = text(
+            f"""
+            WITH q AS (SELECT to_tsquery('simple', :ts_query) AS query),
+            hits AS (
+                {" UNION ALL ".join(selects)}
+                ORDER BY rank DESC
+                LIMIT :limit
+            )
+            SELECT hits.entity, hits.id, hits.title, hits.board_type, hits.rank,
+                   ts_headline('simple', hits.body, q.query, :headline_options) AS snippet,
+                   hits.compressed
+            FROM hits, q
+            ORDER BY hits.rank DESC
+            """
+        )
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                sql,
+                {
+                    "ts_query": ts_query,
+                    "user_id": user_id,
+                    "board_type": board_type,
+                    "limit": limit,
+                    "headline_options": _HEADLINE_OPTIONS,
+                },
+            ).mappings()
+            results = []
+            for row in rows:
+                result = dict(row)
+                compressed = result.pop("compressed")
+                if compressed is not None:
+                    # 압축 메시지는 본문이 NULL이므로 풀어서 강조 구간을 만듦
+                    result["snippet"] = _highlight(unpack_chat_content(None, compressed), tokens)
+                results.append(result)
+            return results
+        finally:
+            db.close()
+
+
+_memory_index = InMemorySearchIndex()
+_postgres_backend = PostgresSearchBackend()
+
+
+def _use_postgres() -> bool:
+    # 엔진은 지연 생성되므로 import 시점이 아니라 처음 사용할 때 판단
+    return get_engine().dialect.name == "postgresql"
+
+
+def ensure_search_schema():
+    """PostgreSQL이면 검색 컬럼과 인덱스를 만드는 함수 (migrate 명령에서 사용)"""
+    if _use_postgres():
+        _postgres_backend.ensure_schema()
+        return True
+    return False
+
+
+def _on_change(entity, action, row):
+    """데이터 변경 시 메모리 색인을 해당 문서만 갱신하는 함수"""
+    if entity not in SEARCH_TARGETS:
+        return
+    if row.get("user_id") not in _memory_index._loaded_users:
+        return  # 아직 색인하지 않은 사용자는 첫 검색 때 한꺼번에 색인됨
+    if action == "import":
+        # 가져온 행은 하나씩 알리지 않으므로 다음 검색 때 다시 색인
+        _memory_index.forget_user(row["user_id"])
+        return
+    if action == "delete":
+        _memory_index.remove(entity, row["id"])
+    else:
+        _memory_index.index(entity, row)
+
+
+add_change_listener(_on_change)
+
+
+def search(query: str, entities=None, board_type: str = None, limit: int = 20, match_any=False):
+    """현재 사용자의 게시글/목표/링크/대화 메시지를 검색하는 함수
+
+    결과는 rank 내림차순이며 각 항목은 entity, id, title, board_type, rank,
+    snippet(검색어가 **강조**된 본문 일부)을 가진다.
+    """
+    user_id = st.session_state.user_id
+    if _use_postgres():
+        return _postgres_backend.search(
+            user_id, query, entities, board_type, limit, match_any
+        )
+    _memory_index.ensure_user_loaded(user_id)
+    return _memory_index.search(
+        user_id, query, entities, board_type, limit, match_any
+    )
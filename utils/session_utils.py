@@ -2,6 +2,7 @@ import secrets
 from datetime import datetime, timedelta
 import streamlit as st
 from database import update_session
+from utils.goal_store import mark_goal_snapshot_stale
 
 class SessionManager:
     def __init__(self):
@@ -88,4 +89,5 @@ class SessionManager:
 def clear_goal_session():
     """목표 관련 세션 상태를 정리하는 함수"""
     st.session_state.pop('current_goal_id', None)
-    st.session_state.pop('goals_df', None)
+    # 목표 스냅샷은 지우지 않고 다음에 볼 때 바뀐 목표만 다시 읽도록 표시
+    mark_goal_snapshot_stale()
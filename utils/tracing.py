@@ -0,0 +1,185 @@
+import functools
+import json
+import random
+import threading
+import time
+import types
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config import get_settings
+
+# 최근 rerun 추적 결과를 보관하는 개수 (프로세스 전체)
+TRACE_BUFFER_SIZE = 200
+
+# OpenTelemetry span kind
+SPAN_KINDS = {
+    "db": "CLIENT",
+    "llm": "CLIENT",
+    "http": "CLIENT",
+    "render": "INTERNAL",
+    "internal": "INTERNAL",
+}
+
+
+class RerunTrace:
+    """한 번의 페이지 실행(rerun)에서 기록된 span 모음"""
+
+    __slots__ = ("trace_id", "page", "session_id", "started_at", "spans", "_stack")
+
+    def __init__(self, page: str, session_id: str = None):
+        self.trace_id = uuid.uuid4().hex
+        self.page = page
+        self.session_id = session_id
+        self.started_at = time.time_ns()
+        self.spans = []
+        self._stack = []
+
+    @property
+    def duration_ms(self) -> float:
+        if not self.spans:
+            return 0.0
+        return (max(s["end_ns"] for s in self.spans) - self.started_at) / 1e6
+
+    def summary(self) -> dict:
+        """종류별 소요 시간 합계 (최상위 span 기준, 중첩 시간은 중복 집계하지 않음)"""
+        totals = {}
+        for s in self.spans:
+            if s["depth"] == 0:
+                totals[s["kind"]] = totals.get(s["kind"], 0.0) + s["duration_ms"]
+        return totals
+
+
+_current_trace: ContextVar = ContextVar("current_trace", default=None)
+_recent_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+_buffer_lock = threading.Lock()
+_export_lock = threading.Lock()
+_export_file = None
+
+
+def start_rerun(page: str, session_id: str = None, force: bool = False):
+    """rerun 시작 시 샘플링 여부를 정하고 새 추적을 시작하는 함수
+
+    샘플링되지 않은 rerun에서는 span/traced가 아무것도 기록하지 않는다.
+    """
+    rate = get_settings().trace_sample_rate
+    if not force and (rate <= 0 or random.random() >= rate):
+        _current_trace.set(None)
+        return None
+
+    trace = RerunTrace(page, session_id)
+    _current_trace.set(trace)
+    with _buffer_lock:
+        _recent_traces.append(trace)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def recent_traces(session_id: str = None) -> list:
+    """최근 추적 목록을 최신순으로 반환하는 함수"""
+    with _buffer_lock:
+        traces = list(_recent_traces)
+    if session_id is not None:
+        traces = [t for t in traces if t.session_id == session_id]
+    return traces[::-1]
+
+
+def _export(trace: RerunTrace, record: dict):
+    """span을 OpenTelemetry JSON 형식에 맞춰 JSONL 파일에 한 줄로 기록하는 함수"""
+    global _export_file
+    path = get_settings().trace_export_path
+    if not path:
+        return
+    line = {
+        "resource": {"service.name": "goal-gpt", "page": trace.page},
+        "traceId": trace.trace_id,
+        "spanId": record["span_id"],
+        "parentSpanId": record["parent_id"] or "",
+        "name": record["name"],
+        "kind": SPAN_KINDS.get(record["kind"], "INTERNAL"),
+        "startTimeUnixNano": record["start_ns"],
+        "endTimeUnixNano": record["end_ns"],
+        "attributes": {"span.kind": record["kind"], **record["attributes"]},
+        "status": {"code": "ERROR" if record["error"] else "OK", "message": record["error"] or ""},
+    }
+    with _export_lock:
+        if _export_file is None:
+            _export_file = open(path, "a", encoding="utf-8", buffering=1)
+        _export_file.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """현재 rerun 추적에 구간 시간을 기록하는 컨텍스트 매니저
+
+    추적 중이 아니면 아무 일도 하지 않는다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    record = {
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": trace._stack[-1]["span_id"] if trace._stack else None,
+        "depth": len(trace._stack),
+        "name": name,
+        "kind": kind,
+        "attributes": attributes,
+        "error": None,
+    }
+    trace._stack.append(record)
+    record["start_ns"] = time.time_ns()
+    started = time.perf_counter_ns()
+    try:
+        yield record
+    except BaseException as e:
+        # st.stop(), st.rerun()도 예외로 전달되므로 기록만 하고 그대로 다시 발생
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration_ms"] = (time.perf_counter_ns() - started) / 1e6
+        record["end_ns"] = record["start_ns"] + int(record["duration_ms"] * 1e6)
+        trace._stack.pop()
+        trace.spans.append(record)
+        _export(trace, record)
+
+
+def traced(name: str = None, kind: str = "internal"):
+    """함수 실행 시간을 span으로 기록하는 데코레이터"""
+
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorator
+
+
+def instrument_module(namespace: dict, kind: str, exclude=()):
+    """모듈에 정의된 공개 함수 전체에 traced를 적용하는 함수
+
+    모듈 마지막에 instrument_module(globals(), "db")처럼 호출한다.
+    """
+    module_name = namespace["__name__"]
+    for attr, value in list(namespace.items()):
+        if (
+            isinstance(value, types.FunctionType)
+            and value.__module__ == module_name
+            and not attr.startswith("_")
+            and attr not in exclude
+            and not getattr(value, "__traced__", False)
+        ):
+            namespace[attr] = traced(f"{module_name}.{attr}", kind)(value)